@@ -1,9 +1,88 @@
+import copy
+import functools
+import itertools
 import sqlite3
 import logging
+import queue
+import threading
+import time
 from pathlib import Path
 from typing import Any, Optional
 from datetime import date, datetime, timedelta
 from collections import defaultdict
+from contextlib import contextmanager
+
+
+def _invalidates_cache(*keys: str):
+    """Сбрасывает указанные ключи кэша справочников после вызова метода."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                for key in keys:
+                    self.invalidate_cache(key)
+        return wrapper
+    return decorator
+
+
+class _ReadConnectionPool:
+    """Пул соединений только для чтения для фоновых потоков.
+
+    В режиме WAL читатели не блокируют ни друг друга, ни основное соединение.
+    Соединения открываются по мере надобности, но не больше ``size``.
+    """
+
+    def __init__(self, db_path: Path, size: int = 4):
+        self._db_path = db_path
+        self._size = size
+        self._idle: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 5000;")
+        conn.execute("PRAGMA query_only = 1;")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self._size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    conn = self._open()
+                except sqlite3.Error:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
 
 class Database:
     """Класс для управления базой данных SQLite."""
@@ -15,6 +94,39 @@ class Database:
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         self._knives_category_id = None
         self._sharpening_category_ids: set[int] = set()
+        # Кэш небольших справочников, которые запрашиваются многими вкладками.
+        self._lookup_cache: dict[str, list[dict[str, Any]]] = {}
+        # Версии справочников растут при каждом сбросе кэша.
+        self._cache_version_seq = itertools.count(1)
+        self._cache_epoch = 0
+        self._cache_versions: dict[str, int] = {}
+        # Чтения из фоновых потоков интерфейса идут через отдельные соединения.
+        self._read_pool: _ReadConnectionPool | None = None
+        self._owner_thread: int | None = None
+
+    def invalidate_cache(self, key: Optional[str] = None):
+        """Сбрасывает кэш справочников целиком или по одному ключу."""
+        version = next(self._cache_version_seq)
+        if key is None:
+            self._lookup_cache.clear()
+            self._cache_versions.clear()
+            self._cache_epoch = version
+        else:
+            self._lookup_cache.pop(key, None)
+            self._cache_versions[key] = version
+
+    def cache_version(self, key: str) -> int:
+        """Возвращает версию справочника; она меняется при любом его изменении."""
+        return max(self._cache_epoch, self._cache_versions.get(key, 0))
+
+    def _cached_rows(self, key: str, loader) -> list[dict[str, Any]]:
+        """Возвращает копию закэшированного справочника, загружая его при промахе."""
+        rows = self._lookup_cache.get(key)
+        if rows is None:
+            rows = loader()
+            if self.conn:
+                self._lookup_cache[key] = rows
+        return copy.deepcopy(rows)
 
     def _log_action(self, message: str):
         """Записывает действие пользователя в журнал."""
@@ -101,6 +213,7 @@ class Database:
 
     def connect(self):
         """Устанавливает соединение с БД и настраивает PRAGMA."""
+        self.invalidate_cache()
         try:
             self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
@@ -111,6 +224,8 @@ class Database:
             logging.info(f"Successfully connected to database: {self.db_path}")
             self.run_migrations()
             self._refresh_sharpening_categories()
+            self._owner_thread = threading.get_ident()
+            self._read_pool = _ReadConnectionPool(self.db_path)
 
         except sqlite3.Error as e:
             logging.error(f"Database connection error: {e}", exc_info=True)
@@ -118,10 +233,14 @@ class Database:
 
     def disconnect(self):
         """Закрывает соединение с БД."""
+        if self._read_pool:
+            self._read_pool.close()
+            self._read_pool = None
         if self.conn:
             self.conn.close()
             self.conn = None
             logging.info("Database connection closed.")
+        self.invalidate_cache()
 
     def _refresh_sharpening_categories(self):
         """Обновляет кэш ID категорий, для которых включено отслеживание заточек."""
@@ -181,8 +300,29 @@ class Database:
             logging.error(f"SQL Error (safe): {e}\nQuery: {query}\nParams: {params}", exc_info=True)
             return None
 
+    def _pooled_read(self, query: str, params: tuple, fetch):
+        """Выполняет чтение на соединении из пула; при ошибке возвращает None."""
+        # Пул читаем один раз: disconnect() в GUI-потоке может обнулить его
+        # между проверкой в _use_read_pool() и этим вызовом.
+        pool = self._read_pool
+        if pool is None:
+            raise RuntimeError("Database is not connected.")
+        try:
+            with pool.connection() as conn:
+                return fetch(conn.execute(query, params))
+        except sqlite3.Error as e:
+            logging.error(f"SQL Error (pooled): {e}\nQuery: {query}\nParams: {params}", exc_info=True)
+            return None
+
+    def _use_read_pool(self) -> bool:
+        return self._read_pool is not None and threading.get_ident() != self._owner_thread
+
     def fetchall(self, query: str, params: tuple = ()) -> list[dict[str, Any]]:
         """Выполняет запрос и возвращает все строки как список словарей."""
+        if self._use_read_pool():
+            rows = self._pooled_read(query, params, sqlite3.Cursor.fetchall)
+            return [dict(row) for row in rows] if rows else []
+
         cursor = self.execute_safe(query, params)
         if cursor:
             return [dict(row) for row in cursor.fetchall()]
@@ -190,6 +330,10 @@ class Database:
 
     def fetchone(self, query: str, params: tuple = ()) -> Optional[dict[str, Any]]:
         """Выполняет запрос и возвращает одну строку как словарь."""
+        if self._use_read_pool():
+            row = self._pooled_read(query, params, sqlite3.Cursor.fetchone)
+            return dict(row) if row else None
+
         cursor = self.execute_safe(query, params)
         if cursor:
             row = cursor.fetchone()
@@ -369,6 +513,13 @@ class Database:
             self.conn.commit()
             logging.info("Database migrated to version 15.")
 
+        if user_version < 16:
+            logging.info("Applying migration to version 16...")
+            self._apply_migration_v16()
+            cursor.execute("PRAGMA user_version = 16;")
+            self.conn.commit()
+            logging.info("Database migrated to version 16.")
+
 
     def _apply_migration_v1(self):
         """Схема БД версии 1."""
@@ -851,9 +1002,17 @@ class Database:
             "CREATE INDEX IF NOT EXISTS idx_parts_analog_group ON parts(analog_group_id)"
         )
 
+    def _apply_migration_v16(self):
+        """Индекс для постраничной загрузки истории замен по дате."""
+        if not self.conn:
+            return
+
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS replacements_date_id_idx ON replacements(date, id)"
+        )
+
     def backup_database(self) -> tuple[bool, str]:
         if not self.conn: return False, "Нет подключения к базе данных."
-        import time
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         backup_path = self.backup_dir / f"app_{timestamp}.db"
         try:
@@ -1125,7 +1284,12 @@ class Database:
             return True, "Запчасть удалена."
         except sqlite3.Error as e: return False, f"Ошибка базы данных: {e}"
 
-    def get_part_categories(self): return self.fetchall("SELECT id, name FROM part_categories ORDER BY name")
+    def get_part_categories(self):
+        return self._cached_rows(
+            "part_categories",
+            lambda: self.fetchall("SELECT id, name FROM part_categories ORDER BY name"),
+        )
+    @_invalidates_cache("part_categories")
     def add_part_category(self, name):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -1140,6 +1304,7 @@ class Database:
         except sqlite3.Error as exc:
             logging.error("Ошибка добавления категории запчастей %s: %s", name, exc, exc_info=True)
             return False, f"Ошибка базы данных: {exc}"
+    @_invalidates_cache("part_categories")
     def update_part_category(self, category_id, name):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -1154,6 +1319,7 @@ class Database:
         except sqlite3.Error as exc:
             logging.error("Ошибка обновления категории запчастей #%s: %s", category_id, exc, exc_info=True)
             return False, f"Ошибка базы данных: {exc}"
+    @_invalidates_cache("part_categories")
     def delete_part_category(self, category_id):
         if category_id == self._knives_category_id:
             return False, "Системную категорию 'ножи' нельзя удалить."
@@ -1174,6 +1340,9 @@ class Database:
 
     # --- Counterparties, Orders, Equipment etc. (existing methods) ---
     def get_all_counterparties(self):
+        return self._cached_rows("counterparties", self._load_all_counterparties)
+
+    def _load_all_counterparties(self):
         counterparties = self.fetchall("SELECT * FROM counterparties ORDER BY name")
         addresses_map = self._get_counterparty_addresses_map()
 
@@ -1198,6 +1367,7 @@ class Database:
         counterparty["default_address"] = default_address
         counterparty["address"] = self._format_addresses_for_display(addresses) if addresses else default_address
         return counterparty
+    @_invalidates_cache("counterparties")
     def add_counterparty(
         self,
         name,
@@ -1234,6 +1404,7 @@ class Database:
         except sqlite3.IntegrityError:
             return False, "Контрагент с таким именем уже существует."
 
+    @_invalidates_cache("counterparties")
     def update_counterparty(
         self,
         c_id,
@@ -1271,6 +1442,7 @@ class Database:
             return True, "Данные контрагента обновлены."
         except sqlite3.IntegrityError:
             return False, "Контрагент с таким именем уже существует."
+    @_invalidates_cache("counterparties")
     def delete_counterparty(self, c_id):
         if self.fetchone("SELECT 1 FROM orders WHERE counterparty_id = ?", (c_id,)): return False, "Удаление невозможно: у контрагента есть заказы."
         try:
@@ -1331,11 +1503,18 @@ class Database:
         start_date: str | None = None,
         end_date: str | None = None,
         counterparty_id: int | None = None,
+        after: tuple | None = None,
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
-        """Возвращает историю выполненных заказов с учётом фильтров."""
+        """Возвращает историю выполненных заказов с учётом фильтров.
+
+        ``after`` — ключ ``(sort_date, id)`` последней загруженной строки,
+        ``limit`` — размер страницы.
+        """
 
         base_query = """
             SELECT
+                COALESCE(o.delivery_date, o.invoice_date, substr(o.created_at, 1, 10)) AS sort_date,
                 o.id,
                 o.counterparty_id,
                 c.name AS counterparty_name,
@@ -1373,6 +1552,12 @@ class Database:
             conditions.append("o.counterparty_id = ?")
             params.append(counterparty_id)
 
+        if after:
+            conditions.append(
+                "(COALESCE(o.delivery_date, o.invoice_date, substr(o.created_at, 1, 10)), o.id) < (?, ?)"
+            )
+            params.extend(after)
+
         if conditions:
             base_query += " AND " + " AND ".join(conditions)
 
@@ -1382,6 +1567,10 @@ class Database:
             "o.id DESC"
         )
 
+        if limit:
+            base_query += " LIMIT ?"
+            params.append(limit)
+
         return self.fetchall(base_query, tuple(params))
     def get_order_details(self, order_id): return self.fetchone("SELECT * FROM orders WHERE id = ?", (order_id,))
     def get_order_items(self, order_id): return self.fetchall("SELECT * FROM order_items WHERE order_id = ?", (order_id,))
@@ -1470,6 +1659,38 @@ class Database:
         except sqlite3.Error as e:
             logging.error(f"Ошибка транзакции при удалении заказа: {e}", exc_info=True)
             return False, f"Ошибка транзакции: {e}"
+    def delete_orders_bulk(self, order_ids: list[int]) -> tuple[list[int], dict[int, str]]:
+        """Транзакционно удаляет несколько заказов вместе с позициями.
+
+        Returns:
+            tuple: список удалённых ID и словарь ``{id: причина}`` для неудалённых.
+        """
+        ids = list(dict.fromkeys(order_ids))
+        if not ids:
+            return [], {}
+        if not self.conn:
+            return [], {order_id: "Нет подключения к БД." for order_id in ids}
+
+        placeholders = ",".join("?" for _ in ids)
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(f"DELETE FROM order_items WHERE order_id IN ({placeholders})", tuple(ids))
+                rows = cursor.execute(
+                    f"DELETE FROM orders WHERE id IN ({placeholders}) RETURNING id",
+                    tuple(ids),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Ошибка транзакции при удалении заказов: {e}", exc_info=True)
+            return [], {order_id: f"Ошибка транзакции: {e}" for order_id in ids}
+
+        deleted_ids = [row["id"] for row in rows]
+        for order_id in deleted_ids:
+            self._log_action(f"Удалён заказ #{order_id}")
+        deleted = set(deleted_ids)
+        failed = {order_id: "Заказ не найден." for order_id in ids if order_id not in deleted}
+        return deleted_ids, failed
+
     def accept_delivery(self, order_id):
         if not self.conn: return False, "Нет подключения к БД."
         order = self.get_order_details(order_id)
@@ -1544,8 +1765,12 @@ class Database:
             logging.error("Ошибка удаления категории оборудования #%s: %s", cat_id, e, exc_info=True)
             return False, f"Ошибка базы данных: {e}"
     def get_all_equipment(self):
-        return self.fetchall("SELECT id, name, sku, category_id, parent_id, comment FROM equipment ORDER BY name")
+        return self._cached_rows(
+            "equipment",
+            lambda: self.fetchall("SELECT id, name, sku, category_id, parent_id, comment FROM equipment ORDER BY name"),
+        )
 
+    @_invalidates_cache("equipment")
     def add_equipment(self, name, sku, category_id, parent_id=None, comment=None):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -1561,6 +1786,7 @@ class Database:
         except sqlite3.Error as e:
             logging.error("Ошибка добавления оборудования %s: %s", name, e, exc_info=True)
             return False, f"Ошибка базы данных: {e}"
+    @_invalidates_cache("equipment")
     def update_equipment(self, eq_id, name, sku, category_id, parent_id=None, comment=None):
         try:
             if eq_id and eq_id == parent_id: return False, "Оборудование не может быть родителем для самого себя."
@@ -1577,6 +1803,7 @@ class Database:
             logging.error("Ошибка обновления оборудования #%s: %s", eq_id, e, exc_info=True)
             return False, f"Ошибка базы данных: {e}"
 
+    @_invalidates_cache("equipment")
     def copy_equipment_with_parts(self, equipment_id: int, copies: int = 1):
         if not self.conn:
             return False, "Нет подключения к базе данных.", []
@@ -1650,6 +1877,7 @@ class Database:
             logging.error("Ошибка при копировании оборудования #%s: %s", equipment_id, exc, exc_info=True)
             return False, f"Ошибка базы данных: {exc}", []
 
+    @_invalidates_cache("equipment")
     def update_equipment_comment(self, eq_id: int, comment: str):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -1662,6 +1890,7 @@ class Database:
         except sqlite3.Error as e:
             logging.error("Ошибка обновления комментария оборудования #%s: %s", eq_id, e, exc_info=True)
             return False, f"Ошибка базы данных: {e}"
+    @_invalidates_cache("equipment")
     def delete_equipment(self, eq_id):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -1725,8 +1954,9 @@ class Database:
             logging.error("Ошибка удаления оборудования #%s: %s", eq_id, e, exc_info=True)
             return False, f"Ошибка базы данных: {e}"
 
-    def get_parts_for_equipment(self, equipment_id):
-        query = """
+    @staticmethod
+    def _equipment_parts_query(condition: str) -> str:
+        return f"""
             SELECT ep.id as equipment_part_id,
                    ep.equipment_id,
                    p.id as part_id,
@@ -1767,10 +1997,27 @@ class Database:
                 JOIN parts p ON ep.part_id = p.id
                 LEFT JOIN part_categories pc ON p.category_id = pc.id
                 LEFT JOIN complex_components cc ON cc.equipment_part_id = ep.id
-            WHERE ep.equipment_id = ?
+            WHERE {condition}
             ORDER BY pc.name IS NULL, pc.name, p.name
         """
-        return self.fetchall(query, (equipment_id,))
+
+    def get_parts_for_equipment(self, equipment_id):
+        return self.fetchall(self._equipment_parts_query("ep.equipment_id = ?"), (equipment_id,))
+
+    def get_parts_for_equipment_batch(self, equipment_ids: list[int]) -> dict[int, list[dict]]:
+        """Возвращает запчасти нескольких единиц оборудования одним запросом."""
+        if not equipment_ids:
+            return {}
+
+        placeholders = ",".join(["?"] * len(equipment_ids))
+        rows = self.fetchall(
+            self._equipment_parts_query(f"ep.equipment_id IN ({placeholders})"),
+            tuple(equipment_ids),
+        )
+        result: dict[int, list[dict]] = {}
+        for row in rows:
+            result.setdefault(row['equipment_id'], []).append(row)
+        return result
 
     def _cleanup_orphan_analog_groups(self, cursor: sqlite3.Cursor | None = None):
         if not self.conn:
@@ -1962,6 +2209,7 @@ class Database:
                 "Ошибка обновления комментария запчасти #%s: %s", equipment_part_id, exc, exc_info=True
             )
             return False, f"Ошибка базы данных: {exc}"
+    @_invalidates_cache("equipment")
     def detach_part_from_equipment(self, equipment_part_id):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -2015,6 +2263,7 @@ class Database:
             )
             return False, f"Ошибка базы данных: {e}"
 
+    @_invalidates_cache("equipment")
     def update_attached_part(
         self,
         equipment_part_id: int,
@@ -2113,6 +2362,7 @@ class Database:
             )
             return False, f"Ошибка базы данных: {e}", {}
 
+    @_invalidates_cache("equipment")
     def mark_equipment_part_as_complex(self, equipment_part_id: int):
         if not self.conn:
             return False, "Нет подключения к БД.", {}
@@ -2176,6 +2426,7 @@ class Database:
             )
             return False, f"Ошибка базы данных: {e}", {}
 
+    @_invalidates_cache("equipment")
     def unmark_equipment_part_complex(self, equipment_part_id: int):
         if not self.conn:
             return False, "Нет подключения к БД.", {}
@@ -2494,7 +2745,13 @@ class Database:
         except sqlite3.Error as e:
             logging.error(f"Ошибка транзакции при замене запчасти: {e}", exc_info=True)
             return False, f"Ошибка транзакции: {e}"
-    def get_all_replacements_filtered(self, start_date=None, end_date=None, part_category_id=None, equipment_id=None):
+    def get_all_replacements_filtered(self, start_date=None, end_date=None, part_category_id=None, equipment_id=None,
+                                      after: tuple | None = None, limit: int | None = None):
+        """Возвращает историю замен, новые записи первыми.
+
+        ``after`` — ключ ``(date, id)`` последней загруженной строки: выбираются
+        только более старые записи. ``limit`` ограничивает размер страницы.
+        """
         query = """
             SELECT r.id, r.date, r.qty, r.reason, e.name as equipment_name, p.name as part_name, p.sku as part_sku, pc.name as part_category_name
             FROM replacements r JOIN equipment e ON r.equipment_id = e.id JOIN parts p ON r.part_id = p.id LEFT JOIN part_categories pc ON p.category_id = pc.id
@@ -2504,8 +2761,10 @@ class Database:
         if end_date: conditions.append("r.date <= ?"); params.append(end_date)
         if equipment_id: conditions.append("r.equipment_id = ?"); params.append(equipment_id)
         if part_category_id: conditions.append("p.category_id = ?"); params.append(part_category_id)
+        if after: conditions.append("(r.date, r.id) < (?, ?)"); params.extend(after)
         if conditions: query += " WHERE " + " AND ".join(conditions)
-        query += " ORDER BY r.date DESC"
+        query += " ORDER BY r.date DESC, r.id DESC"
+        if limit: query += " LIMIT ?"; params.append(limit)
         return self.fetchall(query, tuple(params))
     def get_replacement_by_id(self, replacement_id): return self.fetchone("SELECT * FROM replacements WHERE id = ?", (replacement_id,))
     def update_replacement(self, replacement_id, date_str, qty, reason):
@@ -2530,7 +2789,43 @@ class Database:
                 self._log_action(f"Удалена запись замены #{replacement_id}")
             return True, "Запись из истории замен удалена."
         except sqlite3.Error as e: return False, f"Ошибка базы данных: {e}"
-    def get_all_colleagues(self): return self.fetchall("SELECT id, name FROM colleagues ORDER BY name")
+    def delete_replacements_bulk(self, replacement_ids: list[int]) -> tuple[list[int], dict[int, str]]:
+        """Удаляет записи замен одним запросом.
+
+        Returns:
+            tuple: список удалённых ID и словарь ``{id: причина}`` для неудалённых.
+        """
+        ids = list(dict.fromkeys(replacement_ids))
+        if not ids:
+            return [], {}
+        if not self.conn:
+            return [], {replacement_id: "Нет подключения к БД." for replacement_id in ids}
+
+        placeholders = ",".join("?" for _ in ids)
+        try:
+            with self.conn:
+                rows = self.conn.execute(
+                    f"DELETE FROM replacements WHERE id IN ({placeholders}) RETURNING id, date, equipment_id, part_id",
+                    tuple(ids),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.error("Ошибка при удалении записей замен: %s", e, exc_info=True)
+            return [], {replacement_id: f"Ошибка базы данных: {e}" for replacement_id in ids}
+
+        deleted_ids = [row["id"] for row in rows]
+        for row in rows:
+            self._log_action(
+                f"Удалена запись замены #{row['id']}: дата {row['date']}, оборудование #{row['equipment_id']}, запчасть #{row['part_id']}"
+            )
+        deleted = set(deleted_ids)
+        failed = {replacement_id: "Запись не найдена." for replacement_id in ids if replacement_id not in deleted}
+        return deleted_ids, failed
+    def get_all_colleagues(self):
+        return self._cached_rows(
+            "colleagues",
+            lambda: self.fetchall("SELECT id, name FROM colleagues ORDER BY name"),
+        )
+    @_invalidates_cache("colleagues")
     def add_colleague(self, name):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -2545,6 +2840,7 @@ class Database:
         except sqlite3.Error as exc:
             logging.error("Ошибка добавления сотрудника %s: %s", name, exc, exc_info=True)
             return False, f"Ошибка базы данных: {exc}"
+    @_invalidates_cache("colleagues")
     def update_colleague(self, colleague_id, name):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -2559,6 +2855,7 @@ class Database:
         except sqlite3.Error as exc:
             logging.error("Ошибка обновления сотрудника #%s: %s", colleague_id, exc, exc_info=True)
             return False, f"Ошибка базы данных: {exc}"
+    @_invalidates_cache("colleagues")
     def delete_colleague(self, colleague_id):
         try:
             colleague = self.fetchone("SELECT name FROM colleagues WHERE id = ?", (colleague_id,))
@@ -2594,11 +2891,19 @@ class Database:
         end_date: str | None = None,
         assignee_id: int | None = None,
         equipment_id: int | None = None,
+        after: tuple | None = None,
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
-        """Возвращает задачи со статусом 'выполнена' или 'отменена'."""
+        """Возвращает задачи со статусом 'выполнена' или 'отменена'.
+
+        ``after`` — ключ ``(sort_date, sort_created_at, id)`` последней
+        загруженной строки, ``limit`` — размер страницы.
+        """
 
         query = """
             SELECT
+                COALESCE(t.due_date, substr(t.created_at, 1, 10)) AS sort_date,
+                COALESCE(t.created_at, '') AS sort_created_at,
                 t.id,
                 t.title,
                 t.description,
@@ -2639,14 +2944,25 @@ class Database:
             conditions.append("t.equipment_id = ?")
             params.append(equipment_id)
 
+        if after:
+            conditions.append(
+                "(COALESCE(t.due_date, substr(t.created_at, 1, 10)), COALESCE(t.created_at, ''), t.id)"
+                " < (?, ?, ?)"
+            )
+            params.extend(after)
+
         if conditions:
             query += " AND " + " AND ".join(conditions)
 
         query += (
             " ORDER BY COALESCE(t.due_date, substr(t.created_at, 1, 10)) DESC, "
-            "t.created_at DESC, t.id DESC"
+            "COALESCE(t.created_at, '') DESC, t.id DESC"
         )
 
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
         return self.fetchall(query, tuple(params))
     def get_task_by_id(self, task_id): return self.fetchone("SELECT * FROM tasks WHERE id = ?", (task_id,))
     def add_task(
@@ -2890,6 +3206,45 @@ class Database:
             logging.error("Ошибка при удалении задачи #%s: %s", task_id, e, exc_info=True)
             return False, f"Ошибка базы данных: {e}", {}
 
+    def delete_tasks(self, task_ids: list[int]) -> tuple[list[int], dict[int, str], dict[str, Any]]:
+        """Удаляет несколько задач в одной транзакции.
+
+        Returns:
+            tuple: список удалённых ID, словарь ``{id: причина}`` для неудалённых
+            и события для обновления связанных представлений.
+        """
+        ids = list(dict.fromkeys(task_ids))
+        if not ids:
+            return [], {}, {}
+        if not self.conn:
+            return [], {task_id: "Нет подключения к БД." for task_id in ids}, {}
+
+        placeholders = ",".join("?" for _ in ids)
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    f"SELECT equipment_part_id FROM task_parts WHERE task_id IN ({placeholders})",
+                    tuple(ids),
+                )
+                equipment_part_ids = {row[0] for row in cursor.fetchall() if row[0] is not None}
+                rows = cursor.execute(
+                    f"DELETE FROM tasks WHERE id IN ({placeholders}) RETURNING id, title",
+                    tuple(ids),
+                ).fetchall()
+                self._refresh_equipment_parts_flags(cursor, equipment_part_ids)
+                equipment_ids = self._get_equipment_ids_for_part_links(cursor, equipment_part_ids)
+        except sqlite3.Error as e:
+            logging.error("Ошибка при удалении задач: %s", e, exc_info=True)
+            return [], {task_id: f"Ошибка базы данных: {e}" for task_id in ids}, {}
+
+        deleted_ids = [row["id"] for row in rows]
+        for row in rows:
+            self._log_action(f"Удалена задача #{row['id']}: '{row['title']}'")
+        deleted = set(deleted_ids)
+        failed = {task_id: "Задача не найдена." for task_id in ids if task_id not in deleted}
+        return deleted_ids, failed, {'equipment_ids': equipment_ids}
+
     # --- Periodic Tasks ---
     @staticmethod
     def _compute_next_due_date(last_completed: Optional[str], period_days: int) -> date:
@@ -2944,7 +3299,11 @@ class Database:
         )
 
     def get_due_periodic_tasks(self, within_days: int = 7) -> list[dict[str, Any]]:
-        tasks = self.get_all_periodic_tasks()
+        return self.filter_due_periodic_tasks(self.get_all_periodic_tasks(), within_days)
+
+    @staticmethod
+    def filter_due_periodic_tasks(tasks: list[dict[str, Any]], within_days: int = 7) -> list[dict[str, Any]]:
+        """Отбирает из уже загруженных работ те, до срока которых меньше ``within_days`` дней."""
         return [
             task
             for task in tasks
@@ -3110,18 +3469,15 @@ class Database:
         if not task_ids:
             return False, "Не выбраны работы для удаления."
 
+        ids = tuple(dict.fromkeys(task_ids))
+        placeholders = ",".join("?" for _ in ids)
         try:
             with self.conn:
-                cursor = self.conn.cursor()
-                placeholders = ",".join("?" for _ in task_ids)
-                titles = cursor.execute(
-                    f"SELECT id, title FROM periodic_tasks WHERE id IN ({placeholders})",
-                    tuple(task_ids),
+                # Названия для журнала возвращает сам DELETE — отдельный SELECT не нужен.
+                titles = self.conn.execute(
+                    f"DELETE FROM periodic_tasks WHERE id IN ({placeholders}) RETURNING id, title",
+                    ids,
                 ).fetchall()
-                cursor.execute(
-                    f"DELETE FROM periodic_tasks WHERE id IN ({placeholders})",
-                    tuple(task_ids),
-                )
 
             if titles:
                 for row in titles:
@@ -3694,6 +4050,46 @@ class Database:
 
         return cleaned_rows
 
+    def iter_knife_operations_history(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        part_id: int | None = None,
+        target_seconds: float = 0.2,
+        initial_days: int = 31,
+    ):
+        """Отдаёт историю операций с ножами порциями по диапазонам дат.
+
+        Порции идут от новых дат к старым, поэтому их конкатенация совпадает
+        с результатом ``get_knife_operations_history``. Длина следующего
+        диапазона подбирается по времени выполнения предыдущего запроса так,
+        чтобы один запрос укладывался примерно в ``target_seconds``.
+        """
+        if not start_date or not end_date:
+            yield self.get_knife_operations_history(start_date, end_date, part_id)
+            return
+
+        first_day = date.fromisoformat(start_date)
+        chunk_end = date.fromisoformat(end_date)
+        span_days = max(1, initial_days)
+        if chunk_end < first_day:
+            # Пустой период всё равно отдаёт одну порцию, чтобы представление очистилось.
+            yield []
+            return
+
+        while chunk_end >= first_day:
+            chunk_start = max(first_day, chunk_end - timedelta(days=span_days - 1))
+            started = time.perf_counter()
+            rows = self.get_knife_operations_history(chunk_start.isoformat(), chunk_end.isoformat(), part_id)
+            elapsed = time.perf_counter() - started
+            yield rows
+
+            if elapsed < target_seconds / 2:
+                span_days *= 2
+            elif elapsed > target_seconds:
+                span_days = max(1, span_days // 2)
+            chunk_end = chunk_start - timedelta(days=1)
+
     def delete_knife_sharpen_entry(self, entry_id):
         if not self.conn:
             return False, "Нет подключения к БД."
@@ -3745,52 +4141,7 @@ class Database:
 
                 part_id = row["part_id"]
                 cursor.execute("DELETE FROM knife_status_log WHERE id = ?", (entry_id,))
-
-                cursor.execute(
-                    """
-                        SELECT to_status, changed_at
-                        FROM knife_status_log
-                        WHERE part_id = ?
-                        ORDER BY changed_at DESC
-                        LIMIT 1
-                    """,
-                    (part_id,),
-                )
-                latest = cursor.fetchone()
-
-                if latest:
-                    latest_status = latest["to_status"]
-                    changed_at = latest["changed_at"]
-                    sharp_state = self._fallback_sharp_state(None, latest_status)
-                    installation_state = self._fallback_installation_state(None, latest_status)
-                    work_started_at = None
-                    if latest_status == "в работе" and changed_at:
-                        work_started_at = changed_at.split(" ")[0]
-                else:
-                    latest_status = "наточен"
-                    sharp_state = "заточен"
-                    installation_state = "снят"
-                    work_started_at = None
-
-                combined_status = latest_status
-                if combined_status not in {"в работе", "наточен", "затуплен"}:
-                    combined_status = self._combined_status(sharp_state, installation_state)
-
-                cursor.execute(
-                    "INSERT OR IGNORE INTO knife_tracking (part_id) VALUES (?)",
-                    (part_id,),
-                )
-                cursor.execute(
-                    """
-                        UPDATE knife_tracking
-                        SET status = ?,
-                            sharp_state = ?,
-                            installation_state = ?,
-                            work_started_at = ?
-                        WHERE part_id = ?
-                    """,
-                    (combined_status, sharp_state, installation_state, work_started_at, part_id),
-                )
+                self._restore_knife_status_from_log(cursor, part_id)
 
             self._log_action(
                 f"Удалена запись изменения статуса #{entry_id} для комплекта #{part_id}"
@@ -3800,3 +4151,125 @@ class Database:
             logging.error("Ошибка удаления записи статуса ножа", exc_info=True)
             return False, f"Ошибка базы данных: {exc}"
 
+    def _restore_knife_status_from_log(self, cursor, part_id: int):
+        """Выставляет состояние ножа по последней оставшейся записи журнала статусов."""
+        cursor.execute(
+            """
+                SELECT to_status, changed_at
+                FROM knife_status_log
+                WHERE part_id = ?
+                ORDER BY changed_at DESC
+                LIMIT 1
+            """,
+            (part_id,),
+        )
+        latest = cursor.fetchone()
+
+        if latest:
+            latest_status = latest["to_status"]
+            changed_at = latest["changed_at"]
+            sharp_state = self._fallback_sharp_state(None, latest_status)
+            installation_state = self._fallback_installation_state(None, latest_status)
+            work_started_at = None
+            if latest_status == "в работе" and changed_at:
+                work_started_at = changed_at.split(" ")[0]
+        else:
+            latest_status = "наточен"
+            sharp_state = "заточен"
+            installation_state = "снят"
+            work_started_at = None
+
+        combined_status = latest_status
+        if combined_status not in {"в работе", "наточен", "затуплен"}:
+            combined_status = self._combined_status(sharp_state, installation_state)
+
+        cursor.execute(
+            "INSERT OR IGNORE INTO knife_tracking (part_id) VALUES (?)",
+            (part_id,),
+        )
+        cursor.execute(
+            """
+                UPDATE knife_tracking
+                SET status = ?,
+                    sharp_state = ?,
+                    installation_state = ?,
+                    work_started_at = ?
+                WHERE part_id = ?
+            """,
+            (combined_status, sharp_state, installation_state, work_started_at, part_id),
+        )
+
+    def delete_knife_entries(
+        self,
+        status_ids: list[int],
+        sharpen_ids: list[int],
+    ) -> tuple[list[int], list[int], list[str]]:
+        """Удаляет записи журналов статусов и заточек ножей в одной транзакции.
+
+        Returns:
+            tuple: удалённые ID записей статусов, удалённые ID записей заточек
+            и список сообщений об ошибках.
+        """
+        status_ids = list(dict.fromkeys(status_ids))
+        sharpen_ids = list(dict.fromkeys(sharpen_ids))
+        if not status_ids and not sharpen_ids:
+            return [], [], []
+        if not self.conn:
+            return [], [], ["Нет подключения к БД."]
+
+        try:
+            with self.conn:
+                cursor = self.conn.cursor()
+                sharpen_rows = []
+                if sharpen_ids:
+                    placeholders = ",".join("?" for _ in sharpen_ids)
+                    sharpen_rows = cursor.execute(
+                        f"DELETE FROM knife_sharpen_log WHERE id IN ({placeholders}) RETURNING id, part_id",
+                        tuple(sharpen_ids),
+                    ).fetchall()
+                    sharpened_parts = list({row["part_id"] for row in sharpen_rows})
+                    if sharpened_parts:
+                        part_placeholders = ",".join("?" for _ in sharpened_parts)
+                        cursor.execute(
+                            f"""
+                                UPDATE knife_tracking
+                                SET last_sharpen_date = (
+                                        SELECT MAX(l.date) FROM knife_sharpen_log l
+                                        WHERE l.part_id = knife_tracking.part_id
+                                    ),
+                                    total_sharpenings = (
+                                        SELECT COUNT(*) FROM knife_sharpen_log l
+                                        WHERE l.part_id = knife_tracking.part_id
+                                    )
+                                WHERE part_id IN ({part_placeholders})
+                            """,
+                            tuple(sharpened_parts),
+                        )
+
+                status_rows = []
+                if status_ids:
+                    placeholders = ",".join("?" for _ in status_ids)
+                    status_rows = cursor.execute(
+                        f"DELETE FROM knife_status_log WHERE id IN ({placeholders}) RETURNING id, part_id",
+                        tuple(status_ids),
+                    ).fetchall()
+                    for part_id in {row["part_id"] for row in status_rows}:
+                        self._restore_knife_status_from_log(cursor, part_id)
+        except sqlite3.Error as exc:
+            logging.error("Ошибка удаления записей истории ножей", exc_info=True)
+            return [], [], [f"Ошибка базы данных: {exc}"]
+
+        for row in sharpen_rows:
+            self._log_action(
+                f"Удалена запись истории заточек #{row['id']} для комплекта #{row['part_id']}"
+            )
+        for row in status_rows:
+            self._log_action(
+                f"Удалена запись изменения статуса #{row['id']} для комплекта #{row['part_id']}"
+            )
+
+        errors = []
+        if len(sharpen_rows) + len(status_rows) < len(sharpen_ids) + len(status_ids):
+            errors.append("Запись не найдена.")
+        return [row["id"] for row in status_rows], [row["id"] for row in sharpen_rows], errors
+
@@ -1,24 +1,44 @@
 import logging
+from contextlib import contextmanager
+from functools import partial
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
 
 class EventBus:
-    """Простая шина событий для слабой связи между компонентами."""
+    """Простая шина событий для слабой связи между компонентами.
+
+    Подписчики вызываются синхронно внутри ``emit``, либо, если подписка
+    сделана с ``mode='queued'``, на следующем проходе цикла событий Qt.
+    Внутри ``with bus.batch():`` события копятся и доставляются при выходе.
+    """
     def __init__(self):
         self.subscribers = {}
+        self._queued = set()
+        self._batch_depth = 0
+        self._batched = []
         logging.info("EventBus initialized.")
 
-    def subscribe(self, event_type, callback):
-        """Подписывает обратный вызов на событие."""
+    def subscribe(self, event_type, callback, mode='direct'):
+        """Подписывает обратный вызов на событие.
+
+        ``mode='queued'`` откладывает вызов до следующего прохода цикла событий.
+        """
         if event_type not in self.subscribers:
             self.subscribers[event_type] = []
         if callback not in self.subscribers[event_type]:
             self.subscribers[event_type].append(callback)
             logging.info(f"Subscribed {getattr(callback, '__name__', 'callback')} to '{event_type}'")
+        if mode == 'queued':
+            self._queued.add((event_type, callback))
+        else:
+            self._queued.discard((event_type, callback))
 
     def unsubscribe(self, event_type, callback):
         """Отписывает обратный вызов от события."""
         if event_type in self.subscribers:
             try:
                 self.subscribers[event_type].remove(callback)
+                self._queued.discard((event_type, callback))
                 logging.info(f"Unsubscribed {getattr(callback, '__name__', 'callback')} from '{event_type}'")
             except ValueError:
                 # Подавление ошибки, если обратный вызов уже отписан
@@ -32,8 +52,59 @@ class EventBus:
         if event_type in self.subscribers:
             # Копируем список, чтобы избежать проблем при отписке внутри обработчика
             for callback in self.subscribers[event_type][:]:
-                try:
-                    callback(*args, **kwargs)
-                except Exception as e:
-                    logging.error(f"Error in event handler for '{event_type}': {e}", exc_info=True)
+                if self._batch_depth:
+                    self._batched.append((event_type, callback, args, kwargs))
+                else:
+                    self._dispatch(event_type, callback, args, kwargs)
+
+    @contextmanager
+    def batch(self):
+        """Откладывает события до выхода из блока и доставляет их без повторов.
+
+        Обработчик, которому за блок пришло несколько событий с одинаковыми
+        аргументами (например, ``refresh_data`` на ``parts.changed`` и
+        ``tasks.changed``), вызывается один раз.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_batch()
+
+    def _flush_batch(self):
+        pending, self._batched = self._batched, []
+        delivered = set()
+        for event_type, callback, args, kwargs in pending:
+            try:
+                key = (callback, args, frozenset(kwargs.items()))
+                if key in delivered:
+                    continue
+                delivered.add(key)
+            except TypeError:
+                # Нехэшируемые аргументы не сравниваем — доставляем как есть.
+                pass
+            self._dispatch(event_type, callback, args, kwargs)
+
+    def _dispatch(self, event_type, callback, args, kwargs):
+        if (event_type, callback) in self._queued and QCoreApplication.instance() is not None:
+            self._post(event_type, callback, args, kwargs)
+        else:
+            self._deliver(event_type, callback, args, kwargs)
+
+    def _post(self, event_type, callback, args, kwargs):
+        delivery = partial(self._deliver, event_type, callback, args, kwargs)
+        receiver = getattr(callback, '__self__', None)
+        if isinstance(receiver, QObject):
+            # Вызов отменяется Qt, если получатель успеет удалиться.
+            QTimer.singleShot(0, receiver, delivery)
+        else:
+            QTimer.singleShot(0, delivery)
+
+    def _deliver(self, event_type, callback, args, kwargs):
+        try:
+            callback(*args, **kwargs)
+        except Exception as e:
+            logging.error(f"Error in event handler for '{event_type}': {e}", exc_info=True)
 
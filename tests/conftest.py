@@ -0,0 +1,30 @@
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "app.db"), str(tmp_path / "backup"))
+    database.connect()
+    yield database
+    database.disconnect()
+
+
+@pytest.fixture
+def seed_replacements(db):
+    """Создаёт станок и деталь и проводит по одной замене на каждую дату."""
+
+    def seed(dates):
+        db.add_equipment_category("Линии")
+        category_id = db.get_equipment_categories()[0]["id"]
+        db.add_equipment("Станок", "EQ1", category_id)
+        equipment_id = db.get_all_equipment()[0]["id"]
+        db.add_part("Деталь", "SKU1", 100, 0, 1.0, None)
+        part_id = db.get_all_parts()[0]["id"]
+        for date_str in dates:
+            success, message = db.perform_replacement(date_str, equipment_id, part_id, 1, "")
+            assert success, message
+        return [row["id"] for row in db.get_all_replacements_filtered()]
+
+    return seed
@@ -0,0 +1,88 @@
+def test_delete_replacements_bulk_reports_missing_ids(db, seed_replacements):
+    ids = seed_replacements([f"2024-01-{idx + 1:02d}" for idx in range(3)])
+
+    deleted_ids, failed = db.delete_replacements_bulk(ids[:2] + [9999])
+
+    assert sorted(deleted_ids) == sorted(ids[:2])
+    assert list(failed) == [9999]
+    assert [row["id"] for row in db.get_all_replacements_filtered()] == ids[2:]
+
+
+def test_delete_orders_bulk_removes_items(db):
+    db.execute("INSERT INTO counterparties (name) VALUES ('Поставщик')")
+    db.conn.commit()
+    counterparty_id = db.get_all_counterparties()[0]["id"]
+    order = {
+        "counterparty_id": counterparty_id,
+        "invoice_no": "1",
+        "invoice_date": "2024-01-01",
+        "delivery_date": "2024-01-02",
+        "status": "создан",
+        "comment": "",
+    }
+    for _ in range(2):
+        success, message = db.create_order_with_items(order, [(None, "Деталь", "SKU", 1, 1.0, 1.0)])
+        assert success, message
+    order_ids = [row["id"] for row in db.fetchall("SELECT id FROM orders")]
+
+    deleted_ids, failed = db.delete_orders_bulk(order_ids)
+
+    assert sorted(deleted_ids) == sorted(order_ids)
+    assert failed == {}
+    assert db.fetchall("SELECT id FROM order_items") == []
+
+
+def test_delete_tasks_reports_missing_ids(db):
+    for idx in range(3):
+        result = db.add_task(f"Задача {idx}", "", "средний", None, None, None, "в работе")
+        assert result[0], result[1]
+    task_ids = [row["id"] for row in db.fetchall("SELECT id FROM tasks ORDER BY id")]
+
+    deleted_ids, failed, events = db.delete_tasks(task_ids[:2] + [9999])
+
+    assert sorted(deleted_ids) == task_ids[:2]
+    assert list(failed) == [9999]
+    assert events == {"equipment_ids": set()}
+    assert [row["id"] for row in db.fetchall("SELECT id FROM tasks")] == task_ids[2:]
+
+
+def test_delete_knife_entries_updates_tracking(db):
+    db.add_part("Нож", "KN1", 1, 0, 1.0, None)
+    part_id = db.get_all_parts()[0]["id"]
+    db.execute("INSERT INTO knife_tracking (part_id, total_sharpenings) VALUES (?, 3)", (part_id,))
+    for date_str in ["2024-01-01", "2024-01-05", "2024-01-09"]:
+        db.execute(
+            "INSERT INTO knife_sharpen_log (part_id, date, comment) VALUES (?, ?, '')",
+            (part_id, date_str),
+        )
+    db.execute(
+        "INSERT INTO knife_status_log (part_id, from_status, to_status) VALUES (?, 'наточен', 'в работе')",
+        (part_id,),
+    )
+    sharpen_ids = [row["id"] for row in db.fetchall("SELECT id FROM knife_sharpen_log ORDER BY date")]
+    status_id = db.fetchone("SELECT id FROM knife_status_log")["id"]
+
+    deleted_status, deleted_sharpen, errors = db.delete_knife_entries([status_id], sharpen_ids[1:])
+
+    assert deleted_status == [status_id]
+    assert sorted(deleted_sharpen) == sharpen_ids[1:]
+    assert errors == []
+    tracking = db.fetchone("SELECT * FROM knife_tracking WHERE part_id = ?", (part_id,))
+    assert tracking["total_sharpenings"] == 1
+    assert tracking["last_sharpen_date"] == "2024-01-01"
+    assert tracking["status"] == "наточен"
+
+
+def test_delete_periodic_tasks_removes_selected(db):
+    db.add_equipment_category("Линии")
+    db.add_equipment("Станок", "EQ1", db.get_equipment_categories()[0]["id"])
+    equipment_id = db.get_all_equipment()[0]["id"]
+    for idx in range(3):
+        result = db.add_periodic_task(f"Работа {idx}", 7, equipment_id, None, None)
+        assert result[0], result[1]
+    task_ids = [row["id"] for row in db.fetchall("SELECT id FROM periodic_tasks ORDER BY id")]
+
+    success, message = db.delete_periodic_tasks([task_ids[0], task_ids[2], task_ids[0]])
+
+    assert success, message
+    assert [row["id"] for row in db.fetchall("SELECT id FROM periodic_tasks")] == [task_ids[1]]
@@ -0,0 +1,72 @@
+def test_lookup_cache_invalidated_on_write(db):
+    db.add_equipment_category("Линии")
+    category_id = db.get_equipment_categories()[0]["id"]
+
+    assert db.get_all_equipment() == []
+
+    success, message = db.add_equipment("Станок", "EQ1", category_id)
+    assert success, message
+    assert [row["name"] for row in db.get_all_equipment()] == ["Станок"]
+
+    success, message = db.add_colleague("Иван")
+    assert success, message
+    assert [row["name"] for row in db.get_all_colleagues()] == ["Иван"]
+
+
+def test_lookup_cache_returns_copies(db):
+    categories = db.get_part_categories()
+    categories[0]["name"] = "изменено"
+    categories.append({"id": -1, "name": "лишняя"})
+
+    assert all(row["name"] != "изменено" for row in db.get_part_categories())
+    assert all(row["id"] != -1 for row in db.get_part_categories())
+
+
+def test_cache_version_changes_only_for_modified_lookup(db):
+    equipment_version = db.cache_version("equipment")
+    colleagues_version = db.cache_version("colleagues")
+
+    success, message = db.add_colleague("Иван")
+    assert success, message
+
+    assert db.cache_version("equipment") == equipment_version
+    assert db.cache_version("colleagues") > colleagues_version
+
+
+def test_equipment_cache_invalidated_when_complex_part_renamed(db):
+    db.add_equipment_category("Линии")
+    category_id = db.get_equipment_categories()[0]["id"]
+    db.add_equipment("Станок", "EQ1", category_id)
+    equipment_id = db.get_all_equipment()[0]["id"]
+    db.add_part("Редуктор", "R1", 1, 0, 1.0, None)
+    part_id = db.get_all_parts()[0]["id"]
+    db.attach_part_to_equipment(equipment_id, part_id, 1)
+    equipment_part_id = db.get_parts_for_equipment(equipment_id)[0]["equipment_part_id"]
+
+    success, message, _ = db.mark_equipment_part_as_complex(equipment_part_id)
+    assert success, message
+    assert "Редуктор" in [row["name"] for row in db.get_all_equipment()]
+
+    success, message, _ = db.update_attached_part(equipment_part_id, "Редуктор главный", "R2", 1)
+    assert success, message
+
+    names = [row["name"] for row in db.get_all_equipment()]
+    assert "Редуктор главный" in names
+    assert "Редуктор" not in names
+
+
+def test_part_category_cache_follows_category_writes(db):
+    before = [row["name"] for row in db.get_part_categories()]
+
+    success, message = db.add_part_category("Ремни")
+    assert success, message
+    category = next(row for row in db.get_part_categories() if row["name"] == "Ремни")
+
+    success, message = db.update_part_category(category["id"], "Ремни привода")
+    assert success, message
+    names = [row["name"] for row in db.get_part_categories()]
+    assert "Ремни привода" in names and "Ремни" not in names
+
+    success, message = db.delete_part_category(category["id"])
+    assert success, message
+    assert [row["name"] for row in db.get_part_categories()] == before
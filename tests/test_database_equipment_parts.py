@@ -0,0 +1,21 @@
+def test_parts_batch_matches_per_equipment_query(db):
+    db.add_equipment_category("Линии")
+    category_id = db.get_equipment_categories()[0]["id"]
+    for index in range(3):
+        db.add_equipment(f"Станок {index}", f"EQ{index}", category_id)
+    equipment_ids = [row["id"] for row in db.get_all_equipment()]
+
+    for index in range(4):
+        db.add_part(f"Деталь {index}", f"SKU{index}", 10, 0, 1.0, None)
+    part_ids = [row["id"] for row in db.get_all_parts()]
+
+    db.attach_part_to_equipment(equipment_ids[0], part_ids[0], 2)
+    db.attach_part_to_equipment(equipment_ids[0], part_ids[3], 1)
+    db.attach_part_to_equipment(equipment_ids[1], part_ids[1], 5)
+
+    batch = db.get_parts_for_equipment_batch(equipment_ids)
+
+    assert set(batch) == {equipment_ids[0], equipment_ids[1]}
+    for equipment_id in equipment_ids:
+        assert batch.get(equipment_id, []) == db.get_parts_for_equipment(equipment_id)
+    assert db.get_parts_for_equipment_batch([]) == {}
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+
+def test_replacements_keyset_pages_cover_full_history(db, seed_replacements):
+    seed_replacements(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-02", "2024-01-03"])
+
+    full = [row["id"] for row in db.get_all_replacements_filtered()]
+
+    paged: list[int] = []
+    after = None
+    while True:
+        page = db.get_all_replacements_filtered(after=after, limit=2)
+        if not page:
+            break
+        paged.extend(row["id"] for row in page)
+        after = (page[-1]["date"], page[-1]["id"])
+
+    assert paged == full
+    assert len(full) == 5
+
+
+def test_knife_history_batches_match_full_query(db):
+    db.add_part("Нож", "KN1", 10, 0, 1.0, None)
+    part_id = db.get_all_parts()[0]["id"]
+    for date_str in ["2023-12-31", "2024-01-15", "2024-02-01", "2024-02-01", "2024-03-10"]:
+        db.execute(
+            "INSERT INTO knife_sharpen_log (part_id, date, comment) VALUES (?, ?, '')",
+            (part_id, date_str),
+        )
+
+    full = db.get_knife_operations_history("2024-01-01", "2024-03-31")
+    batches = list(db.iter_knife_operations_history("2024-01-01", "2024-03-31", initial_days=10))
+
+    assert len(batches) > 1
+    assert [row for batch in batches for row in batch] == full
+    assert len(full) == 4
+
+
+def test_knife_history_inverted_range_yields_one_empty_batch(db):
+    db.add_part("Нож", "KN1", 10, 0, 1.0, None)
+    part_id = db.get_all_parts()[0]["id"]
+    db.execute(
+        "INSERT INTO knife_sharpen_log (part_id, date, comment) VALUES (?, ?, '')",
+        (part_id, "2024-02-01"),
+    )
+
+    assert list(db.iter_knife_operations_history("2024-03-31", "2024-01-01")) == [[]]
+
+
+def test_background_reads_use_separate_connection(db, seed_replacements):
+    seed_replacements(["2024-01-01"])
+    results = {}
+
+    def read_in_thread():
+        results["rows"] = db.get_all_replacements_filtered()
+        results["write"] = db.fetchall("DELETE FROM replacements RETURNING id")
+
+    db.conn.execute("BEGIN IMMEDIATE")
+    db.conn.execute("DELETE FROM replacements")
+    worker = threading.Thread(target=read_in_thread)
+    worker.start()
+    worker.join(timeout=10)
+    db.conn.rollback()
+
+    assert not worker.is_alive()
+    assert len(results["rows"]) == 1
+    assert results["write"] == []
+    assert len(db.get_all_replacements_filtered()) == 1
+
+
+def test_pooled_read_after_disconnect_raises_clear_error(db, monkeypatch):
+    db.disconnect()
+    # Фоновый поток прошёл проверку пула до того, как GUI-поток закрыл БД.
+    monkeypatch.setattr(db, "_use_read_pool", lambda: True)
+
+    with pytest.raises(RuntimeError, match="not connected"):
+        db.fetchall("SELECT 1")
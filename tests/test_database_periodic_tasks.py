@@ -0,0 +1,18 @@
+from datetime import date, timedelta
+
+
+def test_filter_due_periodic_tasks_matches_due_query(db):
+    db.add_equipment_category("Линии")
+    db.add_equipment("Станок", "EQ1", db.get_equipment_categories()[0]["id"])
+    equipment_id = db.get_all_equipment()[0]["id"]
+    today = date.today()
+    for idx, days_ago in enumerate((0, 5, 10, 30)):
+        last = (today - timedelta(days=days_ago)).isoformat()
+        result = db.add_periodic_task(f"Работа {idx}", 10, equipment_id, None, last)
+        assert result[0], result[1]
+
+    all_tasks = db.get_all_periodic_tasks()
+    due = db.filter_due_periodic_tasks(all_tasks)
+
+    assert due == db.get_due_periodic_tasks()
+    assert [task["title"] for task in due] == ["Работа 3", "Работа 2", "Работа 1"]
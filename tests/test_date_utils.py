@@ -0,0 +1,35 @@
+from PySide6.QtCore import QDate
+
+from ui.utils import (
+    db_string_to_qdate,
+    db_string_to_ui_string,
+    get_current_date_str_for_db,
+    qdate_to_db_string,
+)
+
+
+def test_db_string_to_ui_string_reorders_iso_date():
+    assert db_string_to_ui_string("2024-03-07") == "07.03.2024"
+    assert db_string_to_ui_string("2024-03-07 10:15:00") == ""
+    assert db_string_to_ui_string("2024-02-30") == ""
+    assert db_string_to_ui_string("2023-13-01") == ""
+    assert db_string_to_ui_string("2024-02-29") == "29.02.2024"
+    assert db_string_to_ui_string("07.03.2024") == ""
+    assert db_string_to_ui_string("") == ""
+    assert db_string_to_ui_string(None) == ""
+
+
+def test_db_string_to_qdate_falls_back_to_today():
+    qdate = db_string_to_qdate("2024-03-07")
+    assert qdate == QDate(2024, 3, 7)
+    qdate.setDate(2000, 1, 1)
+    assert db_string_to_qdate("2024-03-07") == QDate(2024, 3, 7)
+    today = QDate.currentDate()
+    for value in ("", None, "2024-02-30", "2024-ab-07", "07.03.2024"):
+        assert db_string_to_qdate(value) == today
+
+
+def test_qdate_to_db_string_formats_iso_date():
+    assert qdate_to_db_string(QDate(2024, 3, 7)) == "2024-03-07"
+    assert qdate_to_db_string(QDate()) == ""
+    assert get_current_date_str_for_db() == QDate.currentDate().toString("yyyy-MM-dd")
@@ -0,0 +1,28 @@
+from event_bus import EventBus
+
+
+def test_batch_delivers_each_handler_once_on_exit():
+    bus = EventBus()
+    calls = []
+
+    def refresh():
+        calls.append("refresh")
+
+    def on_equipment(equipment_id):
+        calls.append(equipment_id)
+
+    bus.subscribe("parts.changed", refresh)
+    bus.subscribe("tasks.changed", refresh)
+    bus.subscribe("equipment_parts_changed", on_equipment)
+
+    with bus.batch():
+        bus.emit("parts.changed")
+        bus.emit("equipment_parts_changed", 1)
+        bus.emit("equipment_parts_changed", 2)
+        bus.emit("tasks.changed")
+        assert calls == []
+
+    assert calls == ["refresh", 1, 2]
+
+    bus.emit("tasks.changed")
+    assert calls == ["refresh", 1, 2, "refresh"]
@@ -0,0 +1,10 @@
+from ui.utils import get_equipment_folder_path, get_part_folder_path
+
+
+def test_folder_names_replace_unsafe_characters():
+    assert get_part_folder_path("Нож  дисковый/левый", "A-12.3").name == "Нож_дисковый_левый_A-12_3"
+    assert get_part_folder_path("  ", None).name == "Без_названия_Без_артикула"
+    assert get_part_folder_path("Вал__привода", "__").name == "Вал_привода__"
+    assert get_equipment_folder_path("Линия №1 (цех)", "").name == "Линия_1_цех__без_артикула"
+    assert get_part_folder_path("a_ b", "x -_- y").name == "a_b_x_-_-_y"
+    assert get_part_folder_path("Подшипник", "6204RS").name == "Подшипник_6204RS"
@@ -0,0 +1,124 @@
+import logging
+import threading
+from itertools import count
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtWidgets import QApplication
+
+
+class _QuerySignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+    batch = Signal(int, object, bool)
+
+
+class _QueryRunnable(QRunnable):
+    def __init__(self, request_id: int, func, args: tuple, cancel_event: threading.Event | None = None):
+        super().__init__()
+        self.signals = _QuerySignals()
+        self._request_id = request_id
+        self._func = func
+        self._args = args
+        self._cancel_event = cancel_event
+
+    @property
+    def batched(self) -> bool:
+        return self._cancel_event is not None
+
+    def cancel(self):
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def _run_batches(self):
+        first = True
+        for rows in self._func(*self._args):
+            if self._cancel_event.is_set():
+                break
+            self.signals.batch.emit(self._request_id, rows, first)
+            first = False
+
+    def run(self):
+        try:
+            if self._cancel_event is None:
+                result = self._func(*self._args)
+            else:
+                result = self._run_batches()
+        except Exception as exc:
+            logging.error(
+                "Ошибка фонового запроса %s: %s",
+                getattr(self._func, '__name__', 'query'),
+                exc,
+                exc_info=True,
+            )
+            self.signals.failed.emit(self._request_id, str(exc))
+        else:
+            self.signals.finished.emit(self._request_id, result)
+
+
+class BackgroundQuery(QObject):
+    """Выполняет запросы к БД в пуле потоков и отдаёт результат в GUI-поток.
+
+    Результат доставляется сигналом ``finished`` только для последнего
+    запущенного запроса: ответы на устаревшие запросы отбрасываются.
+    Ошибка последнего запроса доставляется сигналом ``failed`` с текстом исключения.
+
+    ``run_batches`` принимает функцию, возвращающую итератор порций: каждая
+    порция доставляется сигналом ``batch_ready(rows, first)``, а новый запрос
+    отменяет предыдущий между порциями.
+    """
+
+    finished = Signal(object)
+    batch_ready = Signal(object, bool)
+    failed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = count(1)
+        self._latest_id = 0
+        self._pending: dict[int, _QueryRunnable] = {}
+
+    def run(self, func, *args):
+        self._start(func, args, None)
+
+    def run_batches(self, func, *args):
+        self._start(func, args, threading.Event())
+
+    def _start(self, func, args: tuple, cancel_event: threading.Event | None):
+        request_id = next(self._ids)
+        self._latest_id = request_id
+        for pending in self._pending.values():
+            pending.cancel()
+
+        runnable = _QueryRunnable(request_id, func, args, cancel_event)
+        runnable.setAutoDelete(False)
+        runnable.signals.finished.connect(self._on_finished, Qt.QueuedConnection)
+        runnable.signals.failed.connect(self._on_failed, Qt.QueuedConnection)
+        if cancel_event is not None:
+            runnable.signals.batch.connect(self._on_batch, Qt.QueuedConnection)
+        if not self._pending:
+            QApplication.setOverrideCursor(Qt.BusyCursor)
+        self._pending[request_id] = runnable
+        QThreadPool.globalInstance().start(runnable)
+
+    def is_busy(self) -> bool:
+        return bool(self._pending)
+
+    def _release(self, request_id: int):
+        if self._pending.pop(request_id, None) is not None and not self._pending:
+            QApplication.restoreOverrideCursor()
+
+    def _on_batch(self, request_id: int, rows, first: bool):
+        if request_id == self._latest_id:
+            self.batch_ready.emit(rows, first)
+
+    def _on_finished(self, request_id: int, result):
+        runnable = self._pending.get(request_id)
+        batched = runnable is not None and runnable.batched
+        self._release(request_id)
+        if request_id == self._latest_id and not batched:
+            self.finished.emit(result)
+
+    def _on_failed(self, request_id: int, message: str):
+        self._release(request_id)
+        if request_id == self._latest_id:
+            self.failed.emit(message)
@@ -60,16 +60,12 @@ class CategoryManagerDialog(QDialog):
     def add_category(self):
         text, ok = QInputDialog.getText(self, "Новая категория", "Введите наименование:")
         if ok and text.strip():
-            try:
-                cursor = self.db.conn.cursor()
-                cursor.execute("INSERT INTO part_categories (name) VALUES (?)", (text.strip(),))
-                self.db.conn.commit()
-                self.changes_made = True
-                self.load_categories()
-            except Exception as e:
-                self.db.conn.rollback()
-                logging.error(f"Ошибка добавления категории '{text}': {e}")
-                QMessageBox.warning(self, "Ошибка", f"Не удалось добавить категорию.\nВозможно, она уже существует.")
+            success, message = self.db.add_part_category(text.strip())
+            if not success:
+                QMessageBox.warning(self, "Ошибка", f"Не удалось добавить категорию.\n{message}")
+                return
+            self.changes_made = True
+            self.load_categories()
     
     def edit_category(self):
         current_item = self.list_widget.currentItem()
@@ -86,16 +82,12 @@ class CategoryManagerDialog(QDialog):
 
         text, ok = QInputDialog.getText(self, "Редактировать категорию", "Новое наименование:", text=old_name)
         if ok and text.strip() and text.strip() != old_name:
-            try:
-                cursor = self.db.conn.cursor()
-                cursor.execute("UPDATE part_categories SET name = ? WHERE id = ?", (text.strip(), cat_id))
-                self.db.conn.commit()
-                self.changes_made = True
-                self.load_categories()
-            except Exception as e:
-                self.db.conn.rollback()
-                logging.error(f"Ошибка переименования категории ID {cat_id}: {e}")
-                QMessageBox.warning(self, "Ошибка", f"Не удалось переименовать категорию.\nВозможно, имя уже занято.")
+            success, message = self.db.update_part_category(cat_id, text.strip())
+            if not success:
+                QMessageBox.warning(self, "Ошибка", f"Не удалось переименовать категорию.\n{message}")
+                return
+            self.changes_made = True
+            self.load_categories()
 
     def delete_category(self):
         current_item = self.list_widget.currentItem()
@@ -116,16 +108,12 @@ class CategoryManagerDialog(QDialog):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            try:
-                cursor = self.db.conn.cursor()
-                cursor.execute("DELETE FROM part_categories WHERE id = ?", (cat_id,))
-                self.db.conn.commit()
-                self.changes_made = True
-                self.load_categories()
-            except Exception as e:
-                self.db.conn.rollback()
-                logging.error(f"Ошибка удаления категории ID {cat_id}: {e}")
-                QMessageBox.warning(self, "Ошибка", f"Не удалось удалить категорию: {e}")
+            success, message = self.db.delete_part_category(cat_id)
+            if not success:
+                QMessageBox.warning(self, "Ошибка", f"Не удалось удалить категорию: {message}")
+                return
+            self.changes_made = True
+            self.load_categories()
     
     def reject(self):
         # Если были изменения, выходим со статусом Accepted, чтобы родитель мог обновиться
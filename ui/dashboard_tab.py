@@ -17,14 +17,152 @@ from PySide6.QtWidgets import (
     QCheckBox,
     QInputDialog,
     QLineEdit,
+    QStyledItemDelegate,
 )
-from PySide6.QtGui import QColor, QBrush, QAction, QDesktopServices, QGuiApplication
-from PySide6.QtCore import Qt, QUrl
+from PySide6.QtGui import QColor, QBrush, QAction, QDesktopServices, QGuiApplication, QFont, QFontMetrics, QPainter
+from PySide6.QtCore import Qt, QEvent, QRect, QSize, QTimer, QUrl, Signal
 
+from .background_query import BackgroundQuery
 from .order_dialog import OrderDialog
-from .task_dialog import TaskDialog
 from .utils import build_driver_notification_message, db_string_to_ui_string
-
+
+_TASK_PRIORITY_BRUSHES = {
+    "высокий": QBrush(QColor("#FFCCCC")),
+    "средний": QBrush(QColor("#FFE5CC")),
+    "низкий": QBrush(QColor("#FFFFCC")),
+}
+
+_OVERDUE_BRUSH = QBrush(QColor("#ffcdd2"))
+_DUE_SOON_BRUSH = QBrush(QColor("#fff3cd"))
+_REQUIRES_REPLACEMENT_BRUSH = QBrush(QColor("#FFF3CD"))
+_NOTHING_TO_ORDER_BRUSH = QBrush(QColor("#ffcccb"))
+
+_REQUIRES_REPLACEMENT_NOTE = (
+    "Запчасть помечена как требующая замены, но на складе отсутствует. "
+    "Рекомендуется добавить в заказ."
+)
+
+# Кнопки строк: (текст, действие, цвет). Их рисует ``_RowActionsDelegate``.
+_TASK_ACTIONS = (
+    ("Выполнить", 'выполнена', "#2e7d32"),
+    ("Отменить", 'отменена', "#c62828"),
+    ("Стоп", 'на стопе', "#f9a825"),
+)
+_PERIODIC_ACTIONS = (
+    ("Выполнить", 'complete', "#2e7d32"),
+    ("Отменить", 'cancel', "#c62828"),
+    ("Стоп", 'pause', "#f9a825"),
+)
+
+
+def _fill_table(table: QTableWidget, rows: list[dict], set_row) -> None:
+    """Заполняет таблицу за один проход: строки создаются сразу, без перерисовок.
+
+    Сигналы самого виджета о каждой вставленной ячейке на время заполнения
+    заблокированы: на них никто не подписан, а модель таблицы уведомляет
+    представление как обычно.
+    """
+    table.setUpdatesEnabled(False)
+    signals_blocked = table.blockSignals(True)
+    try:
+        table.setRowCount(len(rows))
+        for row, row_data in enumerate(rows):
+            set_row(row, row_data)
+    finally:
+        table.blockSignals(signals_blocked)
+        table.setUpdatesEnabled(True)
+
+
+class _RowActionsDelegate(QStyledItemDelegate):
+    """Рисует кнопки действий строки и сообщает о нажатии сигналом ``clicked``.
+
+    Вместо виджета с кнопками в каждой строке кнопки рисуются только для
+    видимых ячеек. ``clicked`` передаёт id из колонки 0 (Qt.UserRole) и
+    действие нажатой кнопки.
+    """
+
+    clicked = Signal(object, str)
+
+    BUTTON_HEIGHT = 26
+    SPACING = 4
+    PADDING = 8
+    FONT_PIXEL_SIZE = 12
+    _DISABLED_BACKGROUND = QColor("#f0f0f0")
+    _DISABLED_TEXT = QColor("#9e9e9e")
+
+    def __init__(self, actions, parent: QWidget):
+        super().__init__(parent)
+        self._actions = tuple((text, action, QColor(color)) for text, action, color in actions)
+        # Шрифт и ширины кнопок не зависят от строки — считаются один раз.
+        self._font = QFont(parent.font())
+        self._font.setPixelSize(self.FONT_PIXEL_SIZE)
+        metrics = QFontMetrics(self._font)
+        self._widths = tuple(metrics.horizontalAdvance(text) + 2 * self.PADDING for text, _, _ in actions)
+
+    def _button_rects(self, option) -> list[QRect]:
+        rect = option.rect
+        top = rect.top() + max((rect.height() - self.BUTTON_HEIGHT) // 2, 0)
+        height = min(self.BUTTON_HEIGHT, rect.height())
+        left = rect.left()
+        rects = []
+        for width in self._widths:
+            rects.append(QRect(left, top, width, height))
+            left += width + self.SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        enabled = index.siblingAtColumn(0).data(Qt.UserRole) is not None
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self._font)
+        for (text, _, color), rect in zip(self._actions, self._button_rects(option)):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(color if enabled else self._DISABLED_BACKGROUND)
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(Qt.white if enabled else self._DISABLED_TEXT)
+            painter.drawText(rect, Qt.AlignCenter, text)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        rects = self._button_rects(option)
+        width = rects[-1].right() - rects[0].left() + 1 + self.SPACING if rects else 0
+        return QSize(width, self.BUTTON_HEIGHT)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return super().editorEvent(event, model, option, index)
+        item_id = index.siblingAtColumn(0).data(Qt.UserRole)
+        if item_id is None or event.button() != Qt.LeftButton:
+            return False
+        position = event.position().toPoint()
+        for (_, action, _), rect in zip(self._actions, self._button_rects(option)):
+            if rect.contains(position):
+                if event.type() == QEvent.MouseButtonRelease:
+                    self.clicked.emit(item_id, action)
+                # Нажатие на кнопку не должно менять выделение строки.
+                return True
+        return False
+
+
+def _coalesced(parent: QWidget, slot):
+    """Возвращает обработчик события, откладывающий ``slot`` до следующей итерации цикла.
+
+    Все события одной итерации (например, серия ``tasks.changed`` при массовом
+    удалении) дают один вызов ``slot``.
+    """
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(0)
+    timer.timeout.connect(slot)
+
+    def schedule(*args, **kwargs):
+        timer.start()
+
+    return schedule
+
+
 class DashboardTab(QWidget):
     def __init__(self, db, event_bus, main_window):
         super().__init__()
@@ -32,6 +170,11 @@ class DashboardTab(QWidget):
         self.event_bus = event_bus
         self.main_window = main_window
         self._notified_orders: set[int] = set()
+        # Задачи читаются в пуле потоков, таблицы заполняются по готовности.
+        self._tasks_query = BackgroundQuery(self)
+        self._tasks_query.finished.connect(self._apply_tasks)
+        self._periodic_query = BackgroundQuery(self)
+        self._periodic_query.finished.connect(self._apply_periodic_tasks)
         self.init_ui()
         self.connect_events()
         self.refresh_all_tables()
@@ -53,6 +196,9 @@ class DashboardTab(QWidget):
         tasks_group = QGroupBox("Активные задачи")
         tasks_layout = QVBoxLayout()
         self.tasks_table = self._create_tasks_table()
+        self.task_actions_delegate = _RowActionsDelegate(_TASK_ACTIONS, self.tasks_table)
+        self.task_actions_delegate.clicked.connect(self.change_task_status)
+        self.tasks_table.setItemDelegateForColumn(7, self.task_actions_delegate)
         self.tasks_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tasks_table.customContextMenuRequested.connect(self.show_tasks_context_menu)
         self.tasks_table.cellDoubleClicked.connect(self.open_task_from_dashboard)
@@ -62,6 +208,9 @@ class DashboardTab(QWidget):
         periodic_group = QGroupBox("Периодические задачи (до выполнения ≤ 7 дней)")
         periodic_layout = QVBoxLayout()
         self.periodic_table = self._create_periodic_table()
+        self.periodic_actions_delegate = _RowActionsDelegate(_PERIODIC_ACTIONS, self.periodic_table)
+        self.periodic_actions_delegate.clicked.connect(self._handle_periodic_action)
+        self.periodic_table.setItemDelegateForColumn(6, self.periodic_actions_delegate)
         periodic_layout.addWidget(self.periodic_table)
         periodic_group.setLayout(periodic_layout)
         periodic_group.setVisible(False)
@@ -154,10 +303,13 @@ class DashboardTab(QWidget):
         return table
 
     def connect_events(self):
-        self.event_bus.subscribe("parts.changed", self.refresh_parts_table)
-        self.event_bus.subscribe("orders.changed", self.refresh_orders_table)
-        self.event_bus.subscribe("tasks.changed", self.refresh_tasks_table)
-        self.event_bus.subscribe("periodic_tasks.changed", self.refresh_periodic_tasks_table)
+        self.event_bus.subscribe("parts.changed", _coalesced(self, self.refresh_parts_table))
+        self.event_bus.subscribe("orders.changed", _coalesced(self, self.refresh_orders_table))
+        self.event_bus.subscribe("tasks.changed", _coalesced(self, self.refresh_tasks_table))
+        self.event_bus.subscribe(
+            "periodic_tasks.changed",
+            _coalesced(self, self.refresh_periodic_tasks_table),
+        )
         self.event_bus.subscribe(
             "orders.driver_notification_changed",
             self._on_driver_notification_changed,
@@ -169,119 +321,68 @@ class DashboardTab(QWidget):
         self.refresh_periodic_tasks_table()
         self.refresh_orders_table()
 
-    def refresh_parts_table(self):
-        self.parts_table.setRowCount(0)
-        parts = self.db.get_parts_to_order()
-        for row, part in enumerate(parts):
-            self.parts_table.insertRow(row)
-
-            name_item = QTableWidgetItem(part['name'])
-            name_item.setData(Qt.UserRole, part['id'])
-            self.parts_table.setItem(row, 0, name_item)
-
-            self.parts_table.setItem(row, 1, QTableWidgetItem(part['sku']))
-            self.parts_table.setItem(row, 2, QTableWidgetItem(str(part['qty'])))
-            self.parts_table.setItem(row, 3, QTableWidgetItem(str(part['min_qty'])))
-            self.parts_table.setItem(row, 4, QTableWidgetItem(f"{part['price']:.2f}"))
-
-            requires_flag = bool(part.get('requires_replacement_flag'))
-            base_to_order_qty = max(part['min_qty'] - part['qty'], 0)
-            to_order_qty = max(base_to_order_qty, 1) if requires_flag else base_to_order_qty
-            to_order_item = QTableWidgetItem(str(to_order_qty))
-            if requires_flag:
-                note = (
-                    "Запчасть помечена как требующая замены, но на складе отсутствует. "
-                    "Рекомендуется добавить в заказ."
-                )
-                name_item.setToolTip(note)
-                to_order_item.setToolTip(note)
-                to_order_item.setBackground(QColor("#FFF3CD"))
-                for col in range(self.parts_table.columnCount()):
-                    item = self.parts_table.item(row, col)
-                    if item:
-                        item.setBackground(QColor("#FFF3CD"))
-            elif to_order_qty <= 0:
-                to_order_item.setBackground(QColor("#ffcccb"))
-            self.parts_table.setItem(row, 5, to_order_item)
-
-    def refresh_tasks_table(self):
-        self.tasks_table.setRowCount(0)
-        tasks = self.db.get_active_tasks()
-        priority_colors = {"высокий": QColor("#FFCCCC"), "средний": QColor("#FFE5CC"), "низкий": QColor("#FFFFCC")}
-        for row, task in enumerate(tasks):
-            self.tasks_table.insertRow(row)
-
-            title_text = task['title']
-            if task.get('is_replacement'):
-                title_text = f"[Замена] {title_text}"
-
-            title_item = QTableWidgetItem(title_text)
-            title_item.setData(Qt.UserRole, task['id'])
-            self.tasks_table.setItem(row, 0, title_item)
-            
-            self.tasks_table.setItem(row, 1, QTableWidgetItem(task.get('equipment_name', '')))
-            self.tasks_table.setItem(row, 2, QTableWidgetItem(task.get('assignee_name', '')))
-            self.tasks_table.setItem(row, 3, QTableWidgetItem(db_string_to_ui_string(task.get('due_date'))))
-            self.tasks_table.setItem(row, 4, QTableWidgetItem(task['status']))
-            self.tasks_table.setItem(row, 5, QTableWidgetItem(task['priority']))
-            self.tasks_table.setItem(row, 6, QTableWidgetItem(task.get('description', '')))
-
-            color = priority_colors.get(task['priority'])
-            if color:
-                for col in range(self.tasks_table.columnCount() - 1):
-                    item = self.tasks_table.item(row, col)
-                    if item:
-                        item.setBackground(QBrush(color))
-
-            self.tasks_table.setCellWidget(row, 7, self._build_task_actions_widget(task))
-
-    def _build_task_actions_widget(self, task: dict) -> QWidget:
-        task_id = task.get('id')
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(4)
-
-        actions = [
-            ("Выполнить", lambda: self.change_task_status(task_id, 'выполнена'), "#2e7d32"),
-            ("Отменить", lambda: self.change_task_status(task_id, 'отменена'), "#c62828"),
-            ("Стоп", lambda: self.change_task_status(task_id, 'на стопе'), "#f9a825"),
+    def refresh_parts_table(self):
+        parts = self.db.get_parts_to_order()
+        _fill_table(self.parts_table, parts, self._set_part_row)
+
+    def _set_part_row(self, row: int, part: dict):
+        name_item = QTableWidgetItem(part['name'])
+        name_item.setData(Qt.UserRole, part['id'])
+
+        requires_flag = bool(part.get('requires_replacement_flag'))
+        base_to_order_qty = max(part['min_qty'] - part['qty'], 0)
+        to_order_qty = max(base_to_order_qty, 1) if requires_flag else base_to_order_qty
+        to_order_item = QTableWidgetItem(str(to_order_qty))
+        items = [
+            name_item,
+            QTableWidgetItem(part['sku']),
+            QTableWidgetItem(str(part['qty'])),
+            QTableWidgetItem(str(part['min_qty'])),
+            QTableWidgetItem(f"{part['price']:.2f}"),
+            to_order_item,
         ]
 
-        for text, handler, color in actions:
-            button = self._create_small_button(text, color)
-            if task_id is not None:
-                button.clicked.connect(handler)
-            else:
-                button.setEnabled(False)
-            layout.addWidget(button)
-
-        layout.addStretch()
-        return widget
-
-    def _build_periodic_actions_widget(self, task: dict) -> QWidget:
-        task_id = task.get('id')
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(4)
-
-        actions = [
-            ("Выполнить", 'complete', "#2e7d32"),
-            ("Отменить", 'cancel', "#c62828"),
-            ("Стоп", 'pause', "#f9a825"),
+        # Фон задаётся до вставки, а не повторным проходом по вставленным ячейкам.
+        if requires_flag:
+            name_item.setToolTip(_REQUIRES_REPLACEMENT_NOTE)
+            to_order_item.setToolTip(_REQUIRES_REPLACEMENT_NOTE)
+            for item in items:
+                item.setBackground(_REQUIRES_REPLACEMENT_BRUSH)
+        elif to_order_qty <= 0:
+            to_order_item.setBackground(_NOTHING_TO_ORDER_BRUSH)
+
+        for col, item in enumerate(items):
+            self.parts_table.setItem(row, col, item)
+
+    def refresh_tasks_table(self):
+        self._tasks_query.run(self.db.get_active_tasks)
+
+    def _apply_tasks(self, tasks):
+        _fill_table(self.tasks_table, tasks, self._set_task_row)
+
+    def _set_task_row(self, row: int, task: dict):
+        title_text = task['title']
+        if task.get('is_replacement'):
+            title_text = f"[Замена] {title_text}"
+
+        title_item = QTableWidgetItem(title_text)
+        title_item.setData(Qt.UserRole, task['id'])
+        items = [
+            title_item,
+            QTableWidgetItem(task.get('equipment_name', '')),
+            QTableWidgetItem(task.get('assignee_name', '')),
+            QTableWidgetItem(db_string_to_ui_string(task.get('due_date'))),
+            QTableWidgetItem(task['status']),
+            QTableWidgetItem(task['priority']),
+            QTableWidgetItem(task.get('description', '')),
         ]
 
-        for text, action, color in actions:
-            button = self._create_small_button(text, color)
-            if task_id is not None:
-                button.clicked.connect(lambda _, t_id=task_id, act=action: self._handle_periodic_action(t_id, act))
-            else:
-                button.setEnabled(False)
-            layout.addWidget(button)
-
-        layout.addStretch()
-        return widget
+        # Фон задаётся до вставки: иначе каждая ячейка перерисовывается второй раз.
+        brush = _TASK_PRIORITY_BRUSHES.get(task['priority'])
+        for col, item in enumerate(items):
+            if brush is not None:
+                item.setBackground(brush)
+            self.tasks_table.setItem(row, col, item)
 
     def _handle_periodic_action(self, task_id: int, action: str):
         if not task_id:
@@ -558,6 +659,8 @@ class DashboardTab(QWidget):
         if not task_id:
             return
 
+        from .task_dialog import TaskDialog
+
         dialog = TaskDialog(self.db, self.event_bus, task_id=task_id, parent=self.main_window)
         dialog.exec()
 
@@ -573,69 +676,63 @@ class DashboardTab(QWidget):
         dialog.exec()
 
     def refresh_orders_table(self):
-        self.orders_table.setRowCount(0)
         orders = self.db.get_active_orders()
         self._notified_orders = {
             order['id']
             for order in orders
             if order.get('id') is not None and order.get('driver_notified')
         }
-        for row, order in enumerate(orders):
-            self.orders_table.insertRow(row)
+        _fill_table(self.orders_table, orders, self._set_order_row)
 
-            cp_item = QTableWidgetItem(order['counterparty_name'])
-            cp_item.setData(Qt.UserRole, order['id'])
-            self.orders_table.setItem(row, 0, cp_item)
-
-            self.orders_table.setItem(row, 1, QTableWidgetItem(order.get('invoice_no', '')))
-            self.orders_table.setItem(row, 2, QTableWidgetItem(db_string_to_ui_string(order.get('invoice_date'))))
-            self.orders_table.setItem(row, 3, QTableWidgetItem(db_string_to_ui_string(order.get('delivery_date'))))
-            self.orders_table.setItem(row, 4, QTableWidgetItem(order['status']))
-            self.orders_table.setItem(row, 5, QTableWidgetItem(order.get('comment', '')))
+    def _set_order_row(self, row: int, order: dict):
+        table = self.orders_table
+        cp_item = QTableWidgetItem(order['counterparty_name'])
+        cp_item.setData(Qt.UserRole, order['id'])
+        table.setItem(row, 0, cp_item)
 
-            self.orders_table.setCellWidget(row, 6, self._build_order_actions_widget(order))
+        table.setItem(row, 1, QTableWidgetItem(order.get('invoice_no', '')))
+        table.setItem(row, 2, QTableWidgetItem(db_string_to_ui_string(order.get('invoice_date'))))
+        table.setItem(row, 3, QTableWidgetItem(db_string_to_ui_string(order.get('delivery_date'))))
+        table.setItem(row, 4, QTableWidgetItem(order['status']))
+        table.setItem(row, 5, QTableWidgetItem(order.get('comment', '')))
+
+        table.setCellWidget(row, 6, self._build_order_actions_widget(order))
 
     def refresh_periodic_tasks_table(self):
-        tasks = self.db.get_due_periodic_tasks()
+        self._periodic_query.run(self.db.get_due_periodic_tasks)
+
+    def _apply_periodic_tasks(self, tasks):
         self.periodic_group.setVisible(bool(tasks))
         table = self.periodic_table
-        table.setRowCount(0)
-
-        for row, task in enumerate(tasks):
-            table.insertRow(row)
-
-            title = task.get('title') or ""
-            subject = self._format_periodic_subject(task)
-            period_days = str(task.get('period_days') or "")
-            last_date = db_string_to_ui_string(task.get('last_completed_date'))
-            next_due = db_string_to_ui_string(task.get('next_due_date'))
-            days_text = self._format_days_until_due(task.get('days_until_due'))
-
-            values = [title, subject, period_days, last_date, next_due, days_text]
-
-            for col, value in enumerate(values):
-                item = QTableWidgetItem(value)
-                item.setData(Qt.UserRole, task.get('id'))
-                table.setItem(row, col, item)
-
-            days_until = task.get('days_until_due')
-            color = None
-            if days_until is not None:
-                if days_until < 0:
-                    color = QColor("#ffcdd2")
-                elif days_until <= 3:
-                    color = QColor("#fff3cd")
-
-            if color:
-                for col in range(table.columnCount()):
-                    item = table.item(row, col)
-                    if item:
-                        item.setBackground(QBrush(color))
-
-            table.setCellWidget(row, 6, self._build_periodic_actions_widget(task))
-
+        _fill_table(table, tasks, self._set_periodic_row)
         table.resizeColumnsToContents()
 
+    def _set_periodic_row(self, row: int, task: dict):
+        table = self.periodic_table
+        title = task.get('title') or ""
+        subject = self._format_periodic_subject(task)
+        period_days = str(task.get('period_days') or "")
+        last_date = db_string_to_ui_string(task.get('last_completed_date'))
+        next_due = db_string_to_ui_string(task.get('next_due_date'))
+        days_text = self._format_days_until_due(task.get('days_until_due'))
+
+        values = [title, subject, period_days, last_date, next_due, days_text]
+
+        days_until = task.get('days_until_due')
+        brush = None
+        if days_until is not None:
+            if days_until < 0:
+                brush = _OVERDUE_BRUSH
+            elif days_until <= 3:
+                brush = _DUE_SOON_BRUSH
+
+        items = [QTableWidgetItem(value) for value in values]
+        items[0].setData(Qt.UserRole, task.get('id'))
+        for col, item in enumerate(items):
+            if brush is not None:
+                item.setBackground(brush)
+            table.setItem(row, col, item)
+
     @staticmethod
     def _format_periodic_subject(task: dict) -> str:
         equipment_name = task.get('equipment_name') or ""
@@ -12,13 +12,15 @@ from .equipment_dialog import EquipmentDialog
 from .attach_part_dialog import AttachPartDialog
 from .edit_attached_part_dialog import EditAttachedPartDialog
 from .replacement_dialog import ReplacementDialog
-from .task_dialog import TaskDialog
 from .utils import (
     open_part_folder as open_part_folder_fs,
     open_equipment_folder as open_equipment_folder_fs,
     move_part_folder_on_rename,
 )
 
+_COMPLEX_ROW_HIGHLIGHT = QColor('#e3f2fd')
+
+
 class EquipmentTab(QWidget):
     def __init__(self, db, event_bus, parent=None):
         super().__init__(parent)
@@ -966,11 +968,10 @@ class EquipmentTab(QWidget):
             self.load_parts_for_equipment(self.current_equipment_id)
 
     def _apply_complex_row_style(self, row_index: int, name_widget: QWidget, actions_widget: QWidget):
-        highlight = QColor('#e3f2fd')
         for column in range(self.parts_table.columnCount()):
             item = self.parts_table.item(row_index, column)
             if item:
-                item.setBackground(highlight)
+                item.setBackground(_COMPLEX_ROW_HIGHLIGHT)
         name_widget.setStyleSheet('background-color: #e3f2fd;')
         actions_widget.setStyleSheet('background-color: #e3f2fd;')
 
@@ -1361,6 +1362,8 @@ class EquipmentTab(QWidget):
             'equipment_id': equipment_id,
         }
 
+        from .task_dialog import TaskDialog
+
         dialog = TaskDialog(self.db, self.event_bus, parent=self, preselected_parts=[preselected_part])
         dialog.title_edit.setText(default_title)
 
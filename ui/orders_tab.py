@@ -14,6 +14,16 @@ from .utils import (
 )
 
 
+_COMPLETED_STATUS_PREFIXES = ("принят", "отмен")
+_COMPLETED_STATUSES = frozenset(("accepted", "cancelled", "canceled"))
+
+
+def _is_completed_status(status) -> bool:
+    """Принятые и отменённые заказы считаются завершёнными."""
+    normalized = " ".join(str(status or "").lower().replace('ё', 'е').split())
+    return normalized.startswith(_COMPLETED_STATUS_PREFIXES) or normalized in _COMPLETED_STATUSES
+
+
 class OrdersTableModel(QAbstractTableModel):
     """Модель данных для таблицы заказов."""
 
@@ -36,6 +46,7 @@ class OrdersTableModel(QAbstractTableModel):
         ]
         self._data = []
         self._notified_orders: set[int] = set()
+        self._completed_rows: frozenset = frozenset()
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
@@ -55,7 +66,7 @@ class OrdersTableModel(QAbstractTableModel):
             if col == 1: return f"{row_data.get('invoice_no', '')}"
             if col == 2: return db_string_to_ui_string(row_data.get('invoice_date'))
             if col == 3: return db_string_to_ui_string(row_data.get('delivery_date'))
-            if col == 4: return db_string_to_ui_string(row_data.get('created_at', '').split(' ')[0]) # Только дата
+            if col == 4: return db_string_to_ui_string((row_data.get('created_at') or '').partition(' ')[0]) # Только дата
             if col == 5: return row_data.get('delivery_address') or row_data.get('counterparty_address', '')
             if col == 6: return row_data['status']
             if col == 7: return row_data.get('comment', '')
@@ -92,8 +103,15 @@ class OrdersTableModel(QAbstractTableModel):
             if row.get('id') is not None and row.get('driver_notified')
         }
         self._notified_orders = set(notified_ids)
+        self._completed_rows = frozenset(
+            row for row, order in enumerate(data) if _is_completed_status(order.get('status'))
+        )
         self.endResetModel()
 
+    def completed_rows(self) -> frozenset:
+        """Номера строк модели с принятыми или отменёнными заказами."""
+        return self._completed_rows
+
     def get_row(self, row_index: int) -> dict | None:
         if 0 <= row_index < len(self._data):
             return self._data[row_index]
@@ -126,17 +144,7 @@ class OrdersFilterProxyModel(QSortFilterProxyModel):
     def filterAcceptsRow(self, source_row, source_parent):
         if not self._hide_completed:
             return True
-
-        index = self.sourceModel().index(source_row, OrdersTableModel.STATUS_COLUMN, source_parent)
-        status = self.sourceModel().data(index) or ""
-        normalized = " ".join(str(status).lower().replace('ё', 'е').split())
-        if normalized.startswith("принят"):
-            return False
-        if normalized.startswith("отмен"):
-            return False
-        if normalized in {"accepted", "cancelled", "canceled"}:
-            return False
-        return True
+        return source_row not in self.sourceModel().completed_rows()
 
 class OrdersTab(QWidget):
     """Вкладка для управления заказами."""
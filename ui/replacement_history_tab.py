@@ -13,32 +13,235 @@ from PySide6.QtWidgets import (
     QLabel,
     QTabWidget,
 )
-from PySide6.QtCore import Qt, QSortFilterProxyModel, QAbstractTableModel, QModelIndex, QDate
+from PySide6.QtCore import (
+    Qt,
+    QSortFilterProxyModel,
+    QAbstractTableModel,
+    QModelIndex,
+    QDate,
+    QItemSelection,
+    QItemSelectionModel,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QStandardItem, QStandardItemModel
 
+from .background_query import BackgroundQuery
 from .edit_replacement_dialog import EditReplacementDialog
 from .order_dialog import OrderDialog
-from .task_dialog import TaskDialog
 from .utils import (
     apply_table_compact_style,
+    contiguous_row_ranges,
     db_string_to_ui_string,
     last_year_start_date,
     qdate_to_db_string,
 )
 
+# Роли читаются в data() на каждую ячейку, поэтому обращение к Qt.* вынесено сюда.
+_DISPLAY_ROLE = Qt.DisplayRole
+_USER_ROLE = Qt.UserRole
+
+# Пауза, за которую серия изменений фильтров и событий сводится в один запрос.
+_REFRESH_DELAY_MS = 150
+
+
+# Размер страницы при постраничной загрузке истории.
+_HISTORY_PAGE_SIZE = 200
+
+# Стиль подписей над фильтрами.
+_LABEL_QSS = "font-weight: 500;"
+
+
+def _make_labeled_block(title: str, widget: QWidget) -> QWidget:
+    """Возвращает фильтр: подпись над виджетом."""
+    container = QWidget()
+    container_layout = QVBoxLayout(container)
+    container_layout.setContentsMargins(0, 0, 0, 0)
+    container_layout.setSpacing(4)
+    label = QLabel(title)
+    label.setStyleSheet(_LABEL_QSS)
+    container_layout.addWidget(label)
+    container_layout.addWidget(widget)
+    return container
+
+
+def _make_period_block(start_edit: QDateEdit, end_edit: QDateEdit) -> QWidget:
+    """Возвращает фильтр «Период» с полями «с:» и «по:»."""
+    period_inputs = QHBoxLayout()
+    period_inputs.setContentsMargins(0, 0, 0, 0)
+    period_inputs.setSpacing(6)
+    period_inputs.addWidget(QLabel("с:"))
+    period_inputs.addWidget(start_edit)
+    period_inputs.addWidget(QLabel("по:"))
+    period_inputs.addWidget(end_edit)
+
+    period_container = QWidget()
+    period_layout = QVBoxLayout(period_container)
+    period_layout.setContentsMargins(0, 0, 0, 0)
+    period_layout.setSpacing(4)
+    period_label = QLabel("Период")
+    period_label.setStyleSheet(_LABEL_QSS)
+    period_layout.addWidget(period_label)
+    period_layout.addLayout(period_inputs)
+    return period_container
+
+
+def _fetch_history_page(fetch, args: tuple, after, cursor_key):
+    """Читает страницу истории (в фоновом потоке) с запасом в одну строку.
+
+    Возвращает ``(первая_страница, строки, есть_ещё, курсор)``.
+    """
+    rows = fetch(*args, after=after, limit=_HISTORY_PAGE_SIZE + 1)
+    has_more = len(rows) > _HISTORY_PAGE_SIZE
+    rows = rows[:_HISTORY_PAGE_SIZE]
+    cursor = cursor_key(rows[-1]) if rows else after
+    return after is None, rows, has_more, cursor
+
+
+def _enable_prefetch(table: QTableView, model) -> None:
+    """Догружает следующую страницу, когда прокрутка подходит к концу таблицы."""
+    scroll_bar = table.verticalScrollBar()
+
+    def on_scrolled(value: int):
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep() and model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+
+    scroll_bar.valueChanged.connect(on_scrolled)
+
+
+def _make_refresh_timer(parent: QWidget, slot) -> QTimer:
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(_REFRESH_DELAY_MS)
+    timer.timeout.connect(slot)
+    return timer
+
+
+def _lookup_changed(db, versions: dict[str, int], key: str) -> bool:
+    """Запоминает версию справочника и сообщает, изменился ли он с прошлой загрузки."""
+    version = db.cache_version(key)
+    if versions.get(key) == version:
+        return False
+    versions[key] = version
+    return True
+
+
+def _build_combo_model(combo: QComboBox, placeholder: str, items: list[tuple]) -> QStandardItemModel:
+    """Собирает модель пунктов фильтра целиком, чтобы вставить их одним сигналом."""
+    column = [QStandardItem(placeholder)]
+    column[0].setData(0, Qt.UserRole)
+    for item_id, text in items:
+        item = QStandardItem(text)
+        item.setData(item_id, Qt.UserRole)
+        column.append(item)
+
+    model = QStandardItemModel(combo)
+    model.appendColumn(column)
+    return model
+
+
+def _sync_combo_items(combo: QComboBox, placeholder: str, items: list[tuple]) -> bool:
+    """Приводит пункты фильтра к ``items`` (пары ``(id, текст)``), меняя только различия.
+
+    Первый пункт — ``placeholder`` со значением 0. Пустой фильтр и списки,
+    изменившиеся больше чем наполовину, заполняются заменой модели целиком.
+    Возвращает True, если выбранный пункт пропал и фильтр сброшен на него.
+    """
+    current = [(combo.itemData(i), combo.itemText(i)) for i in range(1, combo.count())]
+    if combo.count() and current == items:
+        return False
+
+    selected_id = combo.currentData()
+    new_ids = {item_id for item_id, _ in items}
+    changed = len(new_ids.symmetric_difference(item_id for item_id, _ in current))
+    combo.blockSignals(True)
+
+    if not combo.count() or changed > len(items) // 2:
+        combo.setModel(_build_combo_model(combo, placeholder, items))
+    else:
+        for i in range(combo.count() - 1, 0, -1):
+            if combo.itemData(i) not in new_ids:
+                combo.removeItem(i)
+
+        for position, (item_id, text) in enumerate(items, start=1):
+            if combo.itemData(position) != item_id:
+                existing = combo.findData(item_id)
+                if existing > 0:
+                    combo.removeItem(existing)
+                combo.insertItem(position, text, item_id)
+            elif combo.itemText(position) != text:
+                combo.setItemText(position, text)
+
+    reset = bool(selected_id) and selected_id not in new_ids
+    combo.setCurrentIndex(0 if reset else max(combo.findData(selected_id), 0))
+    combo.blockSignals(False)
+    return reset
+
+
+def _unique_messages(messages) -> list[str]:
+    """Оставляет первое вхождение каждого сообщения об ошибке, сохраняя порядок."""
+    seen_errors: set[str] = set()
+    errors: list[str] = []
+    for message in messages:
+        if message not in seen_errors:
+            seen_errors.add(message)
+            errors.append(message)
+    return errors
+
+
+def _fit_columns_once(table: QTableView) -> None:
+    """Один раз подгоняет ширину колонок под первые загруженные строки.
+
+    Режим ResizeToContents пересчитывал бы ширины по всем строкам при каждом
+    сбросе модели; после первой подгонки ширины меняет пользователь.
+    """
+    if table.property("columnsFitted") or not table.model().rowCount():
+        return
+    table.resizeColumnsToContents()
+    table.setProperty("columnsFitted", True)
+
+
+def _restore_selection(table: QTableView, keys, key_for_index) -> None:
+    """Повторно выделяет строки, ключи которых были выделены до перезагрузки модели."""
+    if not keys:
+        return
+
+    model = table.model()
+    last_column = model.columnCount() - 1
+    selection = QItemSelection()
+    for row in range(model.rowCount()):
+        index = model.index(row, 0)
+        if key_for_index(index) in keys:
+            selection.select(index, model.index(row, last_column))
+
+    if not selection.isEmpty():
+        table.selectionModel().select(selection, QItemSelectionModel.Select)
+
+
+class _HistoryTableModel(QAbstractTableModel):
+    """Общая часть табличных моделей истории.
+
+    Строки хранятся в ``self._data`` кортежами: сначала готовые строки для
+    отображения в порядке колонок, затем служебные поля. ``_pack_row``
+    формирует кортеж один раз при загрузке, поэтому ``data()`` сводится к
+    обращению по индексу. ``_ID_FIELD`` — позиция значения для Qt.UserRole.
+
+    Модель поддерживает догрузку через canFetchMore/fetchMore: сама она
+    данные не читает, а испускает ``more_requested`` для представления.
+
+    Сортирует модель сама (см. ``_HistorySortProxyModel``): загруженные и
+    догруженные строки сразу упорядочиваются по выбранной колонке.
+    """
+
+    more_requested = Signal()
 
-class ReplacementsTableModel(QAbstractTableModel):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._headers = [
-            "Дата",
-            "Оборудование",
-            "Запчасть (Наименование)",
-            "Артикул",
-            "Категория",
-            "Кол-во",
-            "Причина",
-        ]
-        self._data = []
+        self._headers: list[str] = []
+        self._data: list[tuple] = []
+        self._has_more = False
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
@@ -46,46 +249,162 @@ class ReplacementsTableModel(QAbstractTableModel):
     def columnCount(self, parent=QModelIndex()):
         return len(self._headers)
 
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role != _DISPLAY_ROLE and role != _USER_ROLE:
             return None
 
-        row_data = self._data[index.row()]
-        col = index.column()
-
-        if role == Qt.DisplayRole:
-            if col == 0:
-                return db_string_to_ui_string(row_data['date'])
-            if col == 1:
-                return row_data['equipment_name']
-            if col == 2:
-                return row_data['part_name']
-            if col == 3:
-                return row_data['part_sku']
-            if col == 4:
-                return row_data.get('part_category_name', '')
-            if col == 5:
-                return str(row_data['qty'])
-            if col == 6:
-                return row_data['reason']
-
-        if role == Qt.UserRole:
-            return row_data['id']
+        rows = self._data
+        row = index.row()
+        if row < 0 or row >= len(rows):
+            return None
 
-        return None
+        row_data = rows[row]
+        if role == _DISPLAY_ROLE:
+            return row_data[index.column()]
+        return row_data[self._ID_FIELD]
 
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self._headers[section]
-        return None
+    def canFetchMore(self, parent=QModelIndex()):
+        return self._has_more and not parent.isValid()
+
+    def fetchMore(self, parent=QModelIndex()):
+        # Флаг сбрасывает представление, когда запрос действительно отправлен:
+        # если запрос отложен, представление повторит fetchMore позже.
+        if self.canFetchMore(parent):
+            self.more_requested.emit()
+
+    def set_has_more(self, has_more: bool):
+        self._has_more = has_more
 
-    def load_data(self, data):
+    @staticmethod
+    def _pack_row(row) -> tuple:
+        """Принимает уже упакованную строку; подклассы собирают кортеж из записи БД."""
+        return row
+
+    def _pack_rows(self, rows) -> list:
+        pack_row = self._pack_row
+        return [pack_row(row) for row in rows]
+
+    def _sort_key(self):
+        column = self._sort_column
+        return lambda row_data: row_data[column] or ''
+
+    def load_data(self, rows, has_more: bool = False):
+        packed = self._pack_rows(rows)
+        if self._sort_column >= 0:
+            packed.sort(key=self._sort_key(), reverse=self._sort_order == Qt.DescendingOrder)
         self.beginResetModel()
-        self._data = data
+        self._data = packed
+        self._has_more = has_more
         self.endResetModel()
 
+    def append_rows(self, rows, has_more: bool = False):
+        packed = self._pack_rows(rows)
+        if packed:
+            first = len(self._data)
+            self.beginInsertRows(QModelIndex(), first, first + len(packed) - 1)
+            self._data.extend(packed)
+            self.endInsertRows()
+            self._sort_rows()
+        self._has_more = has_more
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._sort_rows()
+
+    def _sort_rows(self):
+        """Переупорядочивает строки по текущей колонке, сохраняя выделение."""
+        rows = self._data
+        if self._sort_column < 0 or len(rows) < 2:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        key = self._sort_key()
+        permutation = sorted(
+            range(len(rows)),
+            key=lambda row: key(rows[row]),
+            reverse=self._sort_order == Qt.DescendingOrder,
+        )
+        self._data = [rows[row] for row in permutation]
+
+        persistent = self.persistentIndexList()
+        if persistent:
+            positions = [0] * len(permutation)
+            for new_row, old_row in enumerate(permutation):
+                positions[old_row] = new_row
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(positions[index.row()], index.column()) for index in persistent],
+            )
+        self.layoutChanged.emit()
+
+    def _row_key(self, row_data):
+        return row_data[self._ID_FIELD]
+
+    def source_rows_for(self, keys) -> list[int]:
+        """Возвращает номера строк, ключи которых входят в ``keys``."""
+        if not keys:
+            return []
+        row_key = self._row_key
+        return [row for row, row_data in enumerate(self._data) if row_key(row_data) in keys]
+
+    def remove_rows(self, source_rows: list[int]):
+        """Удаляет строки без сброса модели, объединяя соседние в диапазоны."""
+        for first, last in contiguous_row_ranges(source_rows):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._data[first:last + 1]
+            self.endRemoveRows()
+
+
+class _HistorySortProxyModel(QSortFilterProxyModel):
+    """Прокси, передающий сортировку исходной модели истории.
+
+    Стандартная сортировка прокси вызывает Python-метод ``data()`` на каждое
+    сравнение и повторяется при каждом сбросе модели; исходная модель
+    сортирует готовые кортежи строк за один проход ``list.sort``.
+    """
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+
+class ReplacementsTableModel(_HistoryTableModel):
+    _ID_FIELD = 7
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = [
+            "Дата",
+            "Оборудование",
+            "Запчасть (Наименование)",
+            "Артикул",
+            "Категория",
+            "Кол-во",
+            "Причина",
+        ]
+
+    @staticmethod
+    def _pack_row(row: dict) -> tuple:
+        return (
+            db_string_to_ui_string(row['date']),
+            row['equipment_name'],
+            row['part_name'],
+            row['part_sku'],
+            row.get('part_category_name') or '',
+            str(row['qty']),
+            row['reason'],
+            row['id'],
+        )
+
+
+class OrdersHistoryTableModel(_HistoryTableModel):
+    _ID_FIELD = 6
 
-class OrdersHistoryTableModel(QAbstractTableModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._headers = [
@@ -96,57 +415,30 @@ class OrdersHistoryTableModel(QAbstractTableModel):
             "Адрес доставки",
             "Комментарий",
         ]
-        self._data: list[dict] = []
 
-    def rowCount(self, parent=QModelIndex()):
-        return len(self._data)
-
-    def columnCount(self, parent=QModelIndex()):
-        return len(self._headers)
-
-    def data(self, index: QModelIndex, role=Qt.DisplayRole):
-        if not index.isValid():
-            return None
-
-        row = self._data[index.row()]
-        col = index.column()
-
-        if role == Qt.DisplayRole:
-            if col == 0:
-                base_date = (
-                    row.get('delivery_date')
-                    or row.get('invoice_date')
-                    or (row.get('created_at', '').split(' ')[0] if row.get('created_at') else '')
-                )
-                return db_string_to_ui_string(base_date)
-            if col == 1:
-                return row.get('counterparty_name', '')
-            if col == 2:
-                return row.get('invoice_no', '')
-            if col == 3:
-                return db_string_to_ui_string(row.get('invoice_date'))
-            if col == 4:
-                return row.get('delivery_address') or row.get('counterparty_address', '')
-            if col == 5:
-                return row.get('comment', '')
-
-        if role == Qt.UserRole:
-            return row.get('id')
+    @staticmethod
+    def _pack_row(row: dict) -> tuple:
+        get = row.get
+        created_at = get('created_at')
+        base_date = (
+            get('delivery_date')
+            or get('invoice_date')
+            or (created_at.partition(' ')[0] if created_at else '')
+        )
+        return (
+            db_string_to_ui_string(base_date),
+            get('counterparty_name', ''),
+            get('invoice_no', ''),
+            db_string_to_ui_string(get('invoice_date')),
+            get('delivery_address') or get('counterparty_address', ''),
+            get('comment', ''),
+            get('id'),
+        )
 
-        return None
 
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self._headers[section]
-        return None
-
-    def load_data(self, rows: list[dict]):
-        self.beginResetModel()
-        self._data = rows
-        self.endResetModel()
+class TasksHistoryTableModel(_HistoryTableModel):
+    _ID_FIELD = 7
 
-
-class TasksHistoryTableModel(QAbstractTableModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._headers = [
@@ -158,59 +450,30 @@ class TasksHistoryTableModel(QAbstractTableModel):
             "Статус",
             "Комментарий",
         ]
-        self._data: list[dict] = []
-
-    def rowCount(self, parent=QModelIndex()):
-        return len(self._data)
-
-    def columnCount(self, parent=QModelIndex()):
-        return len(self._headers)
 
-    def data(self, index: QModelIndex, role=Qt.DisplayRole):
-        if not index.isValid():
-            return None
-
-        row = self._data[index.row()]
-        col = index.column()
-
-        if role == Qt.DisplayRole:
-            if col == 0:
-                created = row.get('created_at')
-                created_date = created.split(' ')[0] if created else None
-                return db_string_to_ui_string(created_date)
-            if col == 1:
-                title = row.get('title') or ''
-                if row.get('priority'):
-                    return f"[{row['priority']}] {title}"
-                return title
-            if col == 2:
-                return row.get('equipment_name', '')
-            if col == 3:
-                return row.get('assignee_name', '')
-            if col == 4:
-                return db_string_to_ui_string(row.get('due_date'))
-            if col == 5:
-                return row.get('status', '')
-            if col == 6:
-                return row.get('description', '')
-
-        if role == Qt.UserRole:
-            return row.get('id')
-
-        return None
-
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self._headers[section]
-        return None
+    @staticmethod
+    def _pack_row(row: dict) -> tuple:
+        get = row.get
+        created = get('created_at')
+        title = get('title') or ''
+        priority = get('priority')
+        return (
+            db_string_to_ui_string(created.partition(' ')[0] if created else None),
+            f"[{priority}] {title}" if priority else title,
+            get('equipment_name', ''),
+            get('assignee_name', ''),
+            db_string_to_ui_string(get('due_date')),
+            get('status', ''),
+            get('description', ''),
+            get('id'),
+        )
 
-    def load_data(self, rows: list[dict]):
-        self.beginResetModel()
-        self._data = rows
-        self.endResetModel()
 
+class KnifeOperationsHistoryModel(_HistoryTableModel):
+    # За колонками следуют id записи и ключ (тип, id) для операций над ней.
+    _ID_FIELD = 6
+    _KEY_FIELD = 7
 
-class KnifeOperationsHistoryModel(QAbstractTableModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._headers = [
@@ -221,74 +484,87 @@ class KnifeOperationsHistoryModel(QAbstractTableModel):
             "Описание",
             "Тип",
         ]
-        self._data: list[dict] = []
 
-    def rowCount(self, parent=QModelIndex()):
-        return len(self._data)
+    @staticmethod
+    def _pack_row(row: dict) -> tuple:
+        get = row.get
+        comment = get('comment', '') or ''
+        if get('entry_type') == 'status':
+            from_status = get('from_status') or '—'
+            to_status = get('to_status') or '—'
+            description = f"Статус: {from_status} → {to_status}"
+            if comment:
+                description = f"{description} ({comment})"
+            entry_type = 'Статус'
+        else:
+            description = comment or '—'
+            entry_type = 'Заточка'
+        return (
+            db_string_to_ui_string(get('event_date')),
+            get('event_time') or '',
+            get('part_name', ''),
+            get('part_sku', ''),
+            description,
+            entry_type,
+            get('entry_id'),
+            (get('entry_type'), get('entry_id')),
+        )
 
-    def columnCount(self, parent=QModelIndex()):
-        return len(self._headers)
+    def _row_key(self, row_data):
+        return row_data[self._KEY_FIELD]
 
-    def data(self, index: QModelIndex, role=Qt.DisplayRole):
-        if not index.isValid():
-            return None
+    def get_entry(self, row: int) -> dict | None:
+        if 0 <= row < len(self._data):
+            entry_type, entry_id = self._data[row][self._KEY_FIELD]
+            return {'entry_type': entry_type, 'entry_id': entry_id}
+        return None
 
-        row = self._data[index.row()]
-        col = index.column()
-
-        if role == Qt.DisplayRole:
-            if col == 0:
-                return db_string_to_ui_string(row.get('event_date'))
-            if col == 1:
-                return row.get('event_time') or ''
-            if col == 2:
-                return row.get('part_name', '')
-            if col == 3:
-                return row.get('part_sku', '')
-            if col == 4:
-                entry_type = row.get('entry_type')
-                comment = row.get('comment', '') or ''
-                if entry_type == 'status':
-                    from_status = row.get('from_status') or '—'
-                    to_status = row.get('to_status') or '—'
-                    base = f"Статус: {from_status} → {to_status}"
-                    if comment:
-                        base = f"{base} ({comment})"
-                    return base
-                return comment or '—'
-            if col == 5:
-                return 'Статус' if row.get('entry_type') == 'status' else 'Заточка'
-
-        if role == Qt.UserRole:
-            return row.get('entry_id')
 
-        return None
+class _HistoryView(QWidget):
+    """Общее поведение вкладок истории: удаление строк и события об изменениях.
 
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self._headers[section]
-        return None
+    Подклассы создают ``self.model``, ``self.event_bus`` и ``self._refresh_timer``
+    и подписывают ``_on_changed_event`` на событие об изменении своих данных.
+    """
 
-    def load_data(self, rows: list[dict]):
-        self.beginResetModel()
-        self._data = rows
-        self.endResetModel()
+    _skip_own_event = False
 
-    def get_entry(self, row: int) -> dict | None:
-        if 0 <= row < len(self._data):
-            return self._data[row]
-        return None
+    def _remove_rows(self, keys):
+        self.model.remove_rows(self.model.source_rows_for(keys))
 
+    def _emit_without_self_refresh(self, event_type: str):
+        # Удалённые строки уже убраны из модели, поэтому доставку этого события
+        # самому представлению пропускаем; остальные подписчики получают его как обычно.
+        self._skip_own_event = True
+        self.event_bus.emit(event_type)
 
-class ReplacementsHistoryView(QWidget):
+    def _on_changed_event(self, *args):
+        if self._skip_own_event:
+            self._skip_own_event = False
+            return
+        self.refresh_data()
+
+    def _on_query_failed(self, message: str):
+        # Подробности уже записаны в журнал фоновым запросом.
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить историю:\n{message}")
+
+
+class ReplacementsHistoryView(_HistoryView):
     def __init__(self, db, event_bus, parent=None):
         super().__init__(parent)
         self.db = db
         self.event_bus = event_bus
+        self._query = BackgroundQuery(self)
+        self._query.finished.connect(self._apply_rows)
+        self._query.failed.connect(self._on_query_failed)
+        self._refresh_timer = _make_refresh_timer(self, self._do_refresh)
+        self._page_args: tuple = ()
+        self._page_cursor = None
+        self._combo_versions: dict[str, int] = {}
         self._setup_ui()
         self._load_combobox_data()
         self._connect_events()
-        self.refresh_data()
+        self._do_refresh()
 
     def _setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -298,13 +574,14 @@ class ReplacementsHistoryView(QWidget):
         filters_layout.setContentsMargins(0, 0, 0, 0)
         filters_layout.setSpacing(16)
 
+        today = QDate.currentDate()
         self.start_date_edit = QDateEdit()
         self.start_date_edit.setCalendarPopup(True)
-        self.start_date_edit.setDate(last_year_start_date())
+        self.start_date_edit.setDate(last_year_start_date(today))
 
         self.end_date_edit = QDateEdit()
         self.end_date_edit.setCalendarPopup(True)
-        self.end_date_edit.setDate(QDate.currentDate())
+        self.end_date_edit.setDate(today)
 
         self.part_category_combo = QComboBox()
         self.equipment_combo = QComboBox()
@@ -312,45 +589,20 @@ class ReplacementsHistoryView(QWidget):
         self.delete_button = QPushButton("Удалить выбранные")
         self.delete_button.clicked.connect(self.delete_selected_replacements)
 
-        period_container = QWidget()
-        period_container_layout = QVBoxLayout(period_container)
-        period_container_layout.setContentsMargins(0, 0, 0, 0)
-        period_container_layout.setSpacing(4)
-        period_label = QLabel("Период")
-        period_label.setStyleSheet("font-weight: 500;")
-        period_inputs_layout = QHBoxLayout()
-        period_inputs_layout.setContentsMargins(0, 0, 0, 0)
-        period_inputs_layout.setSpacing(6)
-        period_inputs_layout.addWidget(QLabel("с:"))
-        period_inputs_layout.addWidget(self.start_date_edit)
-        period_inputs_layout.addWidget(QLabel("по:"))
-        period_inputs_layout.addWidget(self.end_date_edit)
-        period_container_layout.addWidget(period_label)
-        period_container_layout.addLayout(period_inputs_layout)
-
-        def build_filter_block(title: str, widget: QWidget) -> QWidget:
-            container = QWidget()
-            container_layout = QVBoxLayout(container)
-            container_layout.setContentsMargins(0, 0, 0, 0)
-            container_layout.setSpacing(4)
-            label = QLabel(title)
-            label.setStyleSheet("font-weight: 500;")
-            container_layout.addWidget(label)
-            container_layout.addWidget(widget)
-            return container
-
-        filters_layout.addWidget(period_container)
-        filters_layout.addWidget(build_filter_block("Категория запчасти", self.part_category_combo))
-        filters_layout.addWidget(build_filter_block("Оборудование", self.equipment_combo))
+        filters_layout.addWidget(_make_period_block(self.start_date_edit, self.end_date_edit))
+        filters_layout.addWidget(_make_labeled_block("Категория запчасти", self.part_category_combo))
+        filters_layout.addWidget(_make_labeled_block("Оборудование", self.equipment_combo))
         filters_layout.addStretch()
         filters_layout.addWidget(self.delete_button)
 
         self.model = ReplacementsTableModel()
-        self.proxy_model = QSortFilterProxyModel()
+        self.proxy_model = _HistorySortProxyModel(self)
         self.proxy_model.setSourceModel(self.model)
 
         self.table = QTableView()
         self.table.setModel(self.proxy_model)
+        self.model.more_requested.connect(self._load_next_page)
+        _enable_prefetch(self.table, self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -360,7 +612,7 @@ class ReplacementsHistoryView(QWidget):
         self.table.doubleClicked.connect(self.edit_selected_replacement)
 
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(False)
 
         apply_table_compact_style(self.table)
@@ -368,52 +620,95 @@ class ReplacementsHistoryView(QWidget):
         main_layout.addWidget(filters_container)
         main_layout.addWidget(self.table)
         self.setLayout(main_layout)
-        self.table.selectionModel().selectionChanged.connect(self._update_delete_button_state)
+        # Выбранные ID ведутся по дельтам selectionChanged; сброс модели
+        # очищает выделение без сигнала, поэтому набор сбрасывается отдельно.
+        self._selected_ids: dict[int, None] = {}
+        self.table.selectionModel().selectionChanged.connect(
+            self._on_selection_changed, Qt.UniqueConnection
+        )
+        self.proxy_model.modelReset.connect(self._clear_selected_ids)
         self._update_delete_button_state()
 
     def _load_combobox_data(self):
-        self.part_category_combo.clear()
-        self.part_category_combo.addItem("Все категории", 0)
-        for cat in self.db.get_part_categories():
-            self.part_category_combo.addItem(cat['name'], cat['id'])
+        reset = False
+        if _lookup_changed(self.db, self._combo_versions, "part_categories"):
+            categories = [(cat['id'], cat['name']) for cat in self.db.get_part_categories()]
+            reset |= _sync_combo_items(self.part_category_combo, "Все категории", categories)
 
-        self.equipment_combo.clear()
-        self.equipment_combo.addItem("Все оборудование", 0)
-        for eq in self.db.get_all_equipment():
-            self.equipment_combo.addItem(eq['name'], eq['id'])
+        if _lookup_changed(self.db, self._combo_versions, "equipment"):
+            equipment = [(eq['id'], eq['name']) for eq in self.db.get_all_equipment()]
+            reset |= _sync_combo_items(self.equipment_combo, "Все оборудование", equipment)
+
+        if reset:
+            self.refresh_data()
 
     def _connect_events(self):
         self.start_date_edit.dateChanged.connect(self.refresh_data)
         self.end_date_edit.dateChanged.connect(self.refresh_data)
         self.part_category_combo.currentIndexChanged.connect(self.refresh_data)
         self.equipment_combo.currentIndexChanged.connect(self.refresh_data)
-        self.event_bus.subscribe("replacements.changed", self.refresh_data)
-        self.event_bus.subscribe("equipment.changed", self._load_combobox_data)
-        self.event_bus.subscribe("parts.changed", self._load_combobox_data)
+        self.event_bus.subscribe("replacements.changed", self._on_changed_event, mode='queued')
+        self.event_bus.subscribe("equipment.changed", self._load_combobox_data, mode='queued')
+        self.event_bus.subscribe("parts.changed", self._load_combobox_data, mode='queued')
+
+    def refresh_data(self, *args):
+        self._refresh_timer.start()
 
-    def refresh_data(self):
+    def _do_refresh(self):
         start_date = qdate_to_db_string(self.start_date_edit.date())
         end_date = qdate_to_db_string(self.end_date_edit.date())
         part_category_id = self.part_category_combo.currentData()
         equipment_id = self.equipment_combo.currentData()
 
-        data = self.db.get_all_replacements_filtered(start_date, end_date, part_category_id, equipment_id)
-        self.model.load_data(data)
+        self._page_args = (start_date, end_date, part_category_id, equipment_id)
+        self.model.set_has_more(False)
+        self._query.run(
+            _fetch_history_page, self.db.get_all_replacements_filtered, self._page_args, None, self._replacement_cursor
+        )
 
-    def _selected_source_indexes(self):
-        selection_model = self.table.selectionModel()
-        if not selection_model:
-            return []
-        selected_rows = selection_model.selectedRows()
-        return [self.proxy_model.mapToSource(index) for index in selected_rows]
+    def _load_next_page(self):
+        if self._query.is_busy():
+            return
+        self.model.set_has_more(False)
+        self._query.run(
+            _fetch_history_page, self.db.get_all_replacements_filtered, self._page_args, self._page_cursor, self._replacement_cursor
+        )
+
+    @staticmethod
+    def _replacement_cursor(row: dict) -> tuple:
+        return row['date'], row['id']
+
+    def _apply_rows(self, result):
+        first_page, rows, has_more, self._page_cursor = result
+        if not first_page:
+            self.model.append_rows(rows, has_more)
+            return
+
+        selected_ids = set(self._selected_ids)
+        self.model.load_data(rows, has_more)
+        _restore_selection(self.table, selected_ids, self._id_for_index)
+        _fit_columns_once(self.table)
+
+    def _id_for_index(self, index: QModelIndex):
+        return self.proxy_model.data(index, Qt.UserRole)
+
+    def _on_selection_changed(self, selected, deselected):
+        for index in deselected.indexes():
+            if index.column() == 0:
+                self._selected_ids.pop(self._id_for_index(index), None)
+        for index in selected.indexes():
+            if index.column() == 0:
+                replacement_id = self._id_for_index(index)
+                if replacement_id:
+                    self._selected_ids[replacement_id] = None
+        self._update_delete_button_state()
+
+    def _clear_selected_ids(self):
+        self._selected_ids.clear()
+        self._update_delete_button_state()
 
     def get_selected_replacement_ids(self):
-        ids = []
-        for source_index in self._selected_source_indexes():
-            replacement_id = self.model.data(source_index, Qt.UserRole)
-            if replacement_id:
-                ids.append(replacement_id)
-        return ids
+        return list(self._selected_ids)
 
     def _update_delete_button_state(self):
         has_selection = bool(self.get_selected_replacement_ids())
@@ -455,25 +750,20 @@ class ReplacementsHistoryView(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            success_count = 0
-            errors: list[str] = []
-            for replacement_id in replacement_ids:
-                success, message = self.db.delete_replacement(replacement_id)
-                if success:
-                    success_count += 1
-                else:
-                    errors.append(message)
+            deleted_ids, failed = self.db.delete_replacements_bulk(replacement_ids)
+            success_count = len(deleted_ids)
+            errors = _unique_messages(failed.values())
 
             if success_count:
-                self.event_bus.emit("replacements.changed")
-                self.refresh_data()
+                self._remove_rows(set(deleted_ids))
+                self._emit_without_self_refresh("replacements.changed")
                 info_message = (
                     "Удалена запись из истории замен." if success_count == 1 else f"Удалено записей: {success_count}."
                 )
                 QMessageBox.information(self, "Успех", info_message)
 
             if errors:
-                error_text = "\n".join(dict.fromkeys(errors))
+                error_text = "\n".join(errors)
                 QMessageBox.critical(self, "Ошибка", error_text)
 
     def create_context_menu(self, position):
@@ -495,15 +785,23 @@ class ReplacementsHistoryView(QWidget):
             self.delete_selected_replacements()
 
 
-class OrdersHistoryView(QWidget):
+class OrdersHistoryView(_HistoryView):
     def __init__(self, db, event_bus, parent=None):
         super().__init__(parent)
         self.db = db
         self.event_bus = event_bus
+        self._query = BackgroundQuery(self)
+        self._query.finished.connect(self._apply_rows)
+        self._query.failed.connect(self._on_query_failed)
+        self._refresh_timer = _make_refresh_timer(self, self._do_refresh)
+        self._cached_selection: list | None = None
+        self._page_args: tuple = ()
+        self._page_cursor = None
+        self._combo_versions: dict[str, int] = {}
         self._setup_ui()
         self._load_counterparties()
         self._connect_events()
-        self.refresh_data()
+        self._do_refresh()
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -513,45 +811,19 @@ class OrdersHistoryView(QWidget):
         filters_layout.setContentsMargins(0, 0, 0, 0)
         filters_layout.setSpacing(16)
 
+        today = QDate.currentDate()
         self.start_date_edit = QDateEdit()
         self.start_date_edit.setCalendarPopup(True)
-        self.start_date_edit.setDate(last_year_start_date())
+        self.start_date_edit.setDate(last_year_start_date(today))
 
         self.end_date_edit = QDateEdit()
         self.end_date_edit.setCalendarPopup(True)
-        self.end_date_edit.setDate(QDate.currentDate())
+        self.end_date_edit.setDate(today)
 
         self.counterparty_combo = QComboBox()
 
-        def build_filter_block(title: str, widget: QWidget) -> QWidget:
-            container = QWidget()
-            container_layout = QVBoxLayout(container)
-            container_layout.setContentsMargins(0, 0, 0, 0)
-            container_layout.setSpacing(4)
-            label = QLabel(title)
-            label.setStyleSheet("font-weight: 500;")
-            container_layout.addWidget(label)
-            container_layout.addWidget(widget)
-            return container
-
-        period_container = QWidget()
-        period_layout = QVBoxLayout(period_container)
-        period_layout.setContentsMargins(0, 0, 0, 0)
-        period_layout.setSpacing(4)
-        period_label = QLabel("Период")
-        period_label.setStyleSheet("font-weight: 500;")
-        period_inputs = QHBoxLayout()
-        period_inputs.setContentsMargins(0, 0, 0, 0)
-        period_inputs.setSpacing(6)
-        period_inputs.addWidget(QLabel("с:"))
-        period_inputs.addWidget(self.start_date_edit)
-        period_inputs.addWidget(QLabel("по:"))
-        period_inputs.addWidget(self.end_date_edit)
-        period_layout.addWidget(period_label)
-        period_layout.addLayout(period_inputs)
-
-        filters_layout.addWidget(period_container)
-        filters_layout.addWidget(build_filter_block("Контрагент", self.counterparty_combo))
+        filters_layout.addWidget(_make_period_block(self.start_date_edit, self.end_date_edit))
+        filters_layout.addWidget(_make_labeled_block("Контрагент", self.counterparty_combo))
         filters_layout.addStretch()
 
         self.delete_button = QPushButton("Удалить выбранные")
@@ -559,11 +831,13 @@ class OrdersHistoryView(QWidget):
         filters_layout.addWidget(self.delete_button)
 
         self.model = OrdersHistoryTableModel(self)
-        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model = _HistorySortProxyModel(self)
         self.proxy_model.setSourceModel(self.model)
 
         self.table = QTableView(self)
         self.table.setModel(self.proxy_model)
+        self.model.more_requested.connect(self._load_next_page)
+        _enable_prefetch(self.table, self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -572,36 +846,73 @@ class OrdersHistoryView(QWidget):
         self.table.customContextMenuRequested.connect(self._show_context_menu)
         self.table.doubleClicked.connect(self.open_selected_order)
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(False)
         apply_table_compact_style(self.table)
 
         layout.addWidget(filters_container)
         layout.addWidget(self.table)
-        self.table.selectionModel().selectionChanged.connect(self._update_delete_button_state)
+        # Выделение кэшируется до его изменения; сброс и удаление строк
+        # меняют выделение без selectionChanged, поэтому сбрасывают кэш отдельно.
+        self.table.selectionModel().selectionChanged.connect(
+            self._invalidate_selection_cache, Qt.UniqueConnection
+        )
+        self.proxy_model.modelReset.connect(self._invalidate_selection_cache)
+        self.proxy_model.rowsRemoved.connect(self._invalidate_selection_cache)
+        self.table.selectionModel().selectionChanged.connect(
+            self._update_delete_button_state, Qt.UniqueConnection
+        )
         self._update_delete_button_state()
 
     def _load_counterparties(self):
-        self.counterparty_combo.blockSignals(True)
-        self.counterparty_combo.clear()
-        self.counterparty_combo.addItem("Все контрагенты", 0)
-        for counterparty in self.db.get_all_counterparties():
-            self.counterparty_combo.addItem(counterparty['name'], counterparty['id'])
-        self.counterparty_combo.blockSignals(False)
+        if not _lookup_changed(self.db, self._combo_versions, "counterparties"):
+            return
+        counterparties = [(item['id'], item['name']) for item in self.db.get_all_counterparties()]
+        if _sync_combo_items(self.counterparty_combo, "Все контрагенты", counterparties):
+            self.refresh_data()
 
     def _connect_events(self):
         self.start_date_edit.dateChanged.connect(self.refresh_data)
         self.end_date_edit.dateChanged.connect(self.refresh_data)
         self.counterparty_combo.currentIndexChanged.connect(self.refresh_data)
-        self.event_bus.subscribe("orders.changed", self.refresh_data)
-        self.event_bus.subscribe("counterparties.changed", self._load_counterparties)
+        self.event_bus.subscribe("orders.changed", self._on_changed_event, mode='queued')
+        self.event_bus.subscribe("counterparties.changed", self._load_counterparties, mode='queued')
+
+    def refresh_data(self, *args):
+        self._refresh_timer.start()
 
-    def refresh_data(self):
+    def _do_refresh(self):
         start_date = qdate_to_db_string(self.start_date_edit.date())
         end_date = qdate_to_db_string(self.end_date_edit.date())
         counterparty_id = self.counterparty_combo.currentData()
-        data = self.db.get_completed_orders_history(start_date, end_date, counterparty_id)
-        self.model.load_data(data)
+        self._page_args = (start_date, end_date, counterparty_id)
+        self.model.set_has_more(False)
+        self._query.run(
+            _fetch_history_page, self.db.get_completed_orders_history, self._page_args, None, self._order_cursor
+        )
+
+    def _load_next_page(self):
+        if self._query.is_busy():
+            return
+        self.model.set_has_more(False)
+        self._query.run(
+            _fetch_history_page, self.db.get_completed_orders_history, self._page_args, self._page_cursor, self._order_cursor
+        )
+
+    @staticmethod
+    def _order_cursor(row: dict) -> tuple:
+        return row['sort_date'], row['id']
+
+    def _apply_rows(self, result):
+        first_page, rows, has_more, self._page_cursor = result
+        if not first_page:
+            self.model.append_rows(rows, has_more)
+            return
+
+        selected_ids = set(self._selected_order_ids())
+        self.model.load_data(rows, has_more)
+        _restore_selection(self.table, selected_ids, self._id_for_index)
+        _fit_columns_once(self.table)
 
     def _selected_source_indexes(self):
         selection_model = self.table.selectionModel()
@@ -609,7 +920,18 @@ class OrdersHistoryView(QWidget):
             return []
         return [self.proxy_model.mapToSource(index) for index in selection_model.selectedRows()]
 
+    def _id_for_index(self, index: QModelIndex):
+        return self.proxy_model.data(index, Qt.UserRole)
+
+    def _invalidate_selection_cache(self, *args):
+        self._cached_selection = None
+
     def _selected_order_ids(self):
+        if self._cached_selection is None:
+            self._cached_selection = self._compute_selected_order_ids()
+        return self._cached_selection
+
+    def _compute_selected_order_ids(self):
         ids = []
         for source_index in self._selected_source_indexes():
             order_id = self.model.data(source_index, Qt.UserRole)
@@ -618,7 +940,8 @@ class OrdersHistoryView(QWidget):
         return ids
 
     def _update_delete_button_state(self):
-        self.delete_button.setEnabled(bool(self._selected_order_ids()))
+        selection_model = self.table.selectionModel()
+        self.delete_button.setEnabled(bool(selection_model and selection_model.hasSelection()))
 
     def delete_selected_orders(self):
         order_ids = self._selected_order_ids()
@@ -642,25 +965,20 @@ class OrdersHistoryView(QWidget):
         if reply != QMessageBox.Yes:
             return
 
-        success_count = 0
-        errors: list[str] = []
-        for order_id in order_ids:
-            success, message = self.db.delete_order(order_id)
-            if success:
-                success_count += 1
-            else:
-                errors.append(message)
+        deleted_ids, failed = self.db.delete_orders_bulk(order_ids)
+        success_count = len(deleted_ids)
+        errors = _unique_messages(failed.values())
 
         if success_count:
-            self.event_bus.emit("orders.changed")
-            self.refresh_data()
+            self._remove_rows(set(deleted_ids))
+            self._emit_without_self_refresh("orders.changed")
             summary = (
                 "Заказ удалён." if success_count == 1 else f"Удалено заказов: {success_count}."
             )
             QMessageBox.information(self, "Готово", summary)
 
         if errors:
-            error_text = "\n".join(dict.fromkeys(errors))
+            error_text = "\n".join(errors)
             QMessageBox.critical(self, "Ошибка", error_text)
 
     def open_selected_order(self, index: QModelIndex | None = None):
@@ -701,15 +1019,23 @@ class OrdersHistoryView(QWidget):
             self.delete_selected_orders()
 
 
-class TasksHistoryView(QWidget):
+class TasksHistoryView(_HistoryView):
     def __init__(self, db, event_bus, parent=None):
         super().__init__(parent)
         self.db = db
         self.event_bus = event_bus
+        self._query = BackgroundQuery(self)
+        self._query.finished.connect(self._apply_rows)
+        self._query.failed.connect(self._on_query_failed)
+        self._refresh_timer = _make_refresh_timer(self, self._do_refresh)
+        self._cached_selection: list | None = None
+        self._page_args: tuple = ()
+        self._page_cursor = None
+        self._combo_versions: dict[str, int] = {}
         self._setup_ui()
         self._load_filters()
         self._connect_events()
-        self.refresh_data()
+        self._do_refresh()
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -719,47 +1045,21 @@ class TasksHistoryView(QWidget):
         filters_layout.setContentsMargins(0, 0, 0, 0)
         filters_layout.setSpacing(16)
 
+        today = QDate.currentDate()
         self.start_date_edit = QDateEdit()
         self.start_date_edit.setCalendarPopup(True)
-        self.start_date_edit.setDate(last_year_start_date())
+        self.start_date_edit.setDate(last_year_start_date(today))
 
         self.end_date_edit = QDateEdit()
         self.end_date_edit.setCalendarPopup(True)
-        self.end_date_edit.setDate(QDate.currentDate())
+        self.end_date_edit.setDate(today)
 
         self.assignee_combo = QComboBox()
         self.equipment_combo = QComboBox()
 
-        def block(title: str, widget: QWidget) -> QWidget:
-            container = QWidget()
-            container_layout = QVBoxLayout(container)
-            container_layout.setContentsMargins(0, 0, 0, 0)
-            container_layout.setSpacing(4)
-            label = QLabel(title)
-            label.setStyleSheet("font-weight: 500;")
-            container_layout.addWidget(label)
-            container_layout.addWidget(widget)
-            return container
-
-        period_container = QWidget()
-        period_layout = QVBoxLayout(period_container)
-        period_layout.setContentsMargins(0, 0, 0, 0)
-        period_layout.setSpacing(4)
-        period_label = QLabel("Период")
-        period_label.setStyleSheet("font-weight: 500;")
-        period_inputs = QHBoxLayout()
-        period_inputs.setContentsMargins(0, 0, 0, 0)
-        period_inputs.setSpacing(6)
-        period_inputs.addWidget(QLabel("с:"))
-        period_inputs.addWidget(self.start_date_edit)
-        period_inputs.addWidget(QLabel("по:"))
-        period_inputs.addWidget(self.end_date_edit)
-        period_layout.addWidget(period_label)
-        period_layout.addLayout(period_inputs)
-
-        filters_layout.addWidget(period_container)
-        filters_layout.addWidget(block("Исполнитель", self.assignee_combo))
-        filters_layout.addWidget(block("Оборудование", self.equipment_combo))
+        filters_layout.addWidget(_make_period_block(self.start_date_edit, self.end_date_edit))
+        filters_layout.addWidget(_make_labeled_block("Исполнитель", self.assignee_combo))
+        filters_layout.addWidget(_make_labeled_block("Оборудование", self.equipment_combo))
         filters_layout.addStretch()
 
         self.delete_button = QPushButton("Удалить выбранные")
@@ -767,11 +1067,13 @@ class TasksHistoryView(QWidget):
         filters_layout.addWidget(self.delete_button)
 
         self.model = TasksHistoryTableModel(self)
-        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model = _HistorySortProxyModel(self)
         self.proxy_model.setSourceModel(self.model)
 
         self.table = QTableView(self)
         self.table.setModel(self.proxy_model)
+        self.model.more_requested.connect(self._load_next_page)
+        _enable_prefetch(self.table, self.model)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -780,45 +1082,79 @@ class TasksHistoryView(QWidget):
         self.table.customContextMenuRequested.connect(self._show_context_menu)
         self.table.doubleClicked.connect(self.open_selected_task)
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(False)
         apply_table_compact_style(self.table)
 
         layout.addWidget(filters_container)
         layout.addWidget(self.table)
-        self.table.selectionModel().selectionChanged.connect(self._update_delete_button_state)
+        self.table.selectionModel().selectionChanged.connect(
+            self._invalidate_selection_cache, Qt.UniqueConnection
+        )
+        self.proxy_model.modelReset.connect(self._invalidate_selection_cache)
+        self.proxy_model.rowsRemoved.connect(self._invalidate_selection_cache)
+        self.table.selectionModel().selectionChanged.connect(
+            self._update_delete_button_state, Qt.UniqueConnection
+        )
         self._update_delete_button_state()
 
     def _load_filters(self):
-        self.assignee_combo.blockSignals(True)
-        self.assignee_combo.clear()
-        self.assignee_combo.addItem("Все", 0)
-        for colleague in self.db.get_all_colleagues():
-            self.assignee_combo.addItem(colleague['name'], colleague['id'])
-        self.assignee_combo.blockSignals(False)
-
-        self.equipment_combo.blockSignals(True)
-        self.equipment_combo.clear()
-        self.equipment_combo.addItem("Все", 0)
-        for equipment in self.db.get_all_equipment():
-            self.equipment_combo.addItem(equipment['name'], equipment['id'])
-        self.equipment_combo.blockSignals(False)
+        reset = False
+        if _lookup_changed(self.db, self._combo_versions, "colleagues"):
+            colleagues = [(colleague['id'], colleague['name']) for colleague in self.db.get_all_colleagues()]
+            reset |= _sync_combo_items(self.assignee_combo, "Все", colleagues)
+
+        if _lookup_changed(self.db, self._combo_versions, "equipment"):
+            equipment = [(item['id'], item['name']) for item in self.db.get_all_equipment()]
+            reset |= _sync_combo_items(self.equipment_combo, "Все", equipment)
+
+        if reset:
+            self.refresh_data()
 
     def _connect_events(self):
         self.start_date_edit.dateChanged.connect(self.refresh_data)
         self.end_date_edit.dateChanged.connect(self.refresh_data)
         self.assignee_combo.currentIndexChanged.connect(self.refresh_data)
         self.equipment_combo.currentIndexChanged.connect(self.refresh_data)
-        self.event_bus.subscribe("tasks.changed", self.refresh_data)
-        self.event_bus.subscribe("equipment.changed", self._load_filters)
+        self.event_bus.subscribe("tasks.changed", self._on_changed_event, mode='queued')
+        self.event_bus.subscribe("equipment.changed", self._load_filters, mode='queued')
 
-    def refresh_data(self):
+    def refresh_data(self, *args):
+        self._refresh_timer.start()
+
+    def _do_refresh(self):
         start_date = qdate_to_db_string(self.start_date_edit.date())
         end_date = qdate_to_db_string(self.end_date_edit.date())
         assignee_id = self.assignee_combo.currentData()
         equipment_id = self.equipment_combo.currentData()
-        rows = self.db.get_tasks_history(start_date, end_date, assignee_id, equipment_id)
-        self.model.load_data(rows)
+        self._page_args = (start_date, end_date, assignee_id, equipment_id)
+        self.model.set_has_more(False)
+        self._query.run(
+            _fetch_history_page, self.db.get_tasks_history, self._page_args, None, self._task_cursor
+        )
+
+    def _load_next_page(self):
+        if self._query.is_busy():
+            return
+        self.model.set_has_more(False)
+        self._query.run(
+            _fetch_history_page, self.db.get_tasks_history, self._page_args, self._page_cursor, self._task_cursor
+        )
+
+    @staticmethod
+    def _task_cursor(row: dict) -> tuple:
+        return row['sort_date'], row['sort_created_at'], row['id']
+
+    def _apply_rows(self, result):
+        first_page, rows, has_more, self._page_cursor = result
+        if not first_page:
+            self.model.append_rows(rows, has_more)
+            return
+
+        selected_ids = set(self._selected_task_ids())
+        self.model.load_data(rows, has_more)
+        _restore_selection(self.table, selected_ids, self._id_for_index)
+        _fit_columns_once(self.table)
 
     def _selected_source_indexes(self):
         selection_model = self.table.selectionModel()
@@ -826,7 +1162,18 @@ class TasksHistoryView(QWidget):
             return []
         return [self.proxy_model.mapToSource(index) for index in selection_model.selectedRows()]
 
+    def _id_for_index(self, index: QModelIndex):
+        return self.proxy_model.data(index, Qt.UserRole)
+
+    def _invalidate_selection_cache(self, *args):
+        self._cached_selection = None
+
     def _selected_task_ids(self):
+        if self._cached_selection is None:
+            self._cached_selection = self._compute_selected_task_ids()
+        return self._cached_selection
+
+    def _compute_selected_task_ids(self):
         ids = []
         for source_index in self._selected_source_indexes():
             task_id = self.model.data(source_index, Qt.UserRole)
@@ -835,7 +1182,8 @@ class TasksHistoryView(QWidget):
         return ids
 
     def _update_delete_button_state(self):
-        self.delete_button.setEnabled(bool(self._selected_task_ids()))
+        selection_model = self.table.selectionModel()
+        self.delete_button.setEnabled(bool(selection_model and selection_model.hasSelection()))
 
     def delete_selected_tasks(self):
         task_ids = self._selected_task_ids()
@@ -859,37 +1207,19 @@ class TasksHistoryView(QWidget):
         if reply != QMessageBox.Yes:
             return
 
-        success_count = 0
-        aggregated_events = {
-            'equipment_ids': set(),
-            'parts_changed': False,
-            'replacements_changed': False,
-        }
-        errors: list[str] = []
-
-        for task_id in task_ids:
-            success, message, events = self.db.delete_task(task_id)
-            if success:
-                success_count += 1
-                equipment_ids = events.get('equipment_ids', [])
-                if equipment_ids:
-                    aggregated_events['equipment_ids'].update(equipment_ids)
-                if events.get('parts_changed'):
-                    aggregated_events['parts_changed'] = True
-                if events.get('replacements_changed'):
-                    aggregated_events['replacements_changed'] = True
-            else:
-                errors.append(message)
+        deleted_ids, failed, events = self.db.delete_tasks(task_ids)
+        success_count = len(deleted_ids)
+        errors = _unique_messages(failed.values())
 
         if success_count:
-            self._emit_task_side_effects(aggregated_events)
-            self.event_bus.emit("tasks.changed")
-            self.refresh_data()
+            self._remove_rows(set(deleted_ids))
+            self._emit_task_side_effects(events)
+            self._emit_without_self_refresh("tasks.changed")
             summary = "Задача удалена." if success_count == 1 else f"Удалено задач: {success_count}."
             QMessageBox.information(self, "Готово", summary)
 
         if errors:
-            error_text = "\n".join(dict.fromkeys(errors))
+            error_text = "\n".join(errors)
             QMessageBox.critical(self, "Ошибка", error_text)
 
     def _emit_task_side_effects(self, events: dict):
@@ -917,6 +1247,8 @@ class TasksHistoryView(QWidget):
             QMessageBox.warning(self, "Просмотр задачи", "Не удалось определить идентификатор задачи.")
             return
 
+        from .task_dialog import TaskDialog
+
         dialog = TaskDialog(self.db, self.event_bus, task_id, self)
         if dialog.exec():
             self.refresh_data()
@@ -939,15 +1271,20 @@ class TasksHistoryView(QWidget):
             self.delete_selected_tasks()
 
 
-class KnifeOperationsHistoryView(QWidget):
+class KnifeOperationsHistoryView(_HistoryView):
     def __init__(self, db, event_bus, parent=None):
         super().__init__(parent)
         self.db = db
         self.event_bus = event_bus
+        self._query = BackgroundQuery(self)
+        self._query.batch_ready.connect(self._apply_batch)
+        self._query.failed.connect(self._on_query_failed)
+        self._refresh_timer = _make_refresh_timer(self, self._do_refresh)
+        self._cached_selection: list | None = None
         self._setup_ui()
         self._load_parts()
         self._connect_events()
-        self.refresh_data()
+        self._do_refresh()
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -957,45 +1294,19 @@ class KnifeOperationsHistoryView(QWidget):
         filters_layout.setContentsMargins(0, 0, 0, 0)
         filters_layout.setSpacing(16)
 
+        today = QDate.currentDate()
         self.start_date_edit = QDateEdit()
         self.start_date_edit.setCalendarPopup(True)
-        self.start_date_edit.setDate(last_year_start_date())
+        self.start_date_edit.setDate(last_year_start_date(today))
 
         self.end_date_edit = QDateEdit()
         self.end_date_edit.setCalendarPopup(True)
-        self.end_date_edit.setDate(QDate.currentDate())
+        self.end_date_edit.setDate(today)
 
         self.part_combo = QComboBox()
 
-        def block(title: str, widget: QWidget) -> QWidget:
-            container = QWidget()
-            container_layout = QVBoxLayout(container)
-            container_layout.setContentsMargins(0, 0, 0, 0)
-            container_layout.setSpacing(4)
-            label = QLabel(title)
-            label.setStyleSheet("font-weight: 500;")
-            container_layout.addWidget(label)
-            container_layout.addWidget(widget)
-            return container
-
-        period_container = QWidget()
-        period_layout = QVBoxLayout(period_container)
-        period_layout.setContentsMargins(0, 0, 0, 0)
-        period_layout.setSpacing(4)
-        period_label = QLabel("Период")
-        period_label.setStyleSheet("font-weight: 500;")
-        period_inputs = QHBoxLayout()
-        period_inputs.setContentsMargins(0, 0, 0, 0)
-        period_inputs.setSpacing(6)
-        period_inputs.addWidget(QLabel("с:"))
-        period_inputs.addWidget(self.start_date_edit)
-        period_inputs.addWidget(QLabel("по:"))
-        period_inputs.addWidget(self.end_date_edit)
-        period_layout.addWidget(period_label)
-        period_layout.addLayout(period_inputs)
-
-        filters_layout.addWidget(period_container)
-        filters_layout.addWidget(block("Комплект", self.part_combo))
+        filters_layout.addWidget(_make_period_block(self.start_date_edit, self.end_date_edit))
+        filters_layout.addWidget(_make_labeled_block("Комплект", self.part_combo))
         filters_layout.addStretch()
 
         self.delete_button = QPushButton("Удалить выбранные")
@@ -1003,7 +1314,7 @@ class KnifeOperationsHistoryView(QWidget):
         filters_layout.addWidget(self.delete_button)
 
         self.model = KnifeOperationsHistoryModel(self)
-        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model = _HistorySortProxyModel(self)
         self.proxy_model.setSourceModel(self.model)
 
         self.table = QTableView(self)
@@ -1015,41 +1326,60 @@ class KnifeOperationsHistoryView(QWidget):
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self._show_context_menu)
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(False)
         apply_table_compact_style(self.table)
 
         layout.addWidget(filters_container)
         layout.addWidget(self.table)
-        self.table.selectionModel().selectionChanged.connect(self._update_delete_button_state)
+        self.table.selectionModel().selectionChanged.connect(
+            self._invalidate_selection_cache, Qt.UniqueConnection
+        )
+        self.proxy_model.modelReset.connect(self._invalidate_selection_cache)
+        self.proxy_model.rowsRemoved.connect(self._invalidate_selection_cache)
+        self.table.selectionModel().selectionChanged.connect(
+            self._update_delete_button_state, Qt.UniqueConnection
+        )
+        # Сброс модели снимает выделение без selectionChanged.
+        self.proxy_model.modelReset.connect(self._update_delete_button_state)
         self._update_delete_button_state()
 
     def _load_parts(self):
-        self.part_combo.blockSignals(True)
-        self.part_combo.clear()
-        self.part_combo.addItem("Все", 0)
+        parts: list[tuple] = []
         for part in self.db.get_all_sharpening_items():
             display = part.get('name') or f"ID {part.get('id')}"
             sku = part.get('sku')
             if sku:
                 display = f"{display} ({sku})"
-            self.part_combo.addItem(display, part.get('id'))
-        self.part_combo.blockSignals(False)
+            parts.append((part.get('id'), display))
+        if _sync_combo_items(self.part_combo, "Все", parts):
+            self.refresh_data()
 
     def _connect_events(self):
         self.start_date_edit.dateChanged.connect(self.refresh_data)
         self.end_date_edit.dateChanged.connect(self.refresh_data)
         self.part_combo.currentIndexChanged.connect(self.refresh_data)
-        self.event_bus.subscribe("knives.changed", self.refresh_data)
-        self.event_bus.subscribe("parts.changed", self._load_parts)
+        self.event_bus.subscribe("knives.changed", self._on_changed_event, mode='queued')
+        self.event_bus.subscribe("parts.changed", self._load_parts, mode='queued')
+
+    def refresh_data(self, *args):
+        self._refresh_timer.start()
 
-    def refresh_data(self):
+    def _do_refresh(self):
         start_date = qdate_to_db_string(self.start_date_edit.date())
         end_date = qdate_to_db_string(self.end_date_edit.date())
         part_id = self.part_combo.currentData()
-        rows = self.db.get_knife_operations_history(start_date, end_date, part_id)
+        self._query.run_batches(self.db.iter_knife_operations_history, start_date, end_date, part_id)
+
+    def _apply_batch(self, rows, first: bool):
+        if not first:
+            self.model.append_rows(rows)
+            _fit_columns_once(self.table)
+            return
+        selected_keys = {self._entry_key(entry) for entry in self._selected_entries()}
         self.model.load_data(rows)
-        self._update_delete_button_state()
+        _restore_selection(self.table, selected_keys, self._key_for_index)
+        _fit_columns_once(self.table)
 
     def _selected_source_indexes(self):
         selection_model = self.table.selectionModel()
@@ -1057,7 +1387,23 @@ class KnifeOperationsHistoryView(QWidget):
             return []
         return [self.proxy_model.mapToSource(index) for index in selection_model.selectedRows()]
 
+    @staticmethod
+    def _entry_key(entry: dict) -> tuple:
+        return entry.get('entry_type'), entry.get('entry_id')
+
+    def _key_for_index(self, index: QModelIndex):
+        entry = self.model.get_entry(self.proxy_model.mapToSource(index).row())
+        return self._entry_key(entry) if entry else None
+
+    def _invalidate_selection_cache(self, *args):
+        self._cached_selection = None
+
     def _selected_entries(self):
+        if self._cached_selection is None:
+            self._cached_selection = self._compute_selected_entries()
+        return self._cached_selection
+
+    def _compute_selected_entries(self):
         entries: list[dict] = []
         for source_index in self._selected_source_indexes():
             entry = self.model.get_entry(source_index.row())
@@ -1066,7 +1412,8 @@ class KnifeOperationsHistoryView(QWidget):
         return entries
 
     def _update_delete_button_state(self):
-        self.delete_button.setEnabled(bool(self._selected_entries()))
+        selection_model = self.table.selectionModel()
+        self.delete_button.setEnabled(bool(selection_model and selection_model.hasSelection()))
 
     def delete_selected_entries(self):
         entries = self._selected_entries()
@@ -1098,32 +1445,30 @@ class KnifeOperationsHistoryView(QWidget):
         if reply != QMessageBox.Yes:
             return
 
-        success_count = 0
-        errors: list[str] = []
+        status_ids: list[int] = []
+        sharpen_ids: list[int] = []
         for entry in entries:
-            entry_type = entry.get('entry_type')
             entry_id = entry.get('entry_id')
             if not entry_id:
                 continue
-
-            if entry_type == 'status':
-                success, message = self.db.delete_knife_status_entry(entry_id)
+            if entry.get('entry_type') == 'status':
+                status_ids.append(entry_id)
             else:
-                success, message = self.db.delete_knife_sharpen_entry(entry_id)
+                sharpen_ids.append(entry_id)
 
-            if success:
-                success_count += 1
-            else:
-                errors.append(message)
+        deleted_status_ids, deleted_sharpen_ids, errors = self.db.delete_knife_entries(status_ids, sharpen_ids)
+        deleted_keys = {('status', entry_id) for entry_id in deleted_status_ids}
+        deleted_keys.update(('sharpen', entry_id) for entry_id in deleted_sharpen_ids)
+        success_count = len(deleted_keys)
 
         if success_count:
-            self.event_bus.emit("knives.changed")
-            self.refresh_data()
+            self._remove_rows(deleted_keys)
+            self._emit_without_self_refresh("knives.changed")
             info = "Запись удалена." if success_count == 1 else f"Удалено записей: {success_count}."
             QMessageBox.information(self, "Готово", info)
 
         if errors:
-            error_text = "\n".join(dict.fromkeys(errors))
+            error_text = "\n".join(errors)
             QMessageBox.critical(self, "Ошибка", error_text)
 
     def _show_context_menu(self, position):
@@ -1139,6 +1484,14 @@ class KnifeOperationsHistoryView(QWidget):
 
 
 class ReplacementHistoryTab(QWidget):
+    # (атрибут, класс представления, заголовок вкладки) в порядке вкладок.
+    _VIEW_SPECS = (
+        ("replacements_view", ReplacementsHistoryView, "Замены"),
+        ("orders_view", OrdersHistoryView, "Заказы"),
+        ("knives_view", KnifeOperationsHistoryView, "Заточка"),
+        ("tasks_view", TasksHistoryView, "Задачи"),
+    )
+
     def __init__(self, db, event_bus, parent=None):
         super().__init__(parent)
         self.db = db
@@ -1150,14 +1503,30 @@ class ReplacementHistoryTab(QWidget):
         self.tab_widget = QTabWidget(self)
         layout.addWidget(self.tab_widget)
 
-        self.replacements_view = ReplacementsHistoryView(self.db, self.event_bus, self)
-        self.tab_widget.addTab(self.replacements_view, "Замены")
+        # Представления создаются при первом открытии вкладки (и не раньше
+        # первого показа самой истории): каждое из них загружает данные из БД
+        # в конструкторе.
+        for attr_name, _view_class, title in self._VIEW_SPECS:
+            setattr(self, attr_name, None)
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(page, title)
+
+        self.tab_widget.currentChanged.connect(self._ensure_view_built)
 
-        self.orders_view = OrdersHistoryView(self.db, self.event_bus, self)
-        self.tab_widget.addTab(self.orders_view, "Заказы")
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._ensure_view_built(self.tab_widget.currentIndex())
 
-        self.knives_view = KnifeOperationsHistoryView(self.db, self.event_bus, self)
-        self.tab_widget.addTab(self.knives_view, "Заточка")
+    def _ensure_view_built(self, index: int):
+        if not 0 <= index < len(self._VIEW_SPECS):
+            return
+
+        attr_name, view_class, _title = self._VIEW_SPECS[index]
+        if getattr(self, attr_name) is not None:
+            return
 
-        self.tasks_view = TasksHistoryView(self.db, self.event_bus, self)
-        self.tab_widget.addTab(self.tasks_view, "Задачи")
+        view = view_class(self.db, self.event_bus, self)
+        setattr(self, attr_name, view)
+        self.tab_widget.widget(index).layout().addWidget(view)
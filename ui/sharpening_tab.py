@@ -11,29 +11,88 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QSizePolicy,
-    QHBoxLayout,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
 )
-from PySide6.QtCore import Qt, QSortFilterProxyModel, QAbstractTableModel, QModelIndex
+from PySide6.QtCore import (
+    Qt, QDate, QSortFilterProxyModel, QAbstractTableModel, QModelIndex, QPersistentModelIndex, QEvent, QRect, QSize,
+)
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
 
-from .utils import db_string_to_ui_string, apply_table_compact_style
+from .utils import db_string_to_ui_string, apply_table_compact_style, contiguous_row_ranges
 from .knife_sharpen_history_dialog import KnifeSharpenHistoryDialog
 
 
-def _sharpening_button_style(base_color: str, hover_color: str, pressed_color: str) -> str:
-    return (
-        "QPushButton {"
-        f"background-color: {base_color};"
-        "color: white;"
-        "border: none;"
-        "border-radius: 4px;"
-        "padding: 2px 8px;"
-        "font-size: 11px;"
-        "min-height: 0;"
-        "min-width: 0;"
-        "}"
-        f"QPushButton:hover {{background-color: {hover_color};}}"
-        f"QPushButton:pressed {{background-color: {pressed_color};}}"
+class _PillColors:
+    def __init__(self, base: str, hover: str):
+        self.base = QColor(base)
+        self.hover = QColor(hover)
+
+
+_GREEN_PILL = _PillColors("#2e7d32", "#1b5e20")
+_RED_PILL = _PillColors("#c62828", "#b71c1c")
+_SHARP_PILLS = {"заточен": ("Заточен", _GREEN_PILL), "затуплен": ("Затуплен", _RED_PILL)}
+_INSTALLATION_PILLS = {"установлен": ("Установлен", _GREEN_PILL), "снят": ("Снят", _RED_PILL)}
+
+_DISPLAY_ROLE = int(Qt.DisplayRole)
+_USER_ROLE = int(Qt.UserRole)
+_PAYLOAD_ROLE = int(Qt.UserRole) + 1
+_TOOLTIP_ROLE = int(Qt.ToolTipRole)
+_SORT_ROLE = int(Qt.UserRole) + 2
+# Qt запрашивает у data() десяток ролей на каждую ячейку; остальные отсекаются сразу.
+_HANDLED_ROLES = frozenset((_DISPLAY_ROLE, _USER_ROLE, _PAYLOAD_ROLE, _TOOLTIP_ROLE, _SORT_ROLE))
+_HORIZONTAL = Qt.Horizontal
+
+_SHARP_STATE_LABELS = {"заточен": "Заточен"}
+_INSTALLATION_STATE_LABELS = {"установлен": "Установлен"}
+
+
+def _format_states(row_data: dict) -> str:
+    sharp_state = row_data.get("sharp_state")
+    install_state = row_data.get("installation_state")
+    states: list[str] = []
+    if sharp_state:
+        states.append(_SHARP_STATE_LABELS.get(sharp_state, "Затуплен"))
+    if install_state:
+        states.append(_INSTALLATION_STATE_LABELS.get(install_state, "Снят"))
+    return ", ".join(states)
+
+
+def _date_sort_key(db_str: Optional[str]) -> int:
+    date = QDate.fromString(db_str or "", "yyyy-MM-dd")
+    return date.toJulianDay() if date.isValid() else -1
+
+
+def _derive_row(row_data: dict) -> tuple[tuple[str, ...], str, tuple]:
+    """Готовит строки для отображения, текст состояний и ключи сортировки.
+
+    Считается один раз при загрузке строки: числовые колонки и дата
+    сортируются по числам, а не по отображаемым строкам.
+    """
+    last_interval = row_data.get("last_interval_days")
+    last_sharpen_date = row_data.get("last_sharpen_date")
+    equipment = row_data.get("equipment_list") or ""
+    states = _format_states(row_data)
+    display = (
+        row_data["name"],
+        row_data["sku"],
+        str(row_data["qty"]),
+        db_string_to_ui_string(last_sharpen_date),
+        str(last_interval) if last_interval is not None else "",
+        equipment,
+        "",
+    )
+    sort_keys = (
+        row_data["name"] or "",
+        row_data["sku"] or "",
+        row_data["qty"] or 0,
+        _date_sort_key(last_sharpen_date),
+        last_interval if last_interval is not None else -1,
+        equipment,
+        states,
     )
+    return display, states, sort_keys
 
 
 class SharpeningTableModel(QAbstractTableModel):
@@ -51,6 +110,7 @@ class SharpeningTableModel(QAbstractTableModel):
             "Состояния",
         ]
         self._data: list[dict] = []
+        self._derived: list[tuple[tuple[str, ...], str, tuple]] = []
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
         return len(self._data)
@@ -59,147 +119,274 @@ class SharpeningTableModel(QAbstractTableModel):
         return len(self._headers)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
-        if not index.isValid():
+        if role not in _HANDLED_ROLES or not index.isValid():
             return None
 
-        row_data = self._data[index.row()]
+        row = index.row()
         column = index.column()
 
-        states_text = self._format_states(row_data)
-
-        if role == Qt.DisplayRole:
-            if column == 0:
-                return row_data["name"]
-            if column == 1:
-                return row_data["sku"]
-            if column == 2:
-                return str(row_data["qty"])
-            if column == 3:
-                return db_string_to_ui_string(row_data.get("last_sharpen_date"))
-            if column == 4:
-                last_interval = row_data.get("last_interval_days")
-                return str(last_interval) if last_interval is not None else ""
-            if column == 5:
-                equipment = row_data.get("equipment_list")
-                return equipment or ""
-            if column == 6:
-                return ""
-
-        if role == Qt.UserRole:
-            return row_data.get("id")
-
-        if role == Qt.UserRole + 1:
-            return row_data
-
-        if role == Qt.ToolTipRole and column == SharpeningTableModel.ACTION_COLUMN:
-            return states_text or None
+        if role == _DISPLAY_ROLE:
+            return self._derived[row][0][column]
 
-        return None
+        if role == _SORT_ROLE:
+            return self._derived[row][2][column]
 
-    @staticmethod
-    def _format_states(row_data: dict) -> str:
-        sharp_state = row_data.get("sharp_state")
-        install_state = row_data.get("installation_state")
-        states: list[str] = []
-        if sharp_state:
-            states.append("Заточен" if sharp_state == "заточен" else "Затуплен")
-        if install_state:
-            states.append("Установлен" if install_state == "установлен" else "Снят")
-        return ", ".join(states)
+        if role == _USER_ROLE:
+            return self._data[row].get("id")
+
+        if role == _PAYLOAD_ROLE:
+            return self._data[row]
+
+        if role == _TOOLTIP_ROLE and column == SharpeningTableModel.ACTION_COLUMN:
+            return self._derived[row][1] or None
+
+        return None
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+        if role == _DISPLAY_ROLE and orientation == _HORIZONTAL:
             return self._headers[section]
         return None
 
     def load_data(self, rows: list[dict]):
-        self.beginResetModel()
-        self._data = rows
-        self.endResetModel()
+        """Применяет новый список строк, сообщая представлению только о различиях.
+
+        Полный сброс выполняется лишь при первой загрузке: при обновлении
+        выделение и состояние прокси сохраняются.
+        """
+        ids = [row.get("id") for row in rows]
+        if not self._data or len(set(ids)) != len(ids):
+            self.beginResetModel()
+            self._data = rows
+            self._derived = [_derive_row(row) for row in rows]
+            self.endResetModel()
+            return
+
+        new_by_id = dict(zip(ids, rows))
+        self._remove_rows(
+            [row for row, row_data in enumerate(self._data) if row_data.get("id") not in new_by_id]
+        )
+
+        last_column = self.columnCount() - 1
+        for row, row_data in enumerate(self._data):
+            new_data = new_by_id[row_data.get("id")]
+            if new_data != row_data:
+                self._data[row] = new_data
+                self._derived[row] = _derive_row(new_data)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+        present = {row_data.get("id") for row_data in self._data}
+        added = [row for row in rows if row.get("id") not in present]
+        if added:
+            first = len(self._data)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._data.extend(added)
+            self._derived.extend(_derive_row(row) for row in added)
+            self.endInsertRows()
+
+        self._reorder(ids)
+
+    def _remove_rows(self, source_rows: list[int]):
+        for first, last in contiguous_row_ranges(source_rows):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._data[first:last + 1]
+            del self._derived[first:last + 1]
+            self.endRemoveRows()
+
+    def _reorder(self, ids: list):
+        """Приводит порядок строк к порядку ``ids``, сохраняя постоянные индексы."""
+        current = {row_data.get("id"): row for row, row_data in enumerate(self._data)}
+        permutation = [current[row_id] for row_id in ids]
+        if permutation == list(range(len(permutation))):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        self._data = [self._data[row] for row in permutation]
+        self._derived = [self._derived[row] for row in permutation]
+
+        persistent = self.persistentIndexList()
+        if persistent:
+            positions = [0] * len(permutation)
+            for new_row, old_row in enumerate(permutation):
+                positions[old_row] = new_row
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(positions[index.row()], index.column()) for index in persistent],
+            )
+        self.layoutChanged.emit()
 
     def row_payload(self, row: int) -> Optional[dict]:
         if 0 <= row < len(self._data):
             return self._data[row]
         return None
 
+    def update_states(self, row: int, states: dict):
+        """Обновляет состояния комплекта в строке без перезагрузки модели."""
+        payload = self.row_payload(row)
+        if payload is None:
+            return
+        payload.update(states)
+        self._derived[row] = _derive_row(payload)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
 
-class SharpeningActionsWidget(QWidget):
-    GREEN_STYLE = _sharpening_button_style("#2e7d32", "#1b5e20", "#134d16")
-    RED_STYLE = _sharpening_button_style("#c62828", "#b71c1c", "#8e0000")
 
-    def __init__(self, db, event_bus, part_id: int, sharp_state: str, installation_state: str, parent: Optional[QWidget] = None):
+class SharpeningActionsDelegate(QStyledItemDelegate):
+    """Рисует в колонке состояний две кнопки-«пилюли» и переключает состояния по клику."""
+
+    PILL_HEIGHT = 24
+    PILL_PADDING = 8
+    PILL_SPACING = 6
+    FONT_PIXEL_SIZE = 11
+
+    def __init__(self, db, event_bus, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.db = db
         self.event_bus = event_bus
-        self.part_id = part_id
-        self.sharp_state = sharp_state or "затуплен"
-        self.installation_state = installation_state or "снят"
-
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 2, 0, 2)
-        layout.setSpacing(6)
-
-        self.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
-        self.setMinimumWidth(160)
-
-        self.sharp_button = QPushButton(self)
-        self.install_button = QPushButton(self)
-        for button in (self.sharp_button, self.install_button):
-            button.setCursor(Qt.PointingHandCursor)
-            button.setSizePolicy(QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
-            button.setMinimumWidth(0)
-            button.setFixedHeight(24)
-            layout.addWidget(button)
-
-        self.sharp_button.clicked.connect(self.toggle_sharp_state)
-        self.install_button.clicked.connect(self.toggle_installation_state)
-
-        self._apply_states()
-
-    def _apply_states(self):
-        if self.sharp_state == "заточен":
-            self._apply_button_style(self.sharp_button, "Заточен", self.GREEN_STYLE)
-        else:
-            self._apply_button_style(self.sharp_button, "Затуплен", self.RED_STYLE)
-
-        if self.installation_state == "установлен":
-            self._apply_button_style(self.install_button, "Установлен", self.GREEN_STYLE)
-        else:
-            self._apply_button_style(self.install_button, "Снят", self.RED_STYLE)
+        self._base_font: Optional[QFont] = None
+        self._pill_font = QFont()
+        self._pill_widths: dict[str, int] = {}
+        self._size_hint: Optional[QSize] = None
+        # Подсвеченная пилюля (0 — заточка, 1 — установка) и её ячейка; меняется
+        # по MouseMove из editorEvent, поэтому представлению нужен mouseTracking.
+        self._hover_index = QPersistentModelIndex()
+        self._hover_pill = -1
 
     @staticmethod
-    def _apply_button_style(button: QPushButton, text: str, style: str):
-        button.setText(text)
-        button.setStyleSheet(style)
-
-    def toggle_sharp_state(self):
-        success, message, payload = self.db.toggle_sharp_state(self.part_id)
-        if not success:
-            QMessageBox.critical(self, "Ошибка", message)
+    def _pills(payload: dict) -> tuple[tuple[str, _PillColors], tuple[str, _PillColors]]:
+        return (
+            _SHARP_PILLS.get(payload.get("sharp_state"), _SHARP_PILLS["затуплен"]),
+            _INSTALLATION_PILLS.get(payload.get("installation_state"), _INSTALLATION_PILLS["снят"]),
+        )
+
+    def _font(self, option: QStyleOptionViewItem) -> QFont:
+        if self._base_font is None or option.font != self._base_font:
+            self._base_font = QFont(option.font)
+            self._pill_font = QFont(option.font)
+            self._pill_font.setPixelSize(self.FONT_PIXEL_SIZE)
+            self._pill_widths.clear()
+            self._size_hint = None
+        return self._pill_font
+
+    def _pill_width(self, option: QStyleOptionViewItem, text: str) -> int:
+        font = self._font(option)
+        width = self._pill_widths.get(text)
+        if width is None:
+            width = QFontMetrics(font).horizontalAdvance(text) + 2 * self.PILL_PADDING
+            self._pill_widths[text] = width
+        return width
+
+    def _pill_rects(self, option: QStyleOptionViewItem, texts: tuple[str, str]) -> tuple[QRect, QRect]:
+        rect = option.rect
+        height = min(self.PILL_HEIGHT, rect.height() - 4)
+        top = rect.top() + (rect.height() - height) // 2
+        left = rect.left() + self.PILL_SPACING // 2
+        rects = []
+        for text in texts:
+            width = self._pill_width(option, text)
+            rects.append(QRect(left, top, width, height))
+            left += width + self.PILL_SPACING
+        return rects[0], rects[1]
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        super().paint(painter, option, index)
+        payload = index.data(_PAYLOAD_ROLE)
+        if not payload:
             return
-        self.sharp_state = payload.get("sharp_state", self.sharp_state)
-        self.installation_state = payload.get("installation_state", self.installation_state)
-        self._apply_states()
-        self.event_bus.emit("knives.changed")
 
-    def toggle_installation_state(self):
-        success, message, payload = self.db.toggle_installation_state(self.part_id)
-        if not success:
-            QMessageBox.critical(self, "Ошибка", message)
+        pills = self._pills(payload)
+        rects = self._pill_rects(option, (pills[0][0], pills[1][0]))
+        hover_pill = -1
+        if option.state & QStyle.State_MouseOver and self._hover_index == index:
+            hover_pill = self._hover_pill
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self._font(option))
+        for pill, ((text, colors), rect) in enumerate(zip(pills, rects)):
+            hovered = pill == hover_pill
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(colors.hover if hovered else colors.base)
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(Qt.white)
+            painter.drawText(rect, Qt.AlignCenter, text)
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        # Размер не зависит от строки: колонка не «прыгает» при переключении
+        # состояний, а подбор ширины не читает данные каждой строки.
+        self._font(option)
+        if self._size_hint is None:
+            width = sum(
+                max(self._pill_width(option, text) for text in labels)
+                for labels in (("Заточен", "Затуплен"), ("Установлен", "Снят"))
+            )
+            self._size_hint = QSize(max(160, width + 2 * self.PILL_SPACING), self.PILL_HEIGHT + 4)
+        return self._size_hint
+
+    def _pill_at(self, option: QStyleOptionViewItem, payload, pos) -> int:
+        if not payload:
+            return -1
+        pills = self._pills(payload)
+        for pill, rect in enumerate(self._pill_rects(option, (pills[0][0], pills[1][0]))):
+            if rect.contains(pos):
+                return pill
+        return -1
+
+    def set_hover(self, view: Optional[QAbstractItemView], index: QModelIndex, pill: int = -1):
+        """Запоминает пилюлю под курсором, перерисовывает ячейки и меняет курсор."""
+        if pill < 0:
+            index = QModelIndex()
+        if pill == self._hover_pill and self._hover_index == index:
+            return
+        previous = QModelIndex(self._hover_index)
+        self._hover_index = QPersistentModelIndex(index)
+        self._hover_pill = pill
+        if view is None:
             return
-        self.installation_state = payload.get("installation_state", self.installation_state)
-        self.sharp_state = payload.get("sharp_state", self.sharp_state)
-        self._apply_states()
+        if pill >= 0:
+            view.viewport().setCursor(Qt.PointingHandCursor)
+        else:
+            view.viewport().unsetCursor()
+        for changed in (previous, index):
+            if changed.isValid():
+                view.update(changed)
+
+    def editorEvent(self, event: QEvent, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        event_type = event.type()
+        if event_type == QEvent.MouseMove:
+            pill = self._pill_at(option, index.data(_PAYLOAD_ROLE), event.position().toPoint())
+            self.set_hover(option.widget, index, pill)
+            return False
+        if event_type != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return super().editorEvent(event, model, option, index)
+
+        payload = index.data(_PAYLOAD_ROLE)
+        pill = self._pill_at(option, payload, event.position().toPoint())
+        if pill < 0:
+            return False
+        toggle = self.db.toggle_sharp_state if pill == 0 else self.db.toggle_installation_state
+
+        success, message, states = toggle(payload.get("id"))
+        if not success:
+            QMessageBox.critical(option.widget, "Ошибка", message)
+            return True
+
+        source_index = model.mapToSource(index) if isinstance(model, QSortFilterProxyModel) else index
+        source_model = source_index.model()
+        if isinstance(source_model, SharpeningTableModel):
+            source_model.update_states(source_index.row(), states)
         self.event_bus.emit("knives.changed")
+        return True
 
 
 class SharpeningTab(QWidget):
+    ACTION_COLUMN_WIDTH = 180
+
     def __init__(self, db, event_bus, main_window):
         super().__init__()
         self.db = db
         self.event_bus = event_bus
         self.main_window = main_window
-        self._action_widgets: list[SharpeningActionsWidget] = []
+        self._columns_fitted = False
 
         self.init_ui()
         self.event_bus.subscribe("knives.changed", self.refresh_data)
@@ -235,6 +422,7 @@ class SharpeningTab(QWidget):
         self.table_model = SharpeningTableModel()
         self.proxy_model = QSortFilterProxyModel()
         self.proxy_model.setSourceModel(self.table_model)
+        self.proxy_model.setSortRole(_SORT_ROLE)
 
         self.table_view = QTableView()
         self.table_view.setModel(self.proxy_model)
@@ -243,55 +431,45 @@ class SharpeningTab(QWidget):
         self.table_view.setSortingEnabled(True)
 
         header = self.table_view.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(False)
-        header.setSectionResizeMode(SharpeningTableModel.ACTION_COLUMN, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(SharpeningTableModel.ACTION_COLUMN, QHeaderView.Fixed)
+        header.resizeSection(SharpeningTableModel.ACTION_COLUMN, self.ACTION_COLUMN_WIDTH)
+
+        self.actions_delegate = SharpeningActionsDelegate(self.db, self.event_bus, self.table_view)
+        self.table_view.setItemDelegateForColumn(SharpeningTableModel.ACTION_COLUMN, self.actions_delegate)
+        # Подсветка пилюль и курсор-«рука» обновляются по движению мыши без нажатия.
+        self.table_view.setMouseTracking(True)
+        self.table_view.entered.connect(self._on_table_entered)
+        self.table_view.viewportEntered.connect(self._clear_pill_hover)
 
         apply_table_compact_style(self.table_view)
 
-        self.proxy_model.layoutChanged.connect(self._populate_action_widgets)
-        self.proxy_model.modelReset.connect(self._populate_action_widgets)
+    def _on_table_entered(self, index: QModelIndex):
+        if index.column() != SharpeningTableModel.ACTION_COLUMN:
+            self._clear_pill_hover()
+
+    def _clear_pill_hover(self):
+        self.actions_delegate.set_hover(self.table_view, QModelIndex())
 
     def refresh_data(self):
         logging.info("Обновление данных на вкладке 'Заточка'")
         data = self.db.get_all_sharpening_items()
-        self.table_model.load_data(data)
-        self._populate_action_widgets()
-        self.table_view.resizeColumnToContents(SharpeningTableModel.ACTION_COLUMN)
-
-    def _clear_action_widgets(self):
-        for widget in self._action_widgets:
-            widget.deleteLater()
-        self._action_widgets.clear()
-
-    def _populate_action_widgets(self):
-        if not hasattr(self, "table_view"):
-            return
-
-        self._clear_action_widgets()
-
-        source_model = self.table_model
-        proxy_model = self.proxy_model
-
-        for row in range(source_model.rowCount()):
-            payload = source_model.row_payload(row)
-            if not payload:
-                continue
-            source_index = source_model.index(row, SharpeningTableModel.ACTION_COLUMN)
-            proxy_index = proxy_model.mapFromSource(source_index)
-            if not proxy_index.isValid():
-                continue
-
-            widget = SharpeningActionsWidget(
-                self.db,
-                self.event_bus,
-                payload.get("id"),
-                payload.get("sharp_state", ""),
-                payload.get("installation_state", ""),
-                self.table_view,
-            )
-            self.table_view.setIndexWidget(proxy_index, widget)
-            self._action_widgets.append(widget)
+        # Удаления, изменения и перестановка строк перерисовываются одним проходом,
+        # а прокси пересортировывает их один раз при включении динамической сортировки.
+        self.table_view.setUpdatesEnabled(False)
+        self.proxy_model.setDynamicSortFilter(False)
+        try:
+            self.table_model.load_data(data)
+            if data and not self._columns_fitted:
+                # Ширина колонок подбирается по содержимому один раз, дальше её
+                # задаёт пользователь: пересчёт на каждое обновление обходит все строки.
+                self._columns_fitted = True
+                for column in range(SharpeningTableModel.ACTION_COLUMN):
+                    self.table_view.resizeColumnToContents(column)
+        finally:
+            self.proxy_model.setDynamicSortFilter(True)
+            self.table_view.setUpdatesEnabled(True)
 
     def show_sharpen_history(self):
         dialog = KnifeSharpenHistoryDialog(self.db, self.event_bus, self)
@@ -1,3 +1,5 @@
+from itertools import chain
+
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -11,18 +13,162 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QWidget,
     QLabel,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QSpinBox,
     QHBoxLayout,
     QAbstractItemView,
+    QStyledItemDelegate,
+    QHeaderView,
 )
-from PySide6.QtCore import QDate, Qt
-from PySide6.QtWidgets import QHeaderView
+from PySide6.QtCore import QAbstractTableModel, QDate, QModelIndex, Qt
 
 from .utils import db_string_to_qdate, qdate_to_db_string
 
 
+# Запчасти всего списка оборудования берутся одним запросом, пока список невелик.
+_PARTS_PREFETCH_LIMIT = 100
+
+
+def _fill_combo(combo: QComboBox, placeholder: str, items: list[tuple[str, object]]):
+    """Заполняет комбобокс одной вставкой строк, без сигналов на каждый элемент."""
+    was_blocked = combo.blockSignals(True)
+    try:
+        combo.addItems([placeholder] + [text for text, _data in items])
+        for row, (_text, data) in enumerate(items, start=1):
+            combo.setItemData(row, data)
+    finally:
+        combo.blockSignals(was_blocked)
+
+
+class ReplacementPartsModel(QAbstractTableModel):
+    """Запчасти оборудования с отметкой «заменить» и количеством к списанию."""
+
+    CHECK_COLUMN = 0
+    QTY_COLUMN = 4
+    HEADERS = ["Выбрать", "Запчасть", "Артикул", "Установлено", "Списать, шт."]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._parts: list[dict] = []
+        self._checked: list[bool] = []
+        self._qty: list[int] = []
+        self._max_qty: list[int] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._parts)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == self.CHECK_COLUMN:
+            flags |= Qt.ItemIsUserCheckable
+        elif index.column() == self.QTY_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            part = self._parts[row]
+            if column == 1:
+                return part['part_name']
+            if column == 2:
+                return part.get('part_sku') or ""
+            if column == 3:
+                return str(part.get('installed_qty') or 1)
+            if column == self.QTY_COLUMN:
+                return str(self._qty[row])
+        elif role == Qt.EditRole and column == self.QTY_COLUMN:
+            return self._qty[row]
+        elif role == Qt.CheckStateRole and column == self.CHECK_COLUMN:
+            return Qt.Checked if self._checked[row] else Qt.Unchecked
+        elif role == Qt.TextAlignmentRole and column in (3, self.QTY_COLUMN):
+            return Qt.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.CheckStateRole and column == self.CHECK_COLUMN:
+            self._checked[row] = Qt.CheckState(value) == Qt.Checked
+        elif role == Qt.EditRole and column == self.QTY_COLUMN:
+            self._qty[row] = min(max(1, int(value)), self._max_qty[row])
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def max_qty(self, row: int) -> int:
+        return self._max_qty[row]
+
+    def set_parts(self, parts: list[dict], initial_map: dict[int, int]):
+        """Загружает запчасти, отмечая и заполняя количество из ``initial_map``."""
+        checked: list[bool] = []
+        quantities: list[int] = []
+        max_quantities: list[int] = []
+        add_checked = checked.append
+        add_qty = quantities.append
+        add_max_qty = max_quantities.append
+        initial_qty_for = initial_map.get
+        for part in parts:
+            equipment_part_id = part['equipment_part_id']
+            installed_qty = part.get('installed_qty') or 1
+            initial_qty = initial_qty_for(equipment_part_id, installed_qty)
+            add_checked(equipment_part_id in initial_map)
+            add_qty(initial_qty)
+            add_max_qty(installed_qty if installed_qty > initial_qty else initial_qty)
+
+        self.beginResetModel()
+        self._parts = parts
+        self._checked = checked
+        self._qty = quantities
+        self._max_qty = max_quantities
+        self.endResetModel()
+
+    def clear(self):
+        self.set_parts([], {})
+
+    def checked_parts(self) -> list[dict]:
+        return [
+            {
+                'equipment_part_id': part['equipment_part_id'],
+                'part_id': part['part_id'],
+                'qty': qty,
+            }
+            for part, checked, qty in zip(self._parts, self._checked, self._qty)
+            if checked
+        ]
+
+
+class _QtySpinBoxDelegate(QStyledItemDelegate):
+    """Редактирует количество к списанию спинбоксом в пределах установленного."""
+
+    def createEditor(self, parent, option, index):
+        editor = QSpinBox(parent)
+        editor.setRange(1, index.model().max_qty(index.row()))
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setValue(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), Qt.EditRole)
+
 class TaskDialog(QDialog):
     def __init__(self, db, event_bus, task_id=None, parent=None, preselected_parts=None):
         super().__init__(parent)
@@ -32,6 +178,9 @@ class TaskDialog(QDialog):
         self.preselected_parts = preselected_parts or []
         self._loaded_task_parts = []
         self._suspend_equipment_signal = False
+        self._parts_cache: dict[int, list[dict]] = {}
+        self._parts_prefetched = False
+        self._last_populated_equipment_id = None
 
         self.setWindowTitle("Редактирование задачи" if self.task_id else "Новая задача")
 
@@ -80,16 +229,15 @@ class TaskDialog(QDialog):
         hint_layout.addStretch()
         replacement_layout.addLayout(hint_layout)
 
-        self.replacement_table = QTableWidget(0, 5)
-        self.replacement_table.setHorizontalHeaderLabels([
-            "Выбрать",
-            "Запчасть",
-            "Артикул",
-            "Установлено",
-            "Списать, шт.",
-        ])
+        self.replacement_model = ReplacementPartsModel(self)
+        self.replacement_table = QTableView()
+        self.replacement_table.setModel(self.replacement_model)
+        self.replacement_table.setItemDelegateForColumn(
+            ReplacementPartsModel.QTY_COLUMN,
+            _QtySpinBoxDelegate(self.replacement_table),
+        )
         self.replacement_table.verticalHeader().setVisible(False)
-        self.replacement_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.replacement_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
         header = self.replacement_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(1, QHeaderView.Stretch)
@@ -120,13 +268,19 @@ class TaskDialog(QDialog):
                 self.replacement_checkbox.setChecked(True)
 
     def load_combos_data(self):
-        self.assignee_combo.addItem("Не назначен", None)
-        for colleague in self.db.get_all_colleagues():
-            self.assignee_combo.addItem(colleague['name'], colleague['id'])
-
-        self.equipment_combo.addItem("Не выбрано", None)
-        for equipment in self.db.get_all_equipment():
-            self.equipment_combo.addItem(f"{equipment['name']} ({equipment['sku'] or 'б/а'})", equipment['id'])
+        _fill_combo(
+            self.assignee_combo,
+            "Не назначен",
+            [(colleague['name'], colleague['id']) for colleague in self.db.get_all_colleagues()],
+        )
+        _fill_combo(
+            self.equipment_combo,
+            "Не выбрано",
+            [
+                (f"{equipment['name']} ({equipment['sku'] or 'б/а'})", equipment['id'])
+                for equipment in self.db.get_all_equipment()
+            ],
+        )
 
     def load_task_data(self):
         task = self.db.get_task_by_id(self.task_id)
@@ -169,107 +323,77 @@ class TaskDialog(QDialog):
         if not self.replacement_checkbox.isChecked():
             return
         equipment_id = self.equipment_combo.currentData()
+        if equipment_id == self._last_populated_equipment_id:
+            return
         self.populate_replacement_table(equipment_id)
 
     def on_replacement_toggled(self, checked):
         self.replacement_container.setVisible(checked)
         if checked:
+            self._prefetch_parts()
             equipment_id = self.equipment_combo.currentData()
             if not equipment_id:
                 self.replacement_hint_label.setText("Выберите оборудование, чтобы добавить запчасти на замену.")
-                self.replacement_table.setRowCount(0)
+                self._clear_replacement_table()
             else:
                 self.replacement_hint_label.setText("Отметьте запчасти, которые требуется заменить.")
                 self.populate_replacement_table(equipment_id)
         else:
-            self.replacement_table.setRowCount(0)
+            self._clear_replacement_table()
 
     def _initial_replacement_parts_map(self):
-        initial = {}
-        for part in self.preselected_parts:
-            equipment_part_id = part.get('equipment_part_id')
-            if not equipment_part_id:
-                continue
-            qty = part.get('qty') or part.get('installed_qty') or 1
-            initial[equipment_part_id] = max(1, int(qty))
-
-        for part in self._loaded_task_parts:
-            equipment_part_id = part.get('equipment_part_id')
-            if not equipment_part_id:
-                continue
-            qty = part.get('qty') or 1
-            initial[equipment_part_id] = max(1, int(qty))
-
-        return initial
+        preselected = (
+            (part.get('equipment_part_id'), part.get('qty') or part.get('installed_qty') or 1)
+            for part in self.preselected_parts
+        )
+        loaded = (
+            (part.get('equipment_part_id'), part.get('qty') or 1)
+            for part in self._loaded_task_parts
+        )
+        # Части из сохранённой задачи идут последними и перекрывают предвыбранные.
+        return {
+            equipment_part_id: max(1, int(qty))
+            for equipment_part_id, qty in chain(preselected, loaded)
+            if equipment_part_id
+        }
+
+    def _clear_replacement_table(self):
+        self.replacement_model.clear()
+        self._last_populated_equipment_id = None
+
+    def _prefetch_parts(self):
+        if self._parts_prefetched:
+            return
+        self._parts_prefetched = True
+        equipment_ids = [self.equipment_combo.itemData(row) for row in range(1, self.equipment_combo.count())]
+        if not equipment_ids or len(equipment_ids) > _PARTS_PREFETCH_LIMIT:
+            return
+        parts_by_equipment = self.db.get_parts_for_equipment_batch(equipment_ids)
+        for equipment_id in equipment_ids:
+            self._parts_cache[equipment_id] = parts_by_equipment.get(equipment_id, [])
+
+    def _parts_for_equipment(self, equipment_id):
+        parts = self._parts_cache.get(equipment_id)
+        if parts is None:
+            parts = self._parts_cache[equipment_id] = self.db.get_parts_for_equipment(equipment_id)
+        return parts
 
     def populate_replacement_table(self, equipment_id):
-        self.replacement_table.setRowCount(0)
         if not equipment_id:
+            self._clear_replacement_table()
             return
 
-        parts = self.db.get_parts_for_equipment(equipment_id)
-        if not parts:
+        parts = self._parts_for_equipment(equipment_id)
+        if parts:
+            self.replacement_hint_label.setText("Отметьте запчасти, которые требуется заменить.")
+        else:
             self.replacement_hint_label.setText("На выбранном оборудовании нет привязанных запчастей.")
-            return
-
-        initial_map = self._initial_replacement_parts_map()
-        self.replacement_hint_label.setText("Отметьте запчасти, которые требуется заменить.")
-
-        for row, part in enumerate(parts):
-            self.replacement_table.insertRow(row)
-
-            checkbox = QCheckBox()
-            self.replacement_table.setCellWidget(row, 0, checkbox)
-
-            part_item = QTableWidgetItem(part['part_name'])
-            part_item.setData(Qt.UserRole, {
-                'equipment_part_id': part['equipment_part_id'],
-                'part_id': part['part_id'],
-            })
-            self.replacement_table.setItem(row, 1, part_item)
-
-            sku_item = QTableWidgetItem(part.get('part_sku') or "")
-            self.replacement_table.setItem(row, 2, sku_item)
-
-            installed_qty = part.get('installed_qty') or 1
-            installed_item = QTableWidgetItem(str(installed_qty))
-            installed_item.setTextAlignment(Qt.AlignCenter)
-            self.replacement_table.setItem(row, 3, installed_item)
-
-            spinbox = QSpinBox()
-            initial_qty = initial_map.get(part['equipment_part_id'], installed_qty)
-            max_qty = max(installed_qty, initial_qty)
-            spinbox.setRange(1, max_qty)
-            spinbox.setValue(initial_qty)
-            self.replacement_table.setCellWidget(row, 4, spinbox)
-
-            if part['equipment_part_id'] in initial_map:
-                checkbox.setChecked(True)
-            else:
-                checkbox.setChecked(False)
+        # Один сброс модели на заполнение: set_parts заменяет и прежние строки.
+        self.replacement_model.set_parts(parts, self._initial_replacement_parts_map())
+        self._last_populated_equipment_id = equipment_id
 
     def collect_replacement_parts(self):
-        parts = []
-        for row in range(self.replacement_table.rowCount()):
-            checkbox = self.replacement_table.cellWidget(row, 0)
-            if not checkbox or not checkbox.isChecked():
-                continue
-
-            part_item = self.replacement_table.item(row, 1)
-            if not part_item:
-                continue
-            part_data = part_item.data(Qt.UserRole) or {}
-
-            spinbox = self.replacement_table.cellWidget(row, 4)
-            qty = spinbox.value() if isinstance(spinbox, QSpinBox) else 0
-
-            parts.append({
-                'equipment_part_id': part_data.get('equipment_part_id'),
-                'part_id': part_data.get('part_id'),
-                'qty': qty,
-            })
-
-        return parts
+        return self.replacement_model.checked_parts()
 
     def accept(self):
         title = self.title_edit.text().strip()
@@ -322,16 +446,17 @@ class TaskDialog(QDialog):
             )
 
         if success:
-            equipment_ids = set(events.get('equipment_ids', []))
-            for equipment_id in equipment_ids:
-                self.event_bus.emit("equipment_parts_changed", equipment_id)
+            with self.event_bus.batch():
+                equipment_ids = set(events.get('equipment_ids', []))
+                for equipment_id in equipment_ids:
+                    self.event_bus.emit("equipment_parts_changed", equipment_id)
 
-            if events.get('parts_changed'):
-                self.event_bus.emit("parts.changed")
-            if events.get('replacements_changed'):
-                self.event_bus.emit("replacements.changed")
+                if events.get('parts_changed'):
+                    self.event_bus.emit("parts.changed")
+                if events.get('replacements_changed'):
+                    self.event_bus.emit("replacements.changed")
 
-            self.event_bus.emit("tasks.changed")
+                self.event_bus.emit("tasks.changed")
             super().accept()
         else:
             QMessageBox.critical(self, "Ошибка", message)
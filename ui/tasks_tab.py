@@ -1,10 +1,11 @@
+import functools
 import logging
+from operator import itemgetter
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QPushButton,
     QCheckBox,
     QHeaderView,
@@ -13,30 +14,499 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QTabWidget,
     QLabel,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QBrush, QAction
-
-from .colleagues_manager_dialog import ColleaguesManagerDialog
-from .task_dialog import TaskDialog
-from .periodic_task_dialog import PeriodicTaskDialog
-from .utils import db_string_to_ui_string
+from PySide6.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    QSize,
+    QSortFilterProxyModel,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QColor, QBrush, QPainter
 
+from .background_query import BackgroundQuery
+from .utils import contiguous_row_ranges, db_string_to_ui_string
+
+# Состояние кнопки в ячейке действия: (доступна, цвета кнопки).
+ACTION_ROLE = Qt.UserRole + 1
+# Всё, что нужно для отрисовки ячейки, одним значением: (текст, кисть фона).
+_PAINT_ROLE = Qt.UserRole + 2
+
+
+class _ButtonColors:
+    def __init__(self, base: str, hover: str):
+        self.base = QColor(base)
+        self.hover = QColor(hover)
+
+
+_RED_BUTTON = _ButtonColors("#c62828", "#b71c1c")
+_GREEN_BUTTON = _ButtonColors("#2e7d32", "#1b5e20")
+
+_PRIORITY_BRUSHES = {
+    'высокий': QBrush(QColor("#ffcdd2")),
+    'средний': QBrush(QColor("#ffecb3")),
+    'низкий': QBrush(QColor("#fff9c4")),
+}
+
+_DISPLAY_ROLE = Qt.DisplayRole
+_USER_ROLE = Qt.UserRole
+_BACKGROUND_ROLE = Qt.BackgroundRole
+_HANDLED_ROLES = frozenset((_DISPLAY_ROLE, _USER_ROLE, _BACKGROUND_ROLE, ACTION_ROLE, _PAINT_ROLE))
+_HAS_DISPLAY = QStyleOptionViewItem.HasDisplay
+
+_COMPLETED_STATUSES = frozenset(('выполнена', 'отменена'))
+
+# Ширина колонки кнопки «Выполнить»: по ней не нужно сканировать строки.
+_ACTION_COLUMN_WIDTH = 110
+
+
+class _TaskCellDelegate(QStyledItemDelegate):
+    """Заполняет параметры отрисовки ячейки одним запросом к модели.
+
+    Стандартный ``initStyleOption`` спрашивает у модели шрифт, выравнивание,
+    цвета, флажок, иконку, текст и фон по отдельности; модели задач отдают
+    текст и фон ячейки сразу через ``_PAINT_ROLE``.
+    """
+
+    def initStyleOption(self, option, index):
+        text, brush = index.data(_PAINT_ROLE)
+        option.index = index
+        option.features |= _HAS_DISPLAY
+        option.text = text
+        if brush is not None:
+            option.backgroundBrush = brush
+
+
+class ActionButtonDelegate(_TaskCellDelegate):
+    """Рисует кнопку «Выполнить» в ячейке и сообщает о нажатии сигналом ``clicked``."""
+
+    clicked = Signal(object)
+
+    TEXT = "Выполнить"
+    MARGIN = 2
+    PADDING = 12
+
+    def _button_rect(self, option):
+        return option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        state = index.data(ACTION_ROLE)
+        if not state:
+            return
+        enabled, colors = state
+        hovered = enabled and bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(colors.hover if hovered else colors.base)
+        painter.drawRoundedRect(self._button_rect(option), 3, 3)
+        painter.setPen(Qt.white)
+        painter.drawText(self._button_rect(option), Qt.AlignCenter, self.TEXT)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        width = option.fontMetrics.horizontalAdvance(self.TEXT) + 2 * (self.PADDING + self.MARGIN)
+        return QSize(width, option.fontMetrics.height() + 4 * self.MARGIN + 4)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return super().editorEvent(event, model, option, index)
+        state = index.data(ACTION_ROLE)
+        if not state or not state[0] or event.button() != Qt.LeftButton:
+            return False
+        if not self._button_rect(option).contains(event.position().toPoint()):
+            return False
+        if event.type() == QEvent.MouseButtonRelease:
+            self.clicked.emit(index.data(Qt.UserRole))
+        # Нажатие на кнопку не должно менять выделение строки.
+        return True
+
+
+class _TasksTableModel(QAbstractTableModel):
+    """Общая часть моделей таблиц задач.
+
+    Данные хранятся по колонкам: ``_columns[column][row]`` — готовые строки
+    (в колонке действия — пустая строка), рядом параллельные списки id задач,
+    кистей фона и состояний кнопки действия. ``_pack_row`` готовит значения
+    строки один раз при загрузке, а ``data()`` только читает их по индексам.
+
+    Сортирует модель сама (см. ``_TaskSortProxyModel``): выбранный порядок
+    сохраняется и для строк, загруженных следующим обновлением.
+    """
+
+    HEADERS: list[str] = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._action_column = len(self.HEADERS) - 1
+        self._columns: tuple = tuple(() for _ in self.HEADERS)
+        self._ids: tuple = ()
+        self._brushes: tuple = ()
+        self._actions: tuple = ()
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in _HANDLED_ROLES:
+            return None
+
+        # Роли проверяются по частоте: при отрисовке делегат спрашивает только
+        # _PAINT_ROLE, DisplayRole нужен сортировке прокси и подбору ширины.
+        # У недействительного индекса строка и колонка равны -1, и без проверки
+        # отрицательный номер вернул бы значение последней строки.
+        row = index.row()
+        column = index.column()
+        if not (0 <= row < len(self._ids) and 0 <= column < len(self._columns)):
+            return None
+        if role == _PAINT_ROLE:
+            return self._columns[column][row], self._brushes[row]
+        if role == _DISPLAY_ROLE:
+            return self._columns[column][row]
+        if role == _USER_ROLE:
+            return self._ids[row]
+        if role == _BACKGROUND_ROLE:
+            return self._brushes[row]
+        if column == self._action_column:
+            return self._actions[row]
+        return None
+
+    def column_values(self, column: int) -> tuple:
+        """Возвращает готовые строки колонки в порядке строк модели."""
+        return self._columns[column]
+
+    @staticmethod
+    def _pack_row(task) -> tuple:
+        """По умолчанию строка уже готова: значения колонок, id, кисть и действие."""
+        return task
+
+    def _set_columns(self, columns: tuple):
+        self._columns = columns[:-3]
+        self._ids, self._brushes, self._actions = columns[-3:]
+
+    def _all_columns(self) -> tuple:
+        return (*self._columns, self._ids, self._brushes, self._actions)
+
+    def load_data(self, tasks):
+        pack_row = self._pack_row
+        rows = [pack_row(task) for task in tasks]
+        if self._sort_column >= 0:
+            rows.sort(key=itemgetter(self._sort_column), reverse=self._sort_order == Qt.DescendingOrder)
+        # Транспонирование строк в колонки: один проход zip вместо сборки каждого списка.
+        columns = tuple(zip(*rows))
+        if not columns:
+            columns = tuple(() for _ in range(len(self.HEADERS) + 3))
+        self.beginResetModel()
+        self._set_columns(columns)
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        row_count = len(self._ids)
+        if column < 0 or row_count < 2:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        permutation = sorted(
+            range(row_count),
+            key=self._columns[column].__getitem__,
+            reverse=order == Qt.DescendingOrder,
+        )
+        self._set_columns(tuple(
+            tuple(map(values.__getitem__, permutation))
+            for values in self._all_columns()
+        ))
+
+        persistent = self.persistentIndexList()
+        if persistent:
+            positions = [0] * row_count
+            for new_row, old_row in enumerate(permutation):
+                positions[old_row] = new_row
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(positions[index.row()], index.column()) for index in persistent],
+            )
+        self.layoutChanged.emit()
+
+    def tasks_at(self, source_rows) -> tuple[list, list[str]]:
+        """Возвращает id и названия задач в строках ``source_rows`` без вызовов data()."""
+        ids = self._ids
+        titles = self._columns[0]
+        task_ids = []
+        task_titles = []
+        for row in source_rows:
+            task_id = ids[row]
+            if not task_id:
+                continue
+            task_ids.append(task_id)
+            task_titles.append(titles[row])
+        return task_ids, task_titles
+
+    def source_rows_for(self, task_ids) -> list[int]:
+        """Возвращает номера строк модели с задачами из ``task_ids``."""
+        if not task_ids:
+            return []
+        return [row for row, task_id in enumerate(self._ids) if task_id in task_ids]
+
+    def remove_rows(self, source_rows: list[int]):
+        """Удаляет строки без сброса модели, объединяя соседние в диапазоны."""
+        for first, last in contiguous_row_ranges(source_rows):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._set_columns(tuple(
+                values[:first] + values[last + 1:] for values in self._all_columns()
+            ))
+            self.endRemoveRows()
+
+
+class TasksTableModel(_TasksTableModel):
+    STATUS_COLUMN = 6
+    _completed_rows: frozenset = frozenset()
+    HEADERS = [
+        "Задача",
+        "Комментарий",
+        "Оборудование",
+        "Исполнитель",
+        "Создана",
+        "Срок",
+        "Статус",
+        "Действия",
+    ]
+
+    # Колонки строки get_all_tasks: выбираются все сразу одним вызовом.
+    _FIELDS = itemgetter(
+        'id', 'title', 'description', 'equipment_name', 'assignee_name',
+        'created_at', 'due_date', 'status', 'priority', 'is_replacement',
+    )
+
+    @staticmethod
+    def _pack_row(task: dict) -> tuple:
+        (task_id, title, description, equipment_name, assignee_name,
+         created_at, due_date, status, priority, is_replacement) = TasksTableModel._FIELDS(task)
+        if is_replacement:
+            title = f"[Замена] {title}"
+
+        # created_at хранится как «YYYY-MM-DD HH:MM:SS»: в кэш дат уходит только дата.
+        return (
+            title,
+            description or "",
+            equipment_name or "",
+            assignee_name or "",
+            db_string_to_ui_string(created_at[:10] if created_at else None),
+            db_string_to_ui_string(due_date),
+            status,
+            "",
+            task_id,
+            _PRIORITY_BRUSHES.get(priority),
+            _task_action_state(status),
+        )
+
+    def _set_columns(self, columns: tuple):
+        super()._set_columns(columns)
+        statuses = self.column_values(self.STATUS_COLUMN)
+        self._completed_rows = frozenset(
+            row for row, status in enumerate(statuses) if status in _COMPLETED_STATUSES
+        )
+
+    def completed_rows(self) -> frozenset:
+        """Номера строк модели с выполненными или отменёнными задачами."""
+        return self._completed_rows
+
+    def set_status(self, source_row: int, status: str):
+        """Меняет статус задачи в строке без перезагрузки модели."""
+        columns = list(self._all_columns())
+        columns[self.STATUS_COLUMN] = _replace_at(columns[self.STATUS_COLUMN], source_row, status)
+        columns[-1] = _replace_at(columns[-1], source_row, _task_action_state(status))
+        # Завершённость меняется только у этой строки: набор не пересчитываем по всем.
+        super()._set_columns(tuple(columns))
+        if status in _COMPLETED_STATUSES:
+            self._completed_rows = self._completed_rows | {source_row}
+        else:
+            self._completed_rows = self._completed_rows - {source_row}
+        self.dataChanged.emit(self.index(source_row, 0), self.index(source_row, len(self.HEADERS) - 1))
+        if self._sort_column == self.STATUS_COLUMN:
+            self.sort(self._sort_column, self._sort_order)
+
+
+class _TaskSortProxyModel(QSortFilterProxyModel):
+    """Прокси, передающий сортировку исходной модели задач.
+
+    Сортировка самого прокси вызывает Python-метод ``data()`` на каждое
+    сравнение; модель переставляет готовые колонки за один ``sorted``.
+    """
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+
+class TasksFilterProxyModel(_TaskSortProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hide_completed = False
+
+    def set_hide_completed(self, hide):
+        self._hide_completed = hide
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._hide_completed:
+            return True
+        return source_row not in self.sourceModel().completed_rows()
+
+
+class PeriodicTasksTableModel(_TasksTableModel):
+    HEADERS = [
+        "Работа",
+        "Предмет",
+        "Период (дн.)",
+        "Последняя дата",
+        "Следующая дата",
+        "Осталось",
+        "Действие",
+    ]
+
+    # Колонки строки get_all_periodic_tasks; сроки добавляет _prepare_periodic_task_row.
+    _FIELDS = itemgetter(
+        'id', 'title', 'equipment_name', 'part_name', 'part_sku',
+        'period_days', 'last_completed_date', 'next_due_date', 'days_until_due',
+    )
+
+    @staticmethod
+    def _pack_row(task: dict) -> tuple:
+        (task_id, title, equipment_name, part_name, part_sku,
+         period_days, last_completed_date, next_due_date, days_until_due) = PeriodicTasksTableModel._FIELDS(task)
+
+        return (
+            title or "",
+            _periodic_subject_text(equipment_name, part_name, part_sku),
+            str(period_days or ""),
+            db_string_to_ui_string(last_completed_date),
+            db_string_to_ui_string(next_due_date),
+            _format_days_until_due(days_until_due),
+            "",
+            task_id,
+            None,
+            (task_id is not None, _periodic_button_colors(days_until_due)),
+        )
+
+
+def _replace_at(values: tuple, index: int, value) -> tuple:
+    return values[:index] + (value,) + values[index + 1:]
+
+
+def _task_action_state(status: str) -> tuple:
+    is_completed = status == 'выполнена'
+    return not is_completed, _GREEN_BUTTON if is_completed else _RED_BUTTON
+
+
+# Текст колонок периодических работ между обновлениями почти не меняется.
+@functools.lru_cache(maxsize=2048)
+def _periodic_subject_text(equipment_name: str | None, part_name: str | None, part_sku: str | None) -> str:
+    equipment_name = equipment_name or ""
+    if part_name:
+        if part_sku:
+            part_display = f"{part_name} ({part_sku})"
+        else:
+            part_display = part_name
+        if equipment_name:
+            return f"{equipment_name} → {part_display}"
+        return part_display
+
+    return equipment_name or "—"
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_days_until_due(days_until_due: int | None) -> str:
+    if days_until_due is None:
+        return "—"
+    if days_until_due < 0:
+        return f"Просрочено на {abs(days_until_due)} дн."
+    if days_until_due == 0:
+        return "Сегодня"
+    return f"{days_until_due} дн."
+
+
+def _periodic_button_colors(days_until_due) -> _ButtonColors:
+    if days_until_due is None or days_until_due <= 7:
+        return _RED_BUTTON
+    return _GREEN_BUTTON
+
+
+def _load_periodic_tasks(db) -> tuple[list[dict], list[dict]]:
+    """Читает (в фоновом потоке) ближайшие и все периодические работы одним запросом."""
+    periodic_tasks = db.get_all_periodic_tasks()
+    return db.filter_due_periodic_tasks(periodic_tasks), periodic_tasks
+
+
+def _setup_task_header(table: QTableView) -> None:
+    """Колонки меняет пользователь, колонка действия — фиксированной ширины."""
+    header = table.horizontalHeader()
+    header.setSectionResizeMode(QHeaderView.Interactive)
+    header.setStretchLastSection(False)
+    action_column = table.model().columnCount() - 1
+    header.setSectionResizeMode(action_column, QHeaderView.Fixed)
+    table.setColumnWidth(action_column, _ACTION_COLUMN_WIDTH)
+
+
+def _fit_columns_once(table: QTableView) -> None:
+    """Один раз подгоняет ширину колонок с данными под первые загруженные строки."""
+    if table.property("columnsFitted") or not table.model().rowCount():
+        return
+    for column in range(table.model().columnCount() - 1):
+        table.resizeColumnToContents(column)
+    table.setProperty("columnsFitted", True)
+
+
+def _selected_source_rows(table: QTableView, proxy: QSortFilterProxyModel) -> list[int]:
+    """Строки исходной модели для выделенных строк таблицы, в порядке показа."""
+    selected = sorted(table.selectionModel().selectedRows(), key=QModelIndex.row)
+    return [proxy.mapToSource(index).row() for index in selected]
+
+
+def _make_refresh_timer(parent: QWidget, slot) -> QTimer:
+    # Нулевой интервал: все события одной итерации цикла дают одно обновление.
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(0)
+    timer.timeout.connect(slot)
+    return timer
+
+
 class TasksTab(QWidget):
     def __init__(self, db, event_bus, parent=None):
         super().__init__(parent)
         self.db = db
         self.event_bus = event_bus
-        self.statuses = ['в работе', 'выполнена', 'отменена', 'на стопе']
-        self.priority_colors = {
-            'высокий': QColor("#ffcdd2"),
-            'средний': QColor("#ffecb3"),
-            'низкий': QColor("#fff9c4")
-        }
+        self.statuses = ['в работе', 'выполнена', 'отменена', 'на стопе']
+        self._tasks_query = BackgroundQuery(self)
+        self._tasks_query.finished.connect(self._apply_tasks)
+        self._periodic_query = BackgroundQuery(self)
+        self._periodic_query.finished.connect(self._apply_periodic_tasks)
+        self._tasks_timer = _make_refresh_timer(self, self._do_refresh_tasks)
+        self._periodic_timer = _make_refresh_timer(self, self._do_refresh_periodic_tasks)
         self.init_ui()
-        self.refresh_data()
-        self.event_bus.subscribe("tasks.changed", self.refresh_data)
-        self.event_bus.subscribe("periodic_tasks.changed", self.refresh_data)
+        self._do_refresh_tasks()
+        self._do_refresh_periodic_tasks()
+        self.event_bus.subscribe("tasks.changed", self.refresh_tasks)
+        self.event_bus.subscribe("periodic_tasks.changed", self.refresh_periodic_tasks)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -58,179 +528,39 @@ class TasksTab(QWidget):
         self.tab_widget.addTab(self.periodic_tab, "Периодические")
 
     def refresh_data(self, *args, **kwargs):
-        self._refresh_regular_tasks()
-        self._refresh_periodic_sections()
-
-    def _refresh_regular_tasks(self):
-        self.table.setSortingEnabled(False)  # Отключаем сортировку на время загрузки
-        self.table.setRowCount(0)
-        tasks = self.db.get_all_tasks()
-
-        for row, task in enumerate(tasks):
-            self.table.insertRow(row)
-
-            task_id = task['id']
-            title_text = task['title']
-            if task.get('is_replacement'):
-                title_text = f"[Замена] {title_text}"
-
-            title_item = QTableWidgetItem(title_text)
-            description_item = QTableWidgetItem(task.get('description') or "")
-            equipment_item = QTableWidgetItem(task.get('equipment_name') or "")
-            assignee_item = QTableWidgetItem(task.get('assignee_name') or "")
-
-            created_at = task.get('created_at')
-            created_date_str = db_string_to_ui_string(created_at.split(" ")[0]) if created_at else ""
-            created_item = QTableWidgetItem(created_date_str)
-
-            due_date_str = db_string_to_ui_string(task['due_date']) if task['due_date'] else ""
-            due_item = QTableWidgetItem(due_date_str)
-            status_item = QTableWidgetItem(task['status'])
-
-            items = [
-                title_item,
-                description_item,
-                equipment_item,
-                assignee_item,
-                created_item,
-                due_item,
-                status_item,
-            ]
-
-            for col, item in enumerate(items):
-                item.setData(Qt.UserRole, task_id)
-                self.table.setItem(row, col, item)
-
-            action_placeholder = QTableWidgetItem("")
-            action_placeholder.setData(Qt.UserRole, task_id)
-            action_placeholder.setFlags(Qt.ItemIsEnabled)
-            self.table.setItem(row, 7, action_placeholder)
-
-            color = self.priority_colors.get(task['priority'])
-            if color:
-                for col in range(self.table.columnCount()):
-                    item = self.table.item(row, col)
-                    if item:
-                        item = item.clone()
-                        item.setBackground(QBrush(color))
-                        item.setData(Qt.UserRole, task_id)
-                        self.table.setItem(row, col, item)
-
-            action_button = QPushButton("Выполнить")
-            is_completed = task['status'] == 'выполнена'
-            if is_completed:
-                style = (
-                    "QPushButton { background-color: #2e7d32; color: white; }"
-                    "QPushButton:hover { background-color: #1b5e20; }"
-                    "QPushButton:disabled { background-color: #2e7d32; color: white; }"
-                )
-            else:
-                style = (
-                    "QPushButton { background-color: #c62828; color: white; }"
-                    "QPushButton:hover { background-color: #b71c1c; }"
-                    "QPushButton:disabled { background-color: #c62828; color: white; }"
-                )
-            action_button.setStyleSheet(style)
-            action_button.setEnabled(not is_completed)
-            action_button.clicked.connect(lambda _, t_id=task_id: self.complete_task(t_id))
-            self.table.setCellWidget(row, 7, action_button)
+        self.refresh_tasks()
+        self.refresh_periodic_tasks()
 
-        self.table.setSortingEnabled(True)
-        self.filter_tasks()
+    def refresh_tasks(self, *args, **kwargs):
+        self._tasks_timer.start()
 
-    def _refresh_periodic_sections(self):
-        due_tasks = self.db.get_due_periodic_tasks()
-        self._populate_periodic_table(self.periodic_due_table, due_tasks, enable_sorting=False)
-        self.periodic_due_container.setVisible(bool(due_tasks))
+    def refresh_periodic_tasks(self, *args, **kwargs):
+        self._periodic_timer.start()
 
-        all_tasks = self.db.get_all_periodic_tasks()
-        self._populate_periodic_table(self.periodic_table, all_tasks, enable_sorting=True)
-
-    def _populate_periodic_table(self, table: QTableWidget, tasks: list[dict], enable_sorting: bool):
-        table.setSortingEnabled(False)
-        table.setRowCount(0)
-
-        for row, task in enumerate(tasks):
-            table.insertRow(row)
-            self._set_periodic_row(table, row, task)
-
-        if enable_sorting:
-            table.setSortingEnabled(True)
-
-        table.resizeColumnsToContents()
-
-    def _set_periodic_row(self, table: QTableWidget, row: int, task: dict):
-        task_id = task.get('id')
-        subject_text = self._periodic_subject_text(task)
-        period_days = task.get('period_days') or ""
-        last_date = db_string_to_ui_string(task.get('last_completed_date')) if task.get('last_completed_date') else ""
-        next_due = db_string_to_ui_string(task.get('next_due_date')) if task.get('next_due_date') else ""
-        days_until_due = task.get('days_until_due')
-        days_text = self._format_days_until_due(days_until_due)
-
-        values = [
-            task.get('title') or "",
-            subject_text,
-            str(period_days),
-            last_date,
-            next_due,
-            days_text,
-        ]
-
-        for col, value in enumerate(values):
-            item = QTableWidgetItem(value)
-            item.setData(Qt.UserRole, task_id)
-            table.setItem(row, col, item)
-
-        action_button = QPushButton("Выполнить")
-        action_button.setCursor(Qt.PointingHandCursor)
-        self._set_periodic_button_style(action_button, days_until_due)
-        if task_id is not None:
-            action_button.clicked.connect(lambda _, t_id=task_id: self.complete_periodic_task(t_id))
-        table.setCellWidget(row, 6, action_button)
+    def _do_refresh_tasks(self):
+        # Незавершённый предыдущий запрос BackgroundQuery отбросит сам.
+        self._tasks_query.run(self.db.get_all_tasks)
 
-    @staticmethod
-    def _periodic_subject_text(task: dict) -> str:
-        equipment_name = task.get('equipment_name') or ""
-        part_name = task.get('part_name')
-        part_sku = task.get('part_sku')
-
-        if part_name:
-            if part_sku:
-                part_display = f"{part_name} ({part_sku})"
-            else:
-                part_display = part_name
-            if equipment_name:
-                return f"{equipment_name} → {part_display}"
-            return part_display
-
-        return equipment_name or "—"
+    def _do_refresh_periodic_tasks(self):
+        self._periodic_query.run(_load_periodic_tasks, self.db)
 
-    @staticmethod
-    def _format_days_until_due(days_until_due):
-        if days_until_due is None:
-            return "—"
-        if days_until_due < 0:
-            return f"Просрочено на {abs(days_until_due)} дн."
-        if days_until_due == 0:
-            return "Сегодня"
-        return f"{days_until_due} дн."
+    def _apply_tasks(self, tasks):
+        self.tasks_model.load_data(tasks)
+        _fit_columns_once(self.table)
 
-    @staticmethod
-    def _set_periodic_button_style(button: QPushButton, days_until_due):
-        if days_until_due is None or days_until_due <= 7:
-            style = (
-                "QPushButton { background-color: #c62828; color: white; }"
-                "QPushButton:hover { background-color: #b71c1c; }"
-            )
-        else:
-            style = (
-                "QPushButton { background-color: #2e7d32; color: white; }"
-                "QPushButton:hover { background-color: #1b5e20; }"
-            )
-        button.setStyleSheet(style)
+    def _apply_periodic_tasks(self, result):
+        due_tasks, periodic_tasks = result
+        self.periodic_due_model.load_data(due_tasks)
+        _fit_columns_once(self.periodic_due_table)
+        self.periodic_due_container.setVisible(bool(due_tasks))
+
+        self.periodic_model.load_data(periodic_tasks)
+        _fit_columns_once(self.periodic_table)
 
     def create_periodic_task(self):
+        # Модуль диалога загружается при первом открытии, а не при старте приложения.
+        from .periodic_task_dialog import PeriodicTaskDialog
+
         dialog = PeriodicTaskDialog(self.db, self.event_bus, parent=self)
         dialog.exec()
 
@@ -240,6 +570,8 @@ class TasksTab(QWidget):
         if not task_id:
             QMessageBox.information(self, "Редактирование работы", "Выберите работу для редактирования.")
             return
+        from .periodic_task_dialog import PeriodicTaskDialog
+
         dialog = PeriodicTaskDialog(self.db, self.event_bus, task_id=task_id, parent=self)
         dialog.exec()
 
@@ -285,19 +617,8 @@ class TasksTab(QWidget):
             QMessageBox.warning(self, "Периодическая работа", message)
 
     def _get_selected_periodic_tasks(self) -> tuple[list[int], list[str]]:
-        selected_rows = {index.row() for index in self.periodic_table.selectedIndexes()}
-        task_ids: list[int] = []
-        titles: list[str] = []
-        for row in sorted(selected_rows):
-            item = self.periodic_table.item(row, 0)
-            if not item:
-                continue
-            task_id = item.data(Qt.UserRole)
-            if not task_id:
-                continue
-            task_ids.append(task_id)
-            titles.append(item.text())
-        return task_ids, titles
+        source_rows = _selected_source_rows(self.periodic_table, self.periodic_proxy)
+        return self.periodic_model.tasks_at(source_rows)
 
     def _get_first_selected_periodic_task_id(self):
         task_ids, _ = self._get_selected_periodic_tasks()
@@ -306,90 +627,102 @@ class TasksTab(QWidget):
     def _on_periodic_table_double_clicked(self, index):
         if not index.isValid():
             return
-        item = self.periodic_table.item(index.row(), 0)
-        task_id = item.data(Qt.UserRole) if item else None
+        task_id = index.data(Qt.UserRole)
         if task_id:
             self.edit_periodic_task(task_id)
 
     def _on_periodic_due_double_clicked(self, index):
         if not index.isValid():
             return
-        item = self.periodic_due_table.item(index.row(), 0)
-        task_id = item.data(Qt.UserRole) if item else None
+        task_id = index.data(Qt.UserRole)
         if task_id:
             self.edit_periodic_task(task_id)
-
-    def filter_tasks(self):
-        hide = self.hide_completed_checkbox.isChecked()
-        for row in range(self.table.rowCount()):
-            status_item = self.table.item(row, 6)
-            is_completed = status_item and status_item.text() in ['выполнена', 'отменена']
-            self.table.setRowHidden(row, hide and is_completed)
-            
+
     def create_task(self):
+        from .task_dialog import TaskDialog
+
         dialog = TaskDialog(self.db, self.event_bus, parent=self)
         dialog.exec()
         
     def edit_task(self, index):
-        if not index.isValid(): return
-        task_id = self.table.item(index.row(), 0).data(Qt.UserRole)
+        if not index.isValid(): return
+        task_id = index.data(Qt.UserRole)
         if task_id:
+            from .task_dialog import TaskDialog
+
             dialog = TaskDialog(self.db, self.event_bus, task_id=task_id, parent=self)
             dialog.exec()
             
     def manage_colleagues(self):
+        from .colleagues_manager_dialog import ColleaguesManagerDialog
+
         dialog = ColleaguesManagerDialog(self.db, self)
         if dialog.exec():
             self.event_bus.emit("tasks.changed") # Обновляем задачи, т.к. могли измениться исполнители
 
     def show_context_menu(self, pos):
-        clicked_item = self.table.itemAt(pos)
-        if not clicked_item:
+        clicked_index = self.table.indexAt(pos)
+        if not clicked_index.isValid():
             return
 
-        row = clicked_item.row()
-        selected_rows = self._get_selected_rows()
-        if row not in selected_rows:
+        row = clicked_index.row()
+        selection = self.table.selectionModel()
+        if selection.isRowSelected(row):
+            selected_count = len(selection.selectedRows())
+        else:
+            # Щелчок вне выделения заменяет его одной строкой — повторный обход не нужен.
             self.table.selectRow(row)
-            selected_rows = self._get_selected_rows()
+            selected_count = 1
 
-        menu = QMenu(self)
-
-        if len(selected_rows) == 1:
-            task_id = self.table.item(row, 0).data(Qt.UserRole)
+        single = selected_count == 1
+        if single:
+            title_index = clicked_index.siblingAtColumn(0)
+            task_id = title_index.data(Qt.UserRole)
             if not task_id:
                 return
-
-            status_menu = menu.addMenu("Изменить статус")
-            for status in self.statuses:
-                action = QAction(status, self)
-                action.triggered.connect(lambda checked=False, s=status, t_id=task_id: self.change_task_status(t_id, s))
-                status_menu.addAction(action)
-
-            menu.addSeparator()
-
-        delete_label = "Удалить задачу" if len(selected_rows) == 1 else f"Удалить {len(selected_rows)} задач"
-        delete_action = QAction(delete_label, self)
-        if len(selected_rows) == 1:
-            title_item = self.table.item(row, 0)
-            task_id = title_item.data(Qt.UserRole) if title_item else None
-            task_title = title_item.text() if title_item else ""
-            delete_action.triggered.connect(
-                lambda checked=False, t_id=task_id, t_title=task_title: self._delete_tasks([t_id], [t_title])
-            )
+            self._context_task = (task_id, title_index.data())
         else:
-            delete_action.triggered.connect(self.delete_selected_tasks)
-        menu.addAction(delete_action)
-
-        menu.exec(self.table.viewport().mapToGlobal(pos))
+            self._context_task = None
+
+        self._status_menu.menuAction().setVisible(single)
+        self._status_separator.setVisible(single)
+        self._delete_action.setText("Удалить задачу" if single else f"Удалить {selected_count} задач")
+        self._context_menu.exec(self.table.viewport().mapToGlobal(pos))
+
+    def _create_context_menu(self):
+        # Меню строится один раз; при показе меняются только видимость и подписи.
+        self._context_task = None
+        self._context_menu = QMenu(self)
+        self._status_menu = self._context_menu.addMenu("Изменить статус")
+        for status in self.statuses:
+            action = self._status_menu.addAction(status)
+            action.setData(status)
+            action.triggered.connect(self._on_status_action_triggered)
+        self._status_separator = self._context_menu.addSeparator()
+        self._delete_action = self._context_menu.addAction("Удалить задачу")
+        self._delete_action.triggered.connect(self._on_delete_action_triggered)
+
+    def _on_status_action_triggered(self):
+        if self._context_task:
+            self.change_task_status(self._context_task[0], self.sender().data())
+
+    def _on_delete_action_triggered(self):
+        if self._context_task:
+            task_id, title = self._context_task
+            self._delete_tasks([task_id], [title])
+        else:
+            self.delete_selected_tasks()
 
     def change_task_status(self, task_id, new_status):
         success, message, events = self.db.update_task_status(task_id, new_status)
-        if success:
-            self._handle_task_events(events)
-            self.event_bus.emit("tasks.changed")
-        else:
+        if not success:
             QMessageBox.critical(self, "Ошибка", message)
+            return
+
+        rows = self.tasks_model.source_rows_for({task_id})
+        for row in rows:
+            self.tasks_model.set_status(row, new_status)
+        self._emit_task_events(events, refresh_self=not rows)
 
     def complete_task(self, task_id):
         if not task_id:
@@ -406,32 +739,30 @@ class TasksTab(QWidget):
         if events.get('replacements_changed'):
             self.event_bus.emit("replacements.changed")
 
+    def _emit_task_events(self, events: dict, refresh_self: bool = True):
+        # Статус или удаление задачи затрагивает только её строку, и модель уже
+        # обновлена на месте: собственную перезагрузку по tasks.changed отменяем,
+        # если она не была запланирована раньше. Незавершённый фоновый запрос
+        # вернул бы строки до изменения — тогда перезагрузку оставляем.
+        refresh_pending = self._tasks_timer.isActive() or self._tasks_query.is_busy()
+        with self.event_bus.batch():
+            self._handle_task_events(events)
+            self.event_bus.emit("tasks.changed")
+        if not refresh_self and not refresh_pending:
+            self._tasks_timer.stop()
+
     def delete_selected_tasks(self):
-        rows = self._get_selected_rows()
-        if not rows:
+        source_rows = _selected_source_rows(self.table, self.tasks_proxy)
+        if not source_rows:
             QMessageBox.information(self, "Удаление задач", "Не выбрано ни одной задачи.")
             return
 
-        task_ids = []
-        titles = []
-        for row in rows:
-            item = self.table.item(row, 0)
-            if not item:
-                continue
-            task_id = item.data(Qt.UserRole)
-            if not task_id:
-                continue
-            task_ids.append(task_id)
-            titles.append(item.text())
-
+        task_ids, titles = self.tasks_model.tasks_at(source_rows)
         if not task_ids:
             return
 
         self._delete_tasks(task_ids, titles)
 
-    def _get_selected_rows(self):
-        return sorted({index.row() for index in self.table.selectedIndexes()})
-
     def _delete_tasks(self, task_ids, titles):
         if not task_ids:
             return
@@ -463,18 +794,12 @@ class TasksTab(QWidget):
         if reply != QMessageBox.Yes:
             return
 
-        affected_equipment_ids = set()
-
-        for task_id in task_ids:
-            success, message, events = self.db.delete_task(task_id)
-            if not success:
-                QMessageBox.critical(self, "Ошибка", message)
-                break
-            affected_equipment_ids.update(events.get('equipment_ids', []))
-        else:
-            if affected_equipment_ids:
-                self._handle_task_events({'equipment_ids': affected_equipment_ids})
-            self.event_bus.emit("tasks.changed")
+        deleted_ids, failed, events = self.db.delete_tasks(task_ids)
+        if deleted_ids:
+            self.tasks_model.remove_rows(self.tasks_model.source_rows_for(set(deleted_ids)))
+            self._emit_task_events(events, refresh_self=False)
+        if failed:
+            QMessageBox.critical(self, "Ошибка", "\n".join(dict.fromkeys(failed.values())))
 
     def _init_regular_tasks_ui(self, layout: QVBoxLayout):
         controls_layout = QHBoxLayout()
@@ -500,61 +825,58 @@ class TasksTab(QWidget):
         self.periodic_due_label.setStyleSheet("font-weight: 600;")
         due_layout.addWidget(self.periodic_due_label)
 
-        self.periodic_due_table = QTableWidget()
-        self.periodic_due_table.setColumnCount(7)
-        self.periodic_due_table.setHorizontalHeaderLabels([
-            "Работа",
-            "Предмет",
-            "Период (дн.)",
-            "Последняя дата",
-            "Следующая дата",
-            "Осталось",
-            "Действие",
-        ])
+        self.periodic_due_model = PeriodicTasksTableModel(self)
+        self.periodic_due_table = QTableView()
+        self.periodic_due_table.setModel(self.periodic_due_model)
         self.periodic_due_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.periodic_due_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.periodic_due_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.periodic_due_table.setAlternatingRowColors(True)
-        self.periodic_due_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.periodic_due_table.horizontalHeader().setStretchLastSection(False)
+        _setup_task_header(self.periodic_due_table)
         self.periodic_due_table.verticalHeader().setVisible(False)
         due_layout.addWidget(self.periodic_due_table)
         self.periodic_due_container.setVisible(False)
         layout.addWidget(self.periodic_due_container)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "Задача",
-            "Комментарий",
-            "Оборудование",
-            "Исполнитель",
-            "Создана",
-            "Срок",
-            "Статус",
-            "Действия",
-        ])
+        self.tasks_model = TasksTableModel(self)
+        self.tasks_proxy = TasksFilterProxyModel(self)
+        self.tasks_proxy.setSourceModel(self.tasks_model)
+        self.table = QTableView()
+        self.table.setModel(self.tasks_proxy)
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
+        # До первого щелчка по заголовку строки идут в порядке выдачи из БД, как
+        # и в прежней QTableWidget: там индикатор (0, по убыванию) при вставке
+        # колонок сдвигался за последнюю колонку, и сортировка не применялась.
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.table.setSortingEnabled(True)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
 
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
-        header.setStretchLastSection(False)
-        header.setSectionResizeMode(7, QHeaderView.ResizeToContents)
+        _setup_task_header(self.table)
+
+        self.cell_delegate = _TaskCellDelegate(self)
+        self.table.setItemDelegate(self.cell_delegate)
+        self.periodic_due_table.setItemDelegate(self.cell_delegate)
+
+        self.action_delegate = ActionButtonDelegate(self.table)
+        self.action_delegate.clicked.connect(self.complete_task)
+        self.table.setItemDelegateForColumn(7, self.action_delegate)
+        self.periodic_action_delegate = ActionButtonDelegate(self)
+        self.periodic_action_delegate.clicked.connect(self.complete_periodic_task)
+        self.periodic_due_table.setItemDelegateForColumn(6, self.periodic_action_delegate)
 
         layout.addWidget(self.table)
 
         self.create_task_button.clicked.connect(self.create_task)
         self.manage_colleagues_button.clicked.connect(self.manage_colleagues)
         self.refresh_button.clicked.connect(self.refresh_data)
-        self.hide_completed_checkbox.toggled.connect(self.filter_tasks)
+        self.hide_completed_checkbox.toggled.connect(self.tasks_proxy.set_hide_completed)
         self.delete_tasks_button.clicked.connect(self.delete_selected_tasks)
         self.table.doubleClicked.connect(self.edit_task)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
+        self._create_context_menu()
         self.periodic_due_table.doubleClicked.connect(self._on_periodic_due_double_clicked)
 
     def _init_periodic_tasks_ui(self, layout: QVBoxLayout):
@@ -571,30 +893,27 @@ class TasksTab(QWidget):
         controls_layout.addWidget(self.refresh_periodic_button)
         layout.addLayout(controls_layout)
 
-        self.periodic_table = QTableWidget()
-        self.periodic_table.setColumnCount(7)
-        self.periodic_table.setHorizontalHeaderLabels([
-            "Работа",
-            "Предмет",
-            "Период (дн.)",
-            "Последняя дата",
-            "Следующая дата",
-            "Осталось",
-            "Действие",
-        ])
+        self.periodic_model = PeriodicTasksTableModel(self)
+        self.periodic_proxy = _TaskSortProxyModel(self)
+        self.periodic_proxy.setSourceModel(self.periodic_model)
+        self.periodic_table = QTableView()
+        self.periodic_table.setModel(self.periodic_proxy)
         self.periodic_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.periodic_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.periodic_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.periodic_table.setAlternatingRowColors(True)
+        # Периодические работы так же показываются в порядке выдачи из БД.
+        self.periodic_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.periodic_table.setSortingEnabled(True)
-        self.periodic_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.periodic_table.horizontalHeader().setStretchLastSection(False)
+        _setup_task_header(self.periodic_table)
         self.periodic_table.verticalHeader().setVisible(False)
+        self.periodic_table.setItemDelegate(self.cell_delegate)
+        self.periodic_table.setItemDelegateForColumn(6, self.periodic_action_delegate)
 
         layout.addWidget(self.periodic_table)
 
         self.create_periodic_button.clicked.connect(self.create_periodic_task)
         self.edit_periodic_button.clicked.connect(self.edit_periodic_task)
         self.delete_periodic_button.clicked.connect(self.delete_periodic_tasks)
-        self.refresh_periodic_button.clicked.connect(self.refresh_data)
+        self.refresh_periodic_button.clicked.connect(self.refresh_periodic_tasks)
         self.periodic_table.doubleClicked.connect(self._on_periodic_table_double_clicked)
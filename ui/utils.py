@@ -1,4 +1,4 @@
-import datetime
+import functools
 import logging
 import re
 import shutil
@@ -13,37 +13,63 @@ _ROOT_DIR = Path(__file__).resolve().parents[1]
 PARTS_FILES_DIR = _ROOT_DIR / "data" / "parts"
 EQUIPMENT_FILES_DIR = _ROOT_DIR / "data" / "equipment"
 
+@functools.lru_cache(maxsize=4096)
 def db_string_to_ui_string(db_str: str) -> str:
     """Преобразует строку YYYY-MM-DD в ДД.ММ.ГГГГ."""
-    if not db_str:
-        return ""
-    try:
-        return datetime.datetime.strptime(db_str, '%Y-%m-%d').strftime('%d.%m.%Y')
-    except (ValueError, TypeError):
-        return ""
+    # Формат фиксированной ширины: срезы переставляются без разбора строки,
+    # а несуществующие даты (например, 30 февраля) отсекает QDate.isValid.
+    if (
+        not isinstance(db_str, str)
+        or len(db_str) != 10
+        or db_str[4] != '-'
+        or db_str[7] != '-'
+        or not (db_str[:4].isdecimal() and db_str[5:7].isdecimal() and db_str[8:].isdecimal())
+        or not QDate.isValid(int(db_str[:4]), int(db_str[5:7]), int(db_str[8:]))
+    ):
+        return ""
+    return f"{db_str[8:]}.{db_str[5:7]}.{db_str[:4]}"
+
+@functools.lru_cache(maxsize=128)
+def _julian_day_to_db_string(julian_day: int) -> str:
+    qdate = QDate.fromJulianDay(julian_day)
+    if not qdate.isValid():
+        return ""
+    year, month, day = qdate.getDate()
+    return f"{year:04d}-{month:02d}-{day:02d}"
 
 def qdate_to_db_string(qdate: QDate) -> str:
     """Преобразует QDate в строку YYYY-MM-DD."""
-    return qdate.toString("yyyy-MM-dd")
+    return _julian_day_to_db_string(qdate.toJulianDay())
 
-def db_string_to_qdate(db_str: str) -> QDate:
-    """Преобразует строку YYYY-MM-DD в QDate."""
-    if not db_str:
-        return QDate.currentDate()
-    try:
-        dt = datetime.datetime.strptime(db_str, '%Y-%m-%d')
-        return QDate(dt.year, dt.month, dt.day)
-    except (ValueError, TypeError):
-        return QDate.currentDate()
+@functools.lru_cache(maxsize=4096)
+def _db_string_to_julian_day(db_str: str) -> int | None:
+    if len(db_str) != 10 or db_str[4] != '-' or db_str[7] != '-':
+        return None
+    try:
+        qdate = QDate(int(db_str[:4]), int(db_str[5:7]), int(db_str[8:]))
+    except ValueError:
+        return None
+    return qdate.toJulianDay() if qdate.isValid() else None
+
+def db_string_to_qdate(db_str: str) -> QDate:
+    """Преобразует строку YYYY-MM-DD в QDate."""
+    # Кэшируется номер дня, а не сам QDate: объект изменяемый, а запасная
+    # «сегодняшняя» дата не должна застревать в кэше.
+    julian_day = _db_string_to_julian_day(db_str) if isinstance(db_str, str) else None
+    if julian_day is None:
+        return QDate.currentDate()
+    return QDate.fromJulianDay(julian_day)
 
 def get_current_date_str_for_db() -> str:
     """Возвращает текущую дату в формате YYYY-MM-DD для БД."""
-    return QDate.currentDate().toString("yyyy-MM-dd")
+    return qdate_to_db_string(QDate.currentDate())
 
 
-def last_year_start_date() -> QDate:
+def last_year_start_date(today: QDate | None = None) -> QDate:
     """Возвращает дату, соответствующую началу периода за последний год."""
-    return QDate.currentDate().addYears(-1)
+    if today is None:
+        today = QDate.currentDate()
+    return today.addYears(-1)
 
 
 def _collect_unique_notes(notes: Iterable[str]) -> list[str]:
@@ -91,16 +117,22 @@ def build_driver_notification_message(order: dict) -> str:
     return "\n".join(line for line in lines if line)
 
 
+# Серия недопустимых символов и подчёркиваний сворачивается в одно «_» за один проход.
+_UNSAFE_RUN_RE = re.compile(r"(?:[^\w\-]|_)+")
+
+
 def _sanitize_component(value: str, default: str) -> str:
     value = (value or "").strip()
     if not value:
         value = default
-    value = value.replace(" ", "_")
-    value = re.sub(r"[^\w\-]", "_", value, flags=re.UNICODE)
-    value = re.sub(r"_+", "_", value)
-    return value
+    # Буквы и цифры без разделителей (одиночные слова, артикулы) менять не нужно:
+    # isalnum проверяет строку в C без запуска регулярного выражения.
+    if value.isalnum():
+        return value
+    return _UNSAFE_RUN_RE.sub("_", value)
 
 
+@functools.lru_cache(maxsize=2048)
 def _build_folder_name(name: str, sku: str | None, default_sku: str) -> str:
     return f"{_sanitize_component(name, 'Без_названия')}_{_sanitize_component(sku, default_sku)}"
 
@@ -148,6 +180,23 @@ def apply_table_compact_style(table_view: QTableView, *, row_height: int = 28, p
         table_view.setStyleSheet(style_sheet)
 
 
+def contiguous_row_ranges(rows: Iterable[int]):
+    """Отдаёт номера строк диапазонами ``(first, last)`` от конца к началу.
+
+    Обратный порядок позволяет удалять диапазоны по очереди, не пересчитывая
+    номера ещё не удалённых строк.
+    """
+    ordered = sorted(set(rows), reverse=True)
+    position = 0
+    while position < len(ordered):
+        last = first = ordered[position]
+        position += 1
+        while position < len(ordered) and ordered[position] == first - 1:
+            first = ordered[position]
+            position += 1
+        yield first, last
+
+
 def _merge_directories(src: Path, dst: Path):
     for item in src.iterdir():
         target = dst / item.name
@@ -31,6 +31,10 @@ from .utils import apply_table_compact_style, open_part_folder
 
 ROW_TYPE_ROLE = Qt.UserRole + 10
 
+_CATEGORY_BACKGROUND = QColor('#f5f5f5')
+_EQUIPMENT_BACKGROUND = QColor('#fafafa')
+_TRANSPARENT = QColor(0, 0, 0, 0)
+
 
 class FolderButtonDelegate(QStyledItemDelegate):
     """Рисует кнопку с иконкой папки и обрабатывает клики по ней."""
@@ -363,6 +367,8 @@ class TableModel(QAbstractTableModel):
         style = QApplication.style()
         self._arrow_collapsed = style.standardIcon(QStyle.SP_ArrowRight)
         self._arrow_expanded = style.standardIcon(QStyle.SP_ArrowDown)
+        self._category_font = QFont()
+        self._category_font.setBold(True)
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._rows)
@@ -385,11 +391,9 @@ class TableModel(QAbstractTableModel):
             if role == Qt.DisplayRole and column == 0:
                 return row_entry.get('category_name', '')
             if role == Qt.FontRole:
-                font = QFont()
-                font.setBold(True)
-                return font
+                return self._category_font
             if role == Qt.BackgroundRole:
-                return QColor('#f5f5f5')
+                return _CATEGORY_BACKGROUND
             if role == Qt.TextAlignmentRole:
                 return Qt.AlignLeft | Qt.AlignVCenter
             return None
@@ -414,7 +418,7 @@ class TableModel(QAbstractTableModel):
                 if column == self.FOLDER_COLUMN:
                     return Qt.AlignCenter
             if role == Qt.BackgroundRole:
-                return QColor('#fafafa')
+                return _EQUIPMENT_BACKGROUND
             return None
 
         if row_type == 'analog_separator':
@@ -423,7 +427,7 @@ class TableModel(QAbstractTableModel):
             if role == Qt.SizeHintRole:
                 return QSize(-1, 10)
             if role == Qt.BackgroundRole:
-                return QColor(0, 0, 0, 0)
+                return _TRANSPARENT
             return None
 
         part = row_entry.get('part', {})